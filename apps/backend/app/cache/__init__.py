@@ -0,0 +1,59 @@
+"""Shared cache package.
+
+CACHE_BACKEND selects where entries live: "memory" (per worker, the
+default) or "redis" (REDIS_URL, shared by every worker and replica).
+"""
+from typing import Optional
+
+from app.cache.backends import CacheBackend, MemoryBackend, RedisBackend
+from app.cache.cache import Cache, Namespace
+from app.cache.coalesce import coalesce
+from app.cache.singleflight import SingleFlight
+from config.settings import get_settings
+
+_cache: Optional[Cache] = None
+
+
+def get_cache() -> Cache:
+    """The process-wide cache, built from settings on first use."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        if settings.cache_backend == "redis":
+            if not settings.redis_url:
+                raise RuntimeError("CACHE_BACKEND=redis requires REDIS_URL")
+            backend: CacheBackend = RedisBackend.from_url(settings.redis_url)
+        else:
+            backend = MemoryBackend(max_entries=settings.cache_max_entries)
+        _cache = Cache(
+            backend,
+            prefix=settings.cache_key_prefix,
+            default_ttl=settings.cache_default_ttl_seconds,
+            lock_seconds=settings.cache_lock_seconds,
+        )
+    return _cache
+
+
+async def start() -> None:
+    await get_cache().start()
+
+
+async def close() -> None:
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
+
+
+__all__ = [
+    "Cache",
+    "CacheBackend",
+    "MemoryBackend",
+    "Namespace",
+    "RedisBackend",
+    "SingleFlight",
+    "close",
+    "coalesce",
+    "get_cache",
+    "start",
+]
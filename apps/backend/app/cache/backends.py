@@ -0,0 +1,176 @@
+"""Cache storage backends.
+
+MemoryBackend keeps entries in this process (an LRU bounded by entry count)
+and delivers pub/sub messages to this process only; it is the default and
+suits a single worker. RedisBackend talks to any Redis-protocol server
+through a redis.asyncio client, so every worker and replica shares entries,
+counters and invalidation messages. fakeredis.aioredis.FakeRedis can stand
+in for the client locally.
+
+Values are stored as-is in memory and pickled in Redis; callers must treat
+returned values as read-only. None is never stored (it means "miss").
+"""
+import asyncio
+import pickle
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+
+class CacheBackend(ABC):
+    name = "abstract"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """The stored value, or None when missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store `value` for `ttl` seconds."""
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store `value` only if `key` is absent; True when stored."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def counter(self, key: str) -> int:
+        """Current value of an incr() counter (0 when never incremented)."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically increment a counter that never expires; returns the new value."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None: ...
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[str]:
+        """Messages published to `channel` from now on."""
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._counters: Dict[str, int] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def publish(self, channel: str, message: str) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._data), "max_entries": self.max_entries, "evictions": self.evictions}
+
+
+class RedisBackend(CacheBackend):
+    name = "redis"
+
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        return cls(aioredis.from_url(url))
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(key)
+        return None if raw is None else pickle.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._client.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=max(1, int(ttl * 1000)))
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        stored = await self._client.set(
+            key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=max(1, int(ttl * 1000)), nx=True
+        )
+        return bool(stored)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def counter(self, key: str) -> int:
+        raw = await self._client.get(key)
+        return int(raw) if raw is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = message["data"]
+                yield data.decode() if isinstance(data, bytes) else data
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._client.aclose()
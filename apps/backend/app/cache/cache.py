@@ -0,0 +1,177 @@
+"""Namespaced cache with version-based invalidation.
+
+Every key lives in a namespace ("reference_data", "leaderboard", ...) and
+embeds the namespace's version: "<prefix>:<namespace>:v<version>:<parts>".
+Invalidating a namespace increments its version counter in the backend and
+publishes the new version on "<prefix>:invalidate"; every worker's listener
+updates its local copy, so stale entries are simply never read again and
+expire on their TTL.
+
+get_or_compute() coalesces misses: concurrent callers in a worker share one
+computation, and with a shared backend a short lock key makes other workers
+wait for that result instead of recomputing it.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.cache.backends import CacheBackend
+from app.cache.singleflight import SingleFlight
+from app.utils import metrics
+
+logger = logging.getLogger("app.cache")
+
+LOCK_POLL_SECONDS = 0.05
+RESUBSCRIBE_SECONDS = 1.0
+
+
+class Namespace:
+    """A group of keys invalidated together."""
+
+    def __init__(self, cache: "Cache", name: str, ttl: float):
+        self.cache = cache
+        self.name = name
+        self.ttl = ttl
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.cache.prefix}:{self.name}:version"
+
+    async def version(self) -> int:
+        """Current version, read from the backend once and then kept up to date by pub/sub."""
+        version = self.cache._versions.get(self.name)
+        if version is None:
+            version = await self.cache.backend.counter(self.version_key)
+            self.cache._versions[self.name] = version
+        return version
+
+    def key(self, version: int, *parts: Any) -> str:
+        return ":".join([self.cache.prefix, self.name, f"v{version}", *(str(p) for p in parts)])
+
+    async def get(self, *parts: Any) -> Optional[Any]:
+        value = await self.cache.backend.get(self.key(await self.version(), *parts))
+        metrics.incr(f"cache.{self.name}.{'hits' if value is not None else 'misses'}")
+        return value
+
+    async def set(self, value: Any, *parts: Any, ttl: Optional[float] = None) -> None:
+        await self.cache.backend.set(self.key(await self.version(), *parts), value, ttl or self.ttl)
+
+    async def get_or_compute(
+        self,
+        parts: tuple,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Cached value for `parts`, computing and storing it once on a miss."""
+        key = self.key(await self.version(), *parts)
+        value = await self.cache.backend.get(key)
+        if value is not None:
+            metrics.incr(f"cache.{self.name}.hits")
+            return value
+        metrics.incr(f"cache.{self.name}.misses")
+        if key in self.cache._flights:
+            metrics.incr(f"cache.{self.name}.coalesced")
+        return await self.cache._flights.do(key, lambda: self._fill(key, compute, ttl or self.ttl))
+
+    async def _fill(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        backend = self.cache.backend
+        lock_key = f"{key}:lock"
+        locked = await backend.add(lock_key, 1, self.cache.lock_seconds)
+        if not locked:
+            # Another worker is computing this key; use its result if it lands in time
+            value = await self._wait_for(key)
+            if value is not None:
+                metrics.incr(f"cache.{self.name}.coalesced")
+                return value
+        try:
+            with metrics.timed(f"cache.{self.name}.compute"):
+                value = await compute()
+            if value is not None:
+                await backend.set(key, value, ttl)
+            return value
+        finally:
+            if locked:
+                await backend.delete(lock_key)
+
+    async def _wait_for(self, key: str) -> Optional[Any]:
+        deadline = time.monotonic() + self.cache.lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+            value = await self.cache.backend.get(key)
+            if value is not None:
+                return value
+        return None
+
+    async def invalidate(self) -> int:
+        """Retire every key of this namespace in all workers; returns the new version."""
+        version = await self.cache.backend.incr(self.version_key)
+        self.cache._bump(self.name, version)
+        await self.cache.backend.publish(self.cache.channel, f"{self.name}:{version}")
+        metrics.incr(f"cache.{self.name}.invalidations")
+        return version
+
+
+class Cache:
+    def __init__(self, backend: CacheBackend, prefix: str, default_ttl: float, lock_seconds: float):
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.lock_seconds = lock_seconds
+        self._namespaces: Dict[str, Namespace] = {}
+        self._versions: Dict[str, int] = {}
+        self._flights = SingleFlight()
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def channel(self) -> str:
+        return f"{self.prefix}:invalidate"
+
+    def namespace(self, name: str, ttl: Optional[float] = None) -> Namespace:
+        ns = self._namespaces.get(name)
+        if ns is None:
+            ns = self._namespaces[name] = Namespace(self, name, ttl or self.default_ttl)
+        return ns
+
+    def _bump(self, name: str, version: int) -> None:
+        if version > self._versions.get(name, 0):
+            self._versions[name] = version
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other workers."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="cache-invalidations")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self.backend.subscribe(self.channel):
+                    name, _, version = message.rpartition(":")
+                    self._bump(name, int(version))
+                    metrics.incr("cache.invalidations_received")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation listener failed; resubscribing")
+            # Messages may have been missed: re-read every version from the backend
+            self._versions.clear()
+            await asyncio.sleep(RESUBSCRIBE_SECONDS)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.backend.close()
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "listening": self._listener is not None and not self._listener.done(),
+            "versions": dict(sorted(self._versions.items())),
+            "in_flight": len(self._flights),
+            **self.backend.stats(),
+        }
@@ -0,0 +1,46 @@
+"""Single-flight decorator for expensive, user-independent read computations."""
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from app import cache
+from config.settings import get_settings
+
+
+def coalesce(
+    name: str,
+    key: Optional[Callable[..., Tuple[Any, ...]]] = None,
+    window: Optional[float] = None,
+):
+    """Share one computation between concurrent identical calls.
+
+    Calls are identified by `key(*args, **kwargs)` or, by default, by the
+    bound arguments normalised to "param=value" strings (so positional and
+    keyword calls with defaults filled in match). While a call is in flight,
+    identical calls await it; its result is then reused for `window` seconds
+    (COALESCE_WINDOW_SECONDS by default) through the "<name>" cache namespace,
+    which the redis backend shares across workers.
+
+    Only decorate functions whose result does not depend on the caller, and
+    treat the shared result as read-only.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(fn)
+
+        def default_key(*args: Any, **kwargs: Any) -> Tuple[str, ...]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(f"{param}={value}" for param, value in sorted(bound.arguments.items()))
+
+        make_key = key or default_key
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            ttl = window or get_settings().coalesce_window_seconds
+            namespace = cache.get_cache().namespace(name, ttl=ttl)
+            return await namespace.get_or_compute(make_key(*args, **kwargs), lambda: fn(*args, **kwargs), ttl=ttl)
+
+        return wrapper
+
+    return decorator
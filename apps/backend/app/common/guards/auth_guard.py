@@ -41,6 +41,8 @@ class AuthGuardMiddleware(BaseHTTPMiddleware):
         self.public_routes = public_routes or [
             "/",
             "/api/health",
+            "/api/health/live",
+            "/api/health/ready",
             "/api/auth/login",
             "/api/auth/register",
             "/api/auth/refresh",
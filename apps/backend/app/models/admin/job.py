@@ -0,0 +1,37 @@
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+
+class AdminJob(Document):
+    """Background job started by an admin, with persisted progress"""
+
+    kind: str  # e.g. contest_rollover
+    status: str = "pending"  # pending, running, completed, failed
+    user_id: str  # Admin who started the job
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+    # Progress
+    total: int = 0
+    processed: int = 0
+
+    # Outcome
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    # Refreshed while the job runs; a stale one means its worker died
+    heartbeat_at: Optional[datetime] = None
+
+    class Settings:
+        name = "admin_jobs"
+        indexes = [
+            [("kind", 1), ("created_at", -1)],
+            [("status", 1)],
+        ]
+
+    def __repr__(self):
+        return f"<AdminJob {self.kind} {self.status}>"
@@ -1,4 +1,5 @@
 from beanie import Document, Indexed
+from pymongo import IndexModel
 from pydantic import Field
 from datetime import datetime
 from typing import Optional, List
@@ -33,6 +34,10 @@ class Contest(Document):
     # list of allowed real-world team names (Player.team) for daily contests
     allowed_teams: List[str] = Field(default_factory=list)
 
+    # archived final standings (set when a completed contest is finalized)
+    final_standings_version: Optional[int] = None
+    finalized_at: Optional[datetime] = None
+
     created_at: datetime = Field(default_factory=now_ist)
     updated_at: datetime = Field(default_factory=now_ist)
 
@@ -44,4 +49,12 @@ class Contest(Document):
             [("end_at", 1)],
             [("status", 1), ("start_at", -1)],
             [("contest_type", 1)],
+            # keyset pagination order used by contest listings
+            [("start_at", -1), ("_id", -1)],
+            [("visibility", 1), ("start_at", -1), ("_id", -1)],
+            IndexModel(
+                [("code", "text"), ("name", "text")],
+                name="contest_text_search",
+                weights={"code": 10, "name": 5},
+            ),
         ]
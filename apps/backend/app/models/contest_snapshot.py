@@ -0,0 +1,55 @@
+from beanie import Document, Indexed, PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel
+from datetime import datetime
+from typing import Optional, List
+
+
+class ContestRoster(Document):
+    """Player index table for a contest's frozen team snapshots.
+
+    Team snapshots refer to players by their position in `player_ids`, so
+    the table only ever grows (new players are appended, never reordered).
+    """
+
+    contest_id: Indexed(PydanticObjectId, unique=True)  # type: ignore
+    player_ids: List[PydanticObjectId] = []
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "contest_rosters"
+
+
+class ContestTeamSnapshot(Document):
+    """Immutable copy of an enrolled team taken when its contest went ongoing.
+
+    `players` holds indices into the contest's ContestRoster.player_ids and
+    `multipliers` the matching score multiplier per player (women's slot and
+    captain/vice-captain already combined).
+    """
+
+    contest_id: PydanticObjectId
+    team_id: PydanticObjectId
+    user_id: PydanticObjectId
+    team_name: str
+    rank_change: Optional[int] = None
+
+    players: List[int] = []
+    multipliers: List[float] = []
+    captain: Optional[int] = None  # roster index of the captain
+    vice_captain: Optional[int] = None  # roster index of the vice-captain
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "contest_team_snapshots"
+        indexes = [
+            # One snapshot per (contest, team); the first write wins
+            IndexModel(
+                [("contest_id", 1), ("team_id", 1)],
+                name="contest_team_snapshot_unique",
+                unique=True,
+            ),
+            [("contest_id", 1), ("user_id", 1)],
+        ]
@@ -0,0 +1,41 @@
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel
+from datetime import datetime
+from typing import Optional
+
+
+class ContestFinalStanding(Document):
+    """Archived final leaderboard row of a completed contest.
+
+    Rows are written once per finalization under a new `version`; the
+    contest's `final_standings_version` points at the version being served.
+    """
+
+    contest_id: PydanticObjectId
+    version: int
+    rank: int
+
+    team_id: PydanticObjectId
+    user_id: PydanticObjectId
+    team_name: str
+    rank_change: Optional[int] = None
+    points: float = 0.0
+
+    # user display fields as of finalization
+    username: str
+    display_name: str
+    avatar_url: Optional[str] = None
+
+    finalized_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "contest_final_standings"
+        indexes = [
+            IndexModel(
+                [("contest_id", 1), ("version", 1), ("rank", 1)],
+                name="contest_final_standing_rank",
+                unique=True,
+            ),
+            [("contest_id", 1), ("version", 1), ("user_id", 1), ("rank", 1)],
+        ]
@@ -1,12 +1,18 @@
 from beanie import Document, Indexed, PydanticObjectId
 from pydantic import Field
+from pymongo import IndexModel
 from datetime import datetime, timedelta
 from typing import Optional
 
+# Expired reset records are kept for a day (for support/audit) before the TTL
+# monitor removes them; the flow itself enforces expires_at on every read.
+RESET_RECORD_RETENTION_SECONDS = 24 * 60 * 60
+
 
 class PasswordResetSession(Document):
     user_id: PydanticObjectId
     phone: Indexed(str)  # type: ignore
+    phone_digits: Optional[str] = None  # digits-only phone for exact lookups
     provider: str = "2factor"
     provider_session_id: str
     status: str = "pending"
@@ -20,7 +26,12 @@ class PasswordResetSession(Document):
         name = "password_reset_sessions"
         indexes = [
             "phone",
-            [("expires_at", 1)],
+            [("phone_digits", 1), ("status", 1)],
+            IndexModel(
+                [("expires_at", 1)],
+                name="expires_at_1",
+                expireAfterSeconds=RESET_RECORD_RETENTION_SECONDS,
+            ),
         ]
 
 
@@ -36,5 +47,9 @@ class PasswordResetToken(Document):
         name = "password_reset_tokens"
         indexes = [
             "token_hash",
-            [("expires_at", 1)],
+            IndexModel(
+                [("expires_at", 1)],
+                name="expires_at_1",
+                expireAfterSeconds=RESET_RECORD_RETENTION_SECONDS,
+            ),
         ]
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""Projection models for hot read paths.
+
+Used with Beanie's `.project(...)` so queries fetch only the fields a route
+actually reads instead of whole documents (e.g. User.hashed_password).
+"""
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List
+
+
+class UserDisplay(BaseModel):
+    """User fields shown on leaderboards"""
+    id: PydanticObjectId = Field(alias="_id")
+    username: str
+    full_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+    @property
+    def display_name(self) -> str:
+        return self.full_name or self.username
+
+
+class PlayerPoints(BaseModel):
+    """Player global points"""
+    id: PydanticObjectId = Field(alias="_id")
+    points: float = 0.0
+
+
+class ContestPlayerPoints(BaseModel):
+    """Per-contest points of a player"""
+    player_id: PydanticObjectId
+    points: float = 0.0
+
+
+class PlayerSummary(BaseModel):
+    """Player fields shown in a contest team view"""
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    team: Optional[str] = None
+    price: float = 0.0
+    slot: Optional[str] = None
+
+    @field_validator("slot", mode="before")
+    @classmethod
+    def convert_slot_to_string(cls, v):
+        if v is not None and not isinstance(v, str):
+            return str(v)
+        return v
+
+
+class EnrollmentTeamRef(BaseModel):
+    """Team id of an enrollment"""
+    team_id: PydanticObjectId
+
+
+class TeamLineup(BaseModel):
+    """Team fields needed for scoring and leaderboard rows"""
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: PydanticObjectId
+    team_name: str
+    player_ids: List[str] = []
+    captain_id: Optional[str] = None
+    vice_captain_id: Optional[str] = None
+    total_points: float = 0.0
+    rank_change: Optional[int] = None
@@ -1,5 +1,6 @@
 from beanie import Document, Indexed, PydanticObjectId
 from pydantic import Field
+from pymongo import IndexModel
 from datetime import datetime
 from typing import Optional
 from app.common.enums.enrollments import EnrollmentStatus
@@ -24,4 +25,11 @@ class TeamContestEnrollment(Document):
             "user_id",
             [("contest_id", 1), ("status", 1)],
             [("team_id", 1), ("contest_id", 1), ("status", 1)],
+            # At most one active enrollment per (team, contest), even under concurrent enrolls
+            IndexModel(
+                [("team_id", 1), ("contest_id", 1)],
+                name="team_contest_active_unique",
+                unique=True,
+                partialFilterExpression={"status": EnrollmentStatus.ACTIVE.value},
+            ),
         ]
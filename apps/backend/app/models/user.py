@@ -1,4 +1,5 @@
 from beanie import Document, Indexed, PydanticObjectId
+from pymongo import IndexModel
 from pydantic import Field, EmailStr, ConfigDict
 from datetime import datetime
 from typing import Optional
@@ -12,6 +13,7 @@ class User(Document):
     hashed_password: str
     full_name: Optional[str] = None
     mobile: Optional[str] = None
+    mobile_digits: Optional[str] = None  # digits-only mobile for indexed lookups
     is_active: bool = True
     is_verified: bool = False
     is_admin: bool = False
@@ -28,6 +30,12 @@ class User(Document):
             "username",
             "email",
             [("created_at", -1)],
+            IndexModel(
+                [("mobile_digits", 1)],
+                name="mobile_digits_unique",
+                unique=True,
+                partialFilterExpression={"mobile_digits": {"$type": "string"}},
+            ),
         ]
 
     def __repr__(self):
@@ -38,20 +46,28 @@ class User(Document):
 
 
 class RefreshToken(Document):
-    """Refresh token document model for MongoDB"""
+    """Refresh token document model for MongoDB
+
+    Only the SHA-256 digest of the JWT is stored. Tokens issued by rotation
+    share a family_id so replay of a rotated token can revoke the whole chain.
+    """
 
     user_id: PydanticObjectId
-    token: Indexed(str, unique=True)  # type: ignore
+    token_hash: Indexed(str, unique=True)  # type: ignore
+    family_id: str
     expires_at: datetime
     created_at: datetime = Field(default_factory=datetime.utcnow)
     revoked: bool = False
+    revoked_at: Optional[datetime] = None
 
     class Settings:
         name = "refresh_tokens"
         indexes = [
-            "token",
+            "token_hash",
             "user_id",
-            [("expires_at", 1)],  # TTL index for auto-deletion
+            [("family_id", 1), ("revoked", 1)],
+            # TTL index: MongoDB deletes tokens once expires_at has passed
+            IndexModel([("expires_at", 1)], name="expires_at_1", expireAfterSeconds=0),
         ]
 
 
@@ -3,6 +3,8 @@ from .users import router as users_router
 from .sponsors import router as sponsors_router
 from .leaderboard import router as leaderboard_router
 from .contests import router as contests_router
+from .me import router as me_router
+from .health import router as health_router
 
 __all__ = [
     "auth_router",
@@ -10,4 +12,6 @@ __all__ = [
     "sponsors_router",
     "leaderboard_router",
     "contests_router",
+    "me_router",
+    "health_router",
 ]
@@ -3,6 +3,8 @@ from .slots import router as slots_router
 from .players_import import router as players_import_router
 from .contests import router as contests_router
 from .teams_users import router as users_teams_router
+from .metrics import router as metrics_router
+from .jobs import router as jobs_router
 
 __all__ = [
     "players_router",
@@ -10,4 +12,6 @@ __all__ = [
     "players_import_router",
     "contests_router",
     "users_teams_router",
+    "metrics_router",
+    "jobs_router",
 ]
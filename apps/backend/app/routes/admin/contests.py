@@ -3,6 +3,7 @@ from typing import Optional, List
 from beanie import PydanticObjectId
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
 from app.utils.timezone import now_ist, to_ist
 from pydantic import BaseModel
 
@@ -18,6 +19,8 @@ from app.schemas.contest import (
     ContestUpdate,
     ContestResponse,
     ContestListResponse,
+    ContestRolloverRequest,
+    ContestRolloverResponse,
 )
 from app.schemas.enrollment import (
     EnrollmentBulkRequest,
@@ -26,6 +29,15 @@ from app.schemas.enrollment import (
 )
 from app.utils.dependencies import get_admin_user
 from app.models.user import User
+from app.services.contests.lifecycle import scheduler as lifecycle_scheduler, status_for_window
+from app.services.contests.listing import CountMode, build_contest_filter, list_contests_page
+from app.services.contests.enrollments import remove_enrollments
+from app.services.contests.rollover import create_rollover_contest, copy_enrollments
+from app.services.contests.snapshots import delete_snapshots, freeze_contest
+from app.services.contests.finalize import delete_final_standings, refinalize_if_completed
+from app.services.contests import live_feed
+from app.services import reference_data
+from app.services.jobs import start_job
 
 router = APIRouter(prefix="/api/admin/contests", tags=["Admin - Contests"])
 
@@ -66,7 +78,7 @@ async def create_contest(
         description=data.description,
         start_at=data.start_at,
         end_at=data.end_at,
-        status=data.status,
+        status=data.status if data.status == ContestStatus.ARCHIVED else status_for_window(data.start_at, data.end_at),
         visibility=data.visibility,
         points_scope=data.points_scope,
         contest_type=data.contest_type,
@@ -75,6 +87,7 @@ async def create_contest(
         updated_at=now,
     )
     await contest.insert()
+    lifecycle_scheduler.notify()
     return await to_response(contest)
 
 
@@ -84,25 +97,30 @@ async def list_contests(
     page_size: int = Query(10, ge=1, le=100),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: CountMode = Query("exact"),
     current_user: User = Depends(get_admin_user),
 ):
-    query = Contest.find_all()
+    conditions: dict = {}
     if status:
-        query = Contest.find(Contest.status == status)
-    # Simple search on code or name (case sensitive minimal)
-    if search:
-        from beanie.operators import Or, RegEx
-        conditions = Or(RegEx(Contest.code, search, options="i"), RegEx(Contest.name, search, options="i"))
-        query = Contest.find(conditions)
-
-    total = await query.count()
-    skip = (page - 1) * page_size
-    rows = await query.skip(skip).limit(page_size).sort(-Contest.start_at).to_list()
+        conditions["status"] = status
+    # Search via the text index on code/name, keeping the status filter
+    try:
+        rows, next_cursor, total = await list_contests_page(
+            build_contest_filter(conditions, search),
+            page_size=page_size,
+            cursor=cursor,
+            page=page,
+            count=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {
         "contests": [await to_response(c) for c in rows],
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 
@@ -137,8 +155,17 @@ async def update_contest(
 
     for k, v in update_fields.items():
         setattr(contest, k, v)
+    # Keep the persisted status consistent with the (possibly new) window
+    previous_status = contest.status
+    if contest.status != ContestStatus.ARCHIVED:
+        contest.status = status_for_window(contest.start_at, contest.end_at)
     contest.updated_at = now_ist()
     await contest.save()
+    if contest.status != previous_status:
+        # The scheduler will not see this transition: freeze lineups on
+        # ONGOING, archive standings on COMPLETED
+        await lifecycle_scheduler.run_hooks(contest.status, [contest.id])
+    lifecycle_scheduler.notify()
     return await to_response(contest)
 
 
@@ -159,21 +186,61 @@ async def delete_contest(
     # If there are active enrollments, honor force=true to unenroll and proceed.
     if active_enrollments > 0:
         if force:
-            # mark all active enrollments removed
-            async for enr in TeamContestEnrollment.find({
-                "contest_id": contest.id,
-                "status": EnrollmentStatus.ACTIVE,
-            }):
-                enr.status = EnrollmentStatus.REMOVED
-                enr.removed_at = now_ist()
-                await enr.save()
+            # mark all active enrollments removed in one update
+            await remove_enrollments(contest, all_active=True)
         else:
             raise HTTPException(status_code=409, detail="Contest has active enrollments. Use force=true to unenroll and delete.")
 
+    await delete_snapshots(contest.id)
+    await delete_final_standings(contest.id)
     await contest.delete()
     return {"message": "Contest deleted"}
 
 
+@router.post("/{contest_id}/rollover", response_model=ContestRolloverResponse, status_code=201)
+async def rollover_contest(
+    contest_id: str,
+    data: ContestRolloverRequest,
+    current_user: User = Depends(get_admin_user),
+):
+    """Clone a contest into a new window and copy its active enrollments.
+
+    Enrollments are copied by a background job; teams with players outside
+    the new contest's allowed_teams are skipped.
+    """
+    source = await Contest.get(contest_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Contest not found")
+    if data.start_at >= data.end_at:
+        raise HTTPException(status_code=400, detail="start_at must be before end_at")
+    existing = await Contest.find_one(Contest.code == data.code)
+    if existing:
+        raise HTTPException(status_code=400, detail="Contest code already exists")
+
+    contest = await create_rollover_contest(
+        source,
+        code=data.code,
+        start_at=data.start_at,
+        end_at=data.end_at,
+        name=data.name,
+        description=data.description,
+        allowed_teams=data.allowed_teams,
+    )
+
+    job_id = None
+    if data.copy_enrollments:
+        source_id, target_id = source.id, contest.id
+        job = await start_job(
+            kind="contest_rollover",
+            user_id=str(current_user.id),
+            params={"source_contest_id": str(source_id), "contest_id": str(target_id)},
+            fn=lambda job: copy_enrollments(job, source_id, target_id),
+        )
+        job_id = str(job.id)
+
+    return ContestRolloverResponse(contest=await to_response(contest), job_id=job_id)
+
+
 @router.post("/{contest_id}/enroll-teams", response_model=List[EnrollmentResponse])
 async def enroll_teams(
     contest_id: str,
@@ -187,56 +254,86 @@ async def enroll_teams(
     if not body.team_ids:
         return []
 
-    created: List[EnrollmentResponse] = []
-
+    # Validate ids up front, preserving request order and dropping repeats
+    team_oids: List[PydanticObjectId] = []
     for tid in body.team_ids:
         try:
-            oid = PydanticObjectId(tid)
+            team_oids.append(PydanticObjectId(tid))
         except Exception:
             raise HTTPException(status_code=400, detail=f"Invalid team id: {tid}")
-        team = await Team.get(oid)
-        if not team:
-            raise HTTPException(status_code=404, detail=f"Team not found: {tid}")
-
-        # Ensure no duplicate active enrollment
-        existing = await TeamContestEnrollment.find_one(
-            (TeamContestEnrollment.team_id == team.id)
-            & (TeamContestEnrollment.contest_id == contest.id)
-            & (TeamContestEnrollment.status == "active")
-        )
-        if existing:
-            # skip duplicates silently
-            continue
+    team_oids = list(dict.fromkeys(team_oids))
+
+    # One query for all teams
+    teams = await Team.find({"_id": {"$in": team_oids}}).to_list()
+    teams_by_id = {t.id: t for t in teams}
+    for oid in team_oids:
+        if oid not in teams_by_id:
+            raise HTTPException(status_code=404, detail=f"Team not found: {oid}")
+
+    # One query for teams already actively enrolled; those are skipped silently
+    already_enrolled = set(await TeamContestEnrollment.get_motor_collection().distinct(
+        "team_id",
+        {
+            "contest_id": contest.id,
+            "team_id": {"$in": team_oids},
+            "status": EnrollmentStatus.ACTIVE,
+        },
+    ))
 
-        enr = TeamContestEnrollment(
-            team_id=team.id,
-            user_id=team.user_id,
+    now = now_ist()
+    new_enrollments = [
+        TeamContestEnrollment(
+            id=PydanticObjectId(),
+            team_id=oid,
+            user_id=teams_by_id[oid].user_id,
             contest_id=contest.id,
             status=EnrollmentStatus.ACTIVE,
-            enrolled_at=now_ist(),
+            enrolled_at=now,
         )
-        await enr.insert()
-        # Persist contest_id on the team for convenience
-        try:
-            team.contest_id = str(contest.id)
-            team.updated_at = now_ist()
-            await team.save()
-        except Exception:
-            # Do not fail enrollment if team update fails
-            pass
-        created.append(
-            EnrollmentResponse(
-                id=str(enr.id),
-                team_id=str(enr.team_id),
-                user_id=str(enr.user_id),
-                contest_id=str(enr.contest_id),
-                status=enr.status,
-                enrolled_at=enr.enrolled_at,
-                removed_at=enr.removed_at,
-            )
+        for oid in team_oids
+        if oid not in already_enrolled
+    ]
+    if not new_enrollments:
+        return []
+
+    # One insert for all new enrollments; the partial unique index rejects
+    # rows a concurrent request enrolled in the meantime
+    try:
+        await TeamContestEnrollment.insert_many(new_enrollments, ordered=False)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != 11000 for err in write_errors):
+            raise
+        failed = {err["index"] for err in write_errors}
+        new_enrollments = [enr for i, enr in enumerate(new_enrollments) if i not in failed]
+
+    # Persist contest_id on the teams for convenience (best-effort)
+    try:
+        await Team.find({"_id": {"$in": [enr.team_id for enr in new_enrollments]}}).update_many(
+            {"$set": {"contest_id": str(contest.id), "updated_at": now}}
         )
+    except Exception:
+        # Do not fail enrollment if team update fails
+        pass
 
-    return created
+    # Contest already locked: freeze the new teams' lineups now
+    if contest.status == ContestStatus.ONGOING:
+        await freeze_contest(contest.id, team_ids=[enr.team_id for enr in new_enrollments])
+    refinalize_if_completed(contest)
+    live_feed.publish(contest.id)
+
+    return [
+        EnrollmentResponse(
+            id=str(enr.id),
+            team_id=str(enr.team_id),
+            user_id=str(enr.user_id),
+            contest_id=str(enr.contest_id),
+            status=enr.status,
+            enrolled_at=enr.enrolled_at,
+            removed_at=enr.removed_at,
+        )
+        for enr in new_enrollments
+    ]
 
 
 @router.delete("/{contest_id}/enrollments")
@@ -249,64 +346,15 @@ async def unenroll(
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
-    count = 0
-    # Collect affected team ids to batch-check for remaining active enrollments
-    from typing import Set
-    affected_team_ids: Set[PydanticObjectId] = set()
-
-    if body.enrollment_ids:
-        for eid in body.enrollment_ids:
-            enr = await TeamContestEnrollment.get(eid)
-            if enr and enr.contest_id == contest.id and enr.status == "active":
-                enr.status = "removed"
-                enr.removed_at = now_ist()
-                await enr.save()
-                count += 1
-                affected_team_ids.add(enr.team_id)
-
-    if body.team_ids:
-        for tid in body.team_ids:
-            try:
-                toid = PydanticObjectId(tid)
-            except Exception:
-                continue
-            enr = await TeamContestEnrollment.find_one(
-                (TeamContestEnrollment.team_id == toid)
-                & (TeamContestEnrollment.contest_id == contest.id)
-                & (TeamContestEnrollment.status == EnrollmentStatus.ACTIVE)
-            )
-            if enr:
-                enr.status = EnrollmentStatus.REMOVED
-                enr.removed_at = now_ist()
-                await enr.save()
-                count += 1
-                affected_team_ids.add(toid)
-
-    # Batch check and clear team.contest_id for teams with no remaining active enrollments
-    if affected_team_ids:
-        try:
-            # Find teams that still have at least one active enrollment for this contest
-            still_active_team_ids: Set[PydanticObjectId] = set()
-            async for active in TeamContestEnrollment.find({
-                "team_id": {"$in": list(affected_team_ids)},
-                "contest_id": contest.id,
-                "status": "active",
-            }):
-                still_active_team_ids.add(active.team_id)
-
-            # Teams to clear = affected - still_active
-            to_clear_ids = [tid for tid in affected_team_ids if tid not in still_active_team_ids]
-            for tid in to_clear_ids:
-                team = await Team.get(tid)
-                if team and team.contest_id is not None:
-                    team.contest_id = None
-                    team.updated_at = now_ist()
-                    await team.save()
-        except Exception:
-            # Best-effort cleanup; ignore errors
-            pass
-
-    return {"unenrolled": count}
+    result = await remove_enrollments(
+        contest,
+        enrollment_ids=body.enrollment_ids,
+        team_ids=body.team_ids,
+    )
+    if result["modified"]:
+        refinalize_if_completed(contest)
+        live_feed.publish(contest.id)
+    return {"unenrolled": result["modified"], **result}
 
 
 # -------- Per-Contest Player Points Management --------
@@ -437,8 +485,14 @@ async def upsert_player_points(
                 except Exception:
                     # continue best-effort for each player, do not fail the response
                     continue
+            # Player.points is part of the cached reference data
+            await reference_data.invalidate()
     except Exception:
         # Non-blocking
         pass
 
+    # Corrections to a completed contest refresh its archived standings
+    refinalize_if_completed(contest)
+    live_feed.publish(contest.id)
+
     return resp
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.models.user import User
+from app.models.admin.job import AdminJob
+from app.schemas.admin.job import JobResponse
+from app.services import jobs
+from app.utils.dependencies import get_admin_user
+
+router = APIRouter(prefix="/api/admin/jobs", tags=["Admin - Jobs"])
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, current_user: User = Depends(get_admin_user)):
+    """Return status and progress of a background admin job"""
+    try:
+        job = await AdminJob.get(job_id)
+    except Exception:
+        job = None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in ("pending", "running") and await jobs.fail_interrupted(job.id):
+        job = await AdminJob.get(job.id)
+
+    return JobResponse(
+        id=str(job.id),
+        kind=job.kind,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        progress=(job.processed / job.total) if job.total else (1.0 if job.status == "completed" else 0.0),
+        params=job.params,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+    )
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends
+
+from app import cache
+from app.models.user import User
+from app.utils.dependencies import get_admin_user
+from app.utils import blocking, loop_lag, metrics, startup
+from app.utils.mongo_pool import pool_snapshot
+from app.utils.request_stats import route_snapshot
+from app.utils.security import pending_hash_jobs
+from app.services.auth import twofactor
+from app.services.contests import live_feed
+from config.database import DOCUMENT_MODELS, get_database, indexes_ready
+
+router = APIRouter(prefix="/api/admin/metrics", tags=["Admin - Metrics"])
+
+
+@router.get("")
+async def get_metrics(current_user: User = Depends(get_admin_user)):
+    """Return in-process counters and latency percentiles for this worker."""
+    data = metrics.snapshot()
+    data["password_hash"] = {"pending": pending_hash_jobs()}
+    data["twofactor"] = {"breaker": twofactor.breaker.state}
+    data["live_feed"] = live_feed.stats()
+    data["routes"] = route_snapshot()
+    data["mongo_pool"] = pool_snapshot()
+    data["startup"] = {**startup.snapshot(), "indexes_ready": indexes_ready()}
+    data["cache"] = cache.get_cache().snapshot()
+    data["event_loop"] = loop_lag.snapshot()
+    data["blocking"] = blocking.snapshot()
+    return data
+
+
+@router.get("/collections")
+async def get_collection_metrics(current_user: User = Depends(get_admin_user)):
+    """Report document counts and storage/index sizes for each collection."""
+    db = get_database()
+    names = sorted({model.get_settings().name for model in DOCUMENT_MODELS})
+
+    collections = {}
+    for name in names:
+        stats = {"count": 0, "size_bytes": 0, "storage_bytes": 0, "index_bytes": 0, "index_sizes": {}}
+        # $collStats returns one document per shard; sum them up
+        pipeline = [{"$collStats": {"storageStats": {}}}]
+        try:
+            async for doc in db[name].aggregate(pipeline):
+                storage = doc.get("storageStats", {})
+                stats["count"] += storage.get("count", 0)
+                stats["size_bytes"] += storage.get("size", 0)
+                stats["storage_bytes"] += storage.get("storageSize", 0)
+                stats["index_bytes"] += storage.get("totalIndexSize", 0)
+                for index_name, size in (storage.get("indexSizes") or {}).items():
+                    stats["index_sizes"][index_name] = stats["index_sizes"].get(index_name, 0) + size
+        except Exception as e:
+            # Collection may not exist yet
+            stats["error"] = str(e)
+        collections[name] = stats
+
+    return {"collections": collections}
@@ -15,6 +15,7 @@ from app.schemas.admin.player import (
 )
 from app.utils.dependencies import get_admin_user
 from app.models.user import User
+from app.services import reference_data
 
 router = APIRouter(prefix="/api/admin/players", tags=["Admin - Players"]) 
 
@@ -151,6 +152,7 @@ async def create_player(
     )
     
     await player.insert()
+    await reference_data.invalidate()
     
     return PlayerResponse(
         id=str(player.id),
@@ -227,6 +229,7 @@ async def update_player(
                 team.updated_at = datetime.utcnow()
                 await team.save()
     
+    await reference_data.invalidate()
     return PlayerResponse(
         id=str(player.id),
         name=player.name,
@@ -257,6 +260,7 @@ async def delete_player(
         raise HTTPException(status_code=404, detail="Player not found")
     
     await player.delete()
+    await reference_data.invalidate()
     
     return None
 
@@ -278,6 +282,7 @@ async def delete_all_players(
     
     # Also delete from public players collection
     await PublicPlayer.find_all().delete()
+    await reference_data.invalidate()
     
     return {
         "message": f"Successfully deleted {count} players",
@@ -19,6 +19,7 @@ from app.schemas.admin.player import (
 )
 from app.utils.dependencies import get_admin_user
 from app.models.user import User
+from app.services import reference_data
 
 router = APIRouter(prefix="/api/admin/slots", tags=["Admin - Slots"])
 
@@ -158,6 +159,7 @@ async def migrate_slots_from_players(
                 count = await query.count()
                 updated_counts[str(val)] = count
 
+    await reference_data.invalidate()
     return {
         "dry_run": dry_run,
         "created_slots": created,
@@ -192,6 +194,7 @@ async def create_slot(
         updated_at=now,
     )
     await slot.insert()
+    await reference_data.invalidate()
     return await build_slot_response(slot)
 
 
@@ -230,6 +233,7 @@ async def update_slot(
         setattr(slot, k, v)
     slot.updated_at = datetime.utcnow()
     await slot.save()
+    await reference_data.invalidate()
     return await build_slot_response(slot)
 
 
@@ -256,6 +260,7 @@ async def delete_slot(
         unassigned = len(players_in_slot)
 
     await slot.delete()
+    await reference_data.invalidate()
     return {"message": "Slot successfully deleted", "unassigned_players": unassigned}
 
 
@@ -321,6 +326,7 @@ async def assign_players_to_slot(
             player.slot = str(slot.id)
             await player.save()
             assigned += 1
+    await reference_data.invalidate()
     return {"assigned": assigned}
 
 
@@ -340,6 +346,7 @@ async def unassign_player_from_slot(
         return {"unassigned": 0}
     player.slot = None
     await player.save()
+    await reference_data.invalidate()
     return {"unassigned": 1}
 
 
@@ -359,4 +366,5 @@ async def bulk_unassign_players_from_slot(
             player.slot = None
             await player.save()
             count += 1
+    await reference_data.invalidate()
     return {"unassigned": count}
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from datetime import datetime, timedelta
+from uuid import uuid4
 
 from app.models.user import User, RefreshToken
 import logging
@@ -15,17 +16,22 @@ from app.schemas.auth import (
 )
 from app.schemas.user import UserResponse
 from app.utils.security import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    password_needs_rehash,
+    PasswordHasherBusy,
     create_access_token,
     create_refresh_token,
-    decode_token
+    decode_token,
+    hash_token,
 )
 from app.utils.dependencies import get_current_active_user
 from config.settings import get_settings
 from pydantic import EmailStr, ValidationError
 from typing import Optional
 from app.utils.gridfs import upload_avatar_to_gridfs
+from app.utils import metrics
+from app.utils.phone import normalize_mobile_digits
 from app.services.auth.password_reset import (
     start_session as pr_start_session,
     verify_otp_and_issue_token as pr_verify_and_issue,
@@ -36,6 +42,36 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 settings = get_settings()
 logger = logging.getLogger("app.auth")
 
+REFRESH_TOKEN_DAYS = 7
+
+
+async def _issue_tokens(user: User, family_id: Optional[str] = None) -> dict:
+    """Create an access/refresh pair and store the refresh token digest.
+
+    A new login starts a token family; rotation passes the existing family_id.
+    """
+    family_id = family_id or uuid4().hex
+    access_token = create_access_token(data={"sub": user.username})
+    refresh_token = create_refresh_token(
+        data={"sub": user.username, "fam": family_id},
+        expires_days=REFRESH_TOKEN_DAYS,
+    )
+
+    refresh_token_doc = RefreshToken(
+        user_id=user.id,
+        token_hash=hash_token(refresh_token),
+        family_id=family_id,
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_DAYS)
+    )
+    await refresh_token_doc.insert()
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
+
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register(
     username: str = Form(...),
@@ -76,14 +112,25 @@ async def register(
             detail="Email already registered"
         )
 
+    # Check if mobile is already linked to another account
+    mobile_digits = normalize_mobile_digits(user_data.mobile)
+    if mobile_digits:
+        existing_mobile = await User.find_one(User.mobile_digits == mobile_digits)
+        if existing_mobile:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Mobile already registered"
+            )
+
     # Create new user document
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         username=user_data.username.lower(),
         email=user_data.email,
         hashed_password=hashed_password,
         full_name=user_data.full_name,
         mobile=user_data.mobile,
+        mobile_digits=mobile_digits,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
@@ -100,28 +147,17 @@ async def register(
         await new_user.save()
 
     # Generate tokens
-    access_token = create_access_token(data={"sub": new_user.username})
-    refresh_token = create_refresh_token(data={"sub": new_user.username})
-
-    # Store refresh token in database
-    refresh_token_doc = RefreshToken(
-        user_id=new_user.id,
-        token=refresh_token,
-        expires_at=datetime.utcnow() + timedelta(days=7)
-    )
-    await refresh_token_doc.insert()
-
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer"
-    }
+    return await _issue_tokens(new_user)
 
 
 @router.post("/login", response_model=Token)
 async def login(user_data: UserLogin):
     """Login with username (or mobile) and password"""
+    with metrics.timed("auth.login"):
+        return await _login(user_data)
+
 
+async def _login(user_data: UserLogin):
     identifier = (user_data.username or "").strip()
 
     # First try username lookup (lowercased)
@@ -129,15 +165,12 @@ async def login(user_data: UserLogin):
 
     # If not found and identifier looks like a mobile, try matching by mobile digits
     if not user:
-        input_digits = "".join(ch for ch in identifier if ch.isdigit())
+        input_digits = normalize_mobile_digits(identifier)
         if input_digits:
-            async for u in User.find(User.mobile != None):
-                digits = "".join(ch for ch in (u.mobile or "") if ch.isdigit())
-                if digits and digits == input_digits:
-                    user = u
-                    break
+            user = await User.find_one(User.mobile_digits == input_digits)
 
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    if not user or not await verify_password_async(user_data.password, user.hashed_password):
+        metrics.incr("auth.login.failed")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -151,27 +184,21 @@ async def login(user_data: UserLogin):
             detail="User account is disabled"
         )
 
+    # Transparently upgrade hashes created with an outdated cost factor
+    if password_needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await get_password_hash_async(user_data.password)
+            metrics.incr("auth.login.rehashed")
+        except PasswordHasherBusy:
+            # Not worth failing a valid login; retry on a later login
+            pass
+
     # Update last login
     user.last_login = datetime.utcnow()
     await user.save()
 
     # Generate tokens
-    access_token = create_access_token(data={"sub": user.username})
-    refresh_token = create_refresh_token(data={"sub": user.username})
-
-    # Store refresh token
-    refresh_token_doc = RefreshToken(
-        user_id=user.id,
-        token=refresh_token,
-        expires_at=datetime.utcnow() + timedelta(days=7)
-    )
-    await refresh_token_doc.insert()
-
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer"
-    }
+    return await _issue_tokens(user)
 
 
 @router.post("/refresh", response_model=Token)
@@ -186,68 +213,54 @@ async def refresh_token(refresh_token: str):
             detail="Invalid refresh token"
         )
 
-    # Check if token exists in database and is not revoked
-    token_doc = await RefreshToken.find_one(
-        RefreshToken.token == refresh_token,
-        RefreshToken.revoked == False
+    # Rotate atomically: revoke the presented token only if it is still valid
+    token_hash = hash_token(refresh_token)
+    now = datetime.utcnow()
+    rotated = await RefreshToken.get_motor_collection().find_one_and_update(
+        {"token_hash": token_hash, "revoked": False, "expires_at": {"$gt": now}},
+        {"$set": {"revoked": True, "revoked_at": now}},
+        projection={"user_id": 1, "family_id": 1},
     )
 
-    if not token_doc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Refresh token not found or has been revoked"
+    if not rotated:
+        # A revoked token being presented again means it leaked: kill its family
+        reused = await RefreshToken.find_one(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked == True
         )
-
-    # Check if token is expired
-    if token_doc.expires_at < datetime.utcnow():
+        if reused:
+            await RefreshToken.find(
+                RefreshToken.family_id == reused.family_id,
+                RefreshToken.revoked == False
+            ).update_many({"$set": {"revoked": True, "revoked_at": now}})
+            metrics.incr("auth.refresh.reuse_detected")
+            logger.warning("Refresh token reuse detected; revoked family %s", reused.family_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Refresh token has expired"
+            detail="Refresh token not found, expired or revoked"
         )
 
     # Get user
-    username = payload.get("sub")
-    user = await User.find_one(User.username == username)
+    user = await User.get(rotated["user_id"])
 
-    if not user:
+    if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
 
-    # Revoke old refresh token
-    token_doc.revoked = True
-    await token_doc.save()
-
-    # Generate new tokens
-    new_access_token = create_access_token(data={"sub": user.username})
-    new_refresh_token = create_refresh_token(data={"sub": user.username})
-
-    # Store new refresh token
-    new_token_doc = RefreshToken(
-        user_id=user.id,
-        token=new_refresh_token,
-        expires_at=datetime.utcnow() + timedelta(days=7)
-    )
-    await new_token_doc.insert()
-
-    return {
-        "access_token": new_access_token,
-        "refresh_token": new_refresh_token,
-        "token_type": "bearer"
-    }
+    # Issue the next token in the same family
+    return await _issue_tokens(user, family_id=rotated["family_id"])
 
 
 @router.post("/logout")
 async def logout(refresh_token: str):
     """Logout and revoke refresh token"""
 
-    # Find and revoke refresh token
-    token_doc = await RefreshToken.find_one(RefreshToken.token == refresh_token)
-
-    if token_doc:
-        token_doc.revoked = True
-        await token_doc.save()
+    # Revoke refresh token by its digest
+    await RefreshToken.find_one(
+        RefreshToken.token_hash == hash_token(refresh_token)
+    ).update({"$set": {"revoked": True, "revoked_at": datetime.utcnow()}})
 
     return {"message": "Successfully logged out"}
 
@@ -255,16 +268,12 @@ async def logout(refresh_token: str):
 @router.post("/reset-password-mobile")
 async def reset_password_by_mobile(payload: ResetPasswordByMobile):
     """Reset password by verifying the provided mobile number matches a stored user."""
-    # Normalize input by digits to compare fairly
-    input_digits = ''.join(ch for ch in payload.mobile if ch.isdigit())
+    # Normalize input by digits to compare against the indexed mobile_digits
+    input_digits = normalize_mobile_digits(payload.mobile)
 
     matched_user = None
-    # Since mobile may be stored with symbols/spaces, scan users with a mobile set
-    async for u in User.find(User.mobile != None):
-        digits = ''.join(ch for ch in (u.mobile or '') if ch.isdigit())
-        if digits and digits == input_digits:
-            matched_user = u
-            break
+    if input_digits:
+        matched_user = await User.find_one(User.mobile_digits == input_digits)
 
     if not matched_user:
         raise HTTPException(
@@ -272,7 +281,7 @@ async def reset_password_by_mobile(payload: ResetPasswordByMobile):
             detail="User with provided mobile not found"
         )
 
-    matched_user.hashed_password = get_password_hash(payload.new_password)
+    matched_user.hashed_password = await get_password_hash_async(payload.new_password)
     matched_user.updated_at = datetime.utcnow()
     await matched_user.save()
 
@@ -330,6 +339,8 @@ async def forgot_password_reset(payload: ForgotPasswordReset):
             "Response 200 /api/auth/forgot-password/reset body={'message':'Password updated.'}"
         )
         return {"message": "Password updated."}
+    except PasswordHasherBusy:
+        raise
     except Exception:
         logger.warning(
             "Response 400 /api/auth/forgot-password/reset body={'detail':'Invalid or expired reset token'}"
@@ -343,21 +354,21 @@ async def change_password(
 ):
     """Change password for authenticated user with current password verification"""
     # Verify current password
-    if not verify_password(payload.current_password, current_user.hashed_password):
+    if not await verify_password_async(payload.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
 
     # Check that new password is different from current
-    if verify_password(payload.new_password, current_user.hashed_password):
+    if await verify_password_async(payload.new_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="New password must be different from current password"
         )
 
     # Update password
-    current_user.hashed_password = get_password_hash(payload.new_password)
+    current_user.hashed_password = await get_password_hash_async(payload.new_password)
     current_user.updated_at = datetime.utcnow()
     await current_user.save()
 
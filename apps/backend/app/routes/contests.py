@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
-from typing import Optional, List, Dict, Annotated
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Dict, Annotated, Tuple
 from beanie import PydanticObjectId
-from beanie.operators import Or, RegEx
 from datetime import datetime
 from pydantic import BaseModel
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from app.utils.timezone import now_ist, to_ist
 
 from app.models.contest import Contest
@@ -20,7 +21,24 @@ from app.utils.dependencies import get_current_active_user
 from app.schemas.enrollment import EnrollmentResponse
 from app.common.enums.contests import ContestVisibility, ContestStatus
 from app.common.enums.enrollments import EnrollmentStatus
-
+from config.settings import get_settings
+from app.services.contests.listing import CountMode, build_contest_filter, list_contests_page
+from app.models.contest_snapshot import ContestTeamSnapshot
+from app.models.projections import ContestPlayerPoints, PlayerSummary, UserDisplay
+from app.services.contests.finalize import archived_page, archived_user_entry
+from app.services.contests import live_feed
+from app.services.contests.scoring import FROZEN_STATUSES, compute_standings
+from app.services.contests.snapshots import (
+    freeze_contest,
+    get_roster,
+    player_oids,
+    team_lineup,
+    women_slot_player_ids,
+)
+from app.utils.read_policy import ReadPolicy, find_as
+from app.cache import coalesce
+
+settings = get_settings()
 router = APIRouter(prefix="/api/contests", tags=["contests"])
 
 class EnrollRequest(BaseModel):
@@ -45,27 +63,8 @@ class ContestTeamResponse(BaseModel):
     vice_captain_id: Optional[str] = None
     players: List[ContestTeamPlayerSchema]
 
-def _compute_status(contest: Contest) -> ContestStatus:
-    now = now_ist()
-    # Ensure contest times are in IST for comparison
-    start = to_ist(contest.start_at)
-    end = to_ist(contest.end_at)
-    if end <= now:
-        return ContestStatus.COMPLETED
-    if start <= now < end:
-        return ContestStatus.ONGOING
-    return ContestStatus.LIVE
-
-
-async def to_contest_response(contest: Contest, skip_save: bool = False) -> ContestResponse:
-    # Derive status from time window to reflect real-time lifecycle
-    computed = _compute_status(contest)
-    # Update in-memory status without persisting (saves go to DB asynchronously)
-    if contest.status != computed and contest.status != ContestStatus.ARCHIVED:
-        contest.status = computed
-        contest.updated_at = now_ist()
-        # Skip immediate save for performance; status updates are idempotent
-        # and will be persisted on next write operation or background task
+async def to_contest_response(contest: Contest) -> ContestResponse:
+    # Status is persisted by the contest lifecycle scheduler at window boundaries
     return ContestResponse(
         id=str(contest.id),
         code=contest.code,
@@ -73,7 +72,7 @@ async def to_contest_response(contest: Contest, skip_save: bool = False) -> Cont
         description=contest.description,
         start_at=to_ist(contest.start_at),
         end_at=to_ist(contest.end_at),
-        status=computed,
+        status=contest.status,
         visibility=contest.visibility,
         points_scope=contest.points_scope,
         contest_type=contest.contest_type,
@@ -106,41 +105,31 @@ async def list_public_contests(
     page_size: Annotated[int, Query(ge=1, le=100)] = 10,
     status: Annotated[ContestStatus | None, Query()] = None,
     q: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query(description="Opaque cursor from a previous page's next_cursor")] = None,
+    count: Annotated[CountMode, Query()] = "exact",
 ):
-    conditions = [Contest.visibility == ContestVisibility.PUBLIC]
-
-    # Map status to filter clauses
-    now = now_ist()
-    status_filters = {
-        ContestStatus.ONGOING: [Contest.start_at <= now, Contest.end_at > now],
-        ContestStatus.LIVE: [Contest.start_at > now],
-        ContestStatus.COMPLETED: [Contest.end_at <= now],
-        ContestStatus.ARCHIVED: [Contest.status == ContestStatus.ARCHIVED],
-    }
+    conditions: dict = {"visibility": ContestVisibility.PUBLIC.value}
     if status:
-        conditions.extend(status_filters[status])
-
-    query = Contest.find(conditions[0]) if conditions else Contest.find_all()
-    for cond in conditions[1:]:
-        query = query.find(cond)
+        conditions["status"] = status.value
 
-    if q:
-        # Text search on code or name, then re-apply filters
-        query = Contest.find(Or(RegEx(Contest.code, q, options="i"), RegEx(Contest.name, q, options="i")))
-        for cond in conditions:
-            query = query.find(cond)
-
-    total = await query.count()
-    skip = (page - 1) * page_size
-    rows = await query.skip(skip).limit(page_size).sort("-start_at").to_list()
+    try:
+        rows, next_cursor, total = await list_contests_page(
+            build_contest_filter(conditions, q),
+            page_size=page_size,
+            cursor=cursor,
+            page=page,
+            count=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Convert to responses with computed status
     items = [await to_contest_response(c) for c in rows]
     return {
         "contests": items,
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 
@@ -193,8 +182,99 @@ async def get_contest_if_enrolled(contest_id: str, current_user: User = Depends(
     return await to_contest_response(contest)
 
 
+def _archived_entry(row: dict) -> LeaderboardEntrySchema:
+    return LeaderboardEntrySchema(
+        rank=row["rank"],
+        username=row["username"],
+        displayName=row["display_name"],
+        teamName=row["team_name"],
+        points=row["points"],
+        rankChange=row.get("rank_change"),
+        avatarUrl=row.get("avatar_url"),
+        teamId=str(row["team_id"]),
+    )
+
+
+async def _archived_leaderboard(
+    contest: Contest,
+    skip: int,
+    limit: int,
+    current_user: Optional[User],
+    request: Request,
+    response: Response,
+):
+    """Serve a finalized contest from the standings archive with HTTP caching.
+
+    The archive only changes when an admin re-finalizes the contest, which
+    bumps the version embedded in the ETag.
+    """
+    max_age = settings.contest_archive_cache_seconds
+    etag = f'"{contest.id}-{contest.final_standings_version}-{skip}-{limit}'
+    if current_user:
+        # currentUserEntry is per user, so only the user's own cache may keep it
+        etag += f'-{current_user.id}"'
+        cache_control = f"private, max-age={max_age}"
+    else:
+        etag += '"'
+        cache_control = f"public, max-age={max_age}, stale-while-revalidate={max_age * 24}"
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+
+    if request.headers.get("if-none-match") in (etag, f"W/{etag}"):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    rows = await archived_page(contest, skip, limit)
+    current_user_entry = None
+    if current_user:
+        row = await archived_user_entry(contest, current_user.id)
+        if row:
+            current_user_entry = _archived_entry(row)
+    return LeaderboardResponseSchema(
+        entries=[_archived_entry(row) for row in rows],
+        currentUserEntry=current_user_entry,
+    )
+
+
+@coalesce("contest_ranking", key=lambda contest: (contest.id, contest.status))
+async def _live_ranking(contest: Contest) -> List[Tuple[str, LeaderboardEntrySchema]]:
+    """Full ranked standings of a contest as (user id, entry) pairs.
+
+    User-independent, so concurrent leaderboard requests (e.g. when a match
+    ends) share one computation per contest.
+    """
+    # Locked contests are scored from frozen snapshots (see services/contests/scoring.py)
+    standings = await compute_standings(contest, ReadPolicy.LEADERBOARD)
+    if not standings:
+        return []
+
+    # fetch users in batch
+    user_ids = list({s.user_id for s in standings})
+    users = await find_as(User, UserDisplay, {"_id": {"$in": user_ids}}, ReadPolicy.LEADERBOARD)
+    users_by_id: Dict[str, UserDisplay] = {str(u.id): u for u in users}
+
+    ranking: List[Tuple[str, LeaderboardEntrySchema]] = []
+    for standing in standings:
+        user = users_by_id.get(str(standing.user_id))
+        if not user:
+            continue
+        entry = LeaderboardEntrySchema(
+            rank=len(ranking) + 1,
+            username=user.username,
+            displayName=user.display_name,
+            teamName=standing.team_name,
+            points=standing.points,
+            rankChange=standing.rank_change,
+            avatarUrl=user.avatar_url,
+            teamId=str(standing.team_id),
+        )
+        ranking.append((str(user.id), entry))
+    return ranking
+
+
 @router.get("/{contest_id}/leaderboard", response_model=LeaderboardResponseSchema)
 async def contest_leaderboard(
+    request: Request,
+    response: Response,
     contest_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
@@ -204,141 +284,51 @@ async def contest_leaderboard(
     if not contest or contest.visibility != ContestVisibility.PUBLIC:
         raise HTTPException(status_code=404, detail="Contest not found")
 
-    # fetch active enrollments
-    enrollments = await TeamContestEnrollment.find({
-        "contest_id": contest.id,
-        "status": EnrollmentStatus.ACTIVE,
-    }).to_list()
+    # Completed contests are read from their archived final standings
+    if contest.status == ContestStatus.COMPLETED and contest.final_standings_version is not None:
+        return await _archived_leaderboard(contest, skip, limit, current_user, request, response)
 
-    if not enrollments:
-        return LeaderboardResponseSchema(entries=[], currentUserEntry=None)
+    ranking = await _live_ranking(contest)
+    entries = [entry for _, entry in ranking[skip: skip + limit]]
 
-    team_ids = [enr.team_id for enr in enrollments]
-
-    # fetch teams in batch
-    teams = await Team.find({"_id": {"$in": team_ids}}).to_list()
-    teams_by_id: Dict[str, Team] = {str(t.id): t for t in teams}
+    current_user_entry: Optional[LeaderboardEntrySchema] = None
+    if current_user:
+        # current user's best-ranked team entry within this contest
+        current_user_id = str(current_user.id)
+        current_user_entry = next((entry for uid, entry in ranking if uid == current_user_id), None)
 
-    # fetch users in batch
-    user_ids = list({t.user_id for t in teams})
-    users = await User.find({"_id": {"$in": user_ids}}).to_list()
-    users_by_id: Dict[str, User] = {str(u.id): u for u in users}
-
-    # compute points and build entries using per-contest player points
-    # 1) Collect all player ObjectIds across enrolled teams
-    from bson import ObjectId as _OID
-    all_player_ids: set[PydanticObjectId] = set()
-    team_player_oids_map: Dict[str, list[PydanticObjectId]] = {}
-    for enr in enrollments:
-        team = teams_by_id.get(str(enr.team_id))
-        if not team:
-            continue
-        oids: list[PydanticObjectId] = []
-        for pid in team.player_ids:
-            if _OID.is_valid(pid):
-                try:
-                    oids.append(PydanticObjectId(pid))
-                except Exception:
-                    continue
-        team_player_oids_map[str(enr.team_id)] = oids
-        all_player_ids.update(oids)
-
-    # 2) Fetch all PlayerContestPoints for this contest once
-    pcp_docs = []
-    if all_player_ids:
-        pcp_docs = await PlayerContestPoints.find({
-            "contest_id": contest.id,
-            "player_id": {"$in": list(all_player_ids)},
-        }).to_list()
+    return LeaderboardResponseSchema(entries=entries, currentUserEntry=current_user_entry)
 
-    # 3) Build lookup: player_id(str) -> points(float)
-    pcp_points_map: Dict[str, float] = {str(doc.player_id): float(doc.points or 0.0) for doc in pcp_docs}
+@router.get("/{contest_id}/leaderboard/stream")
+async def contest_leaderboard_stream(
+    request: Request,
+    contest_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+):
+    """Server-Sent Events feed of the contest leaderboard.
 
-    # 3.5) Fetch all players and slots for women's slot multiplier
-    from app.models.admin.slot import Slot
-    players_list = []
-    if all_player_ids:
-        players_list = await Player.find({"_id": {"$in": list(all_player_ids)}}).to_list()
-    players_by_id_map: Dict[str, Player] = {str(p.id): p for p in players_list}
-    
-    slots_map = {}
-    all_slots = await Slot.find_all().to_list()
-    for s in all_slots:
-        slots_map[str(s.id)] = s
-
-    # 4) Sum per team and build computed list (apply women's slot + C/VC multipliers)
-    computed = []
-    for enr in enrollments:
-        team = teams_by_id.get(str(enr.team_id))
-        if not team:
-            continue
-        user = users_by_id.get(str(team.user_id))
-        if not user:
-            continue
-        oids = team_player_oids_map.get(str(enr.team_id), [])
-        # Sum using string form to match map keys, with captain/vice multipliers
-        total = 0.0
-        captain_id = str(team.captain_id) if team.captain_id else None
-        vice_id = str(team.vice_captain_id) if team.vice_captain_id else None
-        for oid in oids:
-            pid = str(oid)
-            base = float(pcp_points_map.get(pid, 0.0))
-            
-            # Apply women's slot multiplier first (2x)
-            player = players_by_id_map.get(pid)
-            if player and player.slot:
-                slot = slots_map.get(str(player.slot))
-                if slot and getattr(slot, 'is_women_slot', False):
-                    base *= 2.0
-            
-            # Then apply captain/vice-captain multiplier (stacks)
-            if captain_id and pid == captain_id:
-                base *= 2.0
-            elif vice_id and pid == vice_id:
-                base *= 1.5
-            total += base
-        points = float(total)
-        computed.append((team, user, float(points)))
-
-    # sort by points desc
-    computed.sort(key=lambda tup: tup[2], reverse=True)
-
-    # pagination
-    sliced = computed[skip: skip + limit]
-
-    entries: List[LeaderboardEntrySchema] = []
-    current_user_entry: Optional[LeaderboardEntrySchema] = None
+    Sends a `snapshot` event for the window [skip, skip+limit), then `delta`
+    events carrying only entries whose rank/points changed (plus the
+    caller's own entry as `me`), with `: ping` heartbeats in between.
+    """
+    contest = await Contest.get(contest_id)
+    if not contest or contest.visibility != ContestVisibility.PUBLIC:
+        raise HTTPException(status_code=404, detail="Contest not found")
+    user_id = str(current_user.id) if current_user else None
 
-    for idx, (team, user, points) in enumerate(sliced, start=skip + 1):
-        entry = LeaderboardEntrySchema(
-            rank=idx,
-            username=user.username,
-            displayName=user.full_name or user.username,
-            teamName=team.team_name,
-            points=points,
-            rankChange=team.rank_change,
-            avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-            teamId=str(team.id),
-        )
-        entries.append(entry)
+    async def events():
+        async with live_feed.subscribe(contest.id) as feed:
+            async for chunk in live_feed.stream(feed, skip, limit, user_id, request.is_disconnected):
+                yield chunk
 
-    if current_user:
-        # find current user's best-ranked team entry within this contest
-        for rank_idx, (team, user, points) in enumerate(computed, start=1):
-            if str(user.id) == str(current_user.id):
-                current_user_entry = LeaderboardEntrySchema(
-                    rank=rank_idx,
-                    username=user.username,
-                    displayName=user.full_name or user.username,
-                    teamName=team.team_name,
-                    points=points,
-                    rankChange=team.rank_change,
-                    avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-                    teamId=str(team.id),
-                )
-                break
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    return LeaderboardResponseSchema(entries=entries, currentUserEntry=current_user_entry)
 
 @router.post("/{contest_id}/enroll", response_model=EnrollmentResponse)
 async def enroll_in_contest(
@@ -371,9 +361,8 @@ async def enroll_in_contest(
         raise HTTPException(status_code=404, detail="Team not found")
 
     # Only allow non-owners to view when contest is ONGOING
-    computed_status = _compute_status(contest)
     is_owner = current_user is not None and str(team.user_id) == str(current_user.id)
-    if not is_owner and computed_status != ContestStatus.ONGOING:
+    if not is_owner and contest.status != ContestStatus.ONGOING:
         raise HTTPException(status_code=403, detail="Team details visible when contest is ongoing")
 
     # If daily contest with restrictions: validate team players belong to allowed teams
@@ -422,7 +411,22 @@ async def enroll_in_contest(
         status=EnrollmentStatus.ACTIVE,
         enrolled_at=now_ist(),
     )
-    await enr.insert()  # type: ignore
+    try:
+        await enr.insert()  # type: ignore
+    except DuplicateKeyError:
+        # A concurrent request enrolled the same team first; return that enrollment
+        enr = await TeamContestEnrollment.find_one({
+            "team_id": team.id,
+            "contest_id": contest.id,
+            "status": EnrollmentStatus.ACTIVE,
+        })
+        if not enr:
+            raise HTTPException(status_code=409, detail="Enrollment conflict, please retry")
+
+    # Late enrollment into a locked contest: freeze this team's lineup now
+    if contest.status == ContestStatus.ONGOING:
+        await freeze_contest(contest.id, team_ids=[team.id])
+    live_feed.publish(contest.id)
 
     return EnrollmentResponse(
         id=str(enr.id),
@@ -449,9 +453,8 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
         raise HTTPException(status_code=404, detail="Team not found")
 
     # Allow team owner anytime; others only when contest is ONGOING or COMPLETED
-    computed_status = _compute_status(contest)
     is_owner = current_user is not None and str(team.user_id) == str(current_user.id)
-    if not is_owner and computed_status not in (ContestStatus.ONGOING, ContestStatus.COMPLETED):
+    if not is_owner and contest.status not in (ContestStatus.ONGOING, ContestStatus.COMPLETED):
         raise HTTPException(status_code=403, detail="Team details visible when contest is ongoing or completed")
 
     enr = await TeamContestEnrollment.find_one({
@@ -462,57 +465,48 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
     if not enr:
         raise HTTPException(status_code=404, detail="Team is not enrolled in this contest")
 
-    # Load players for price/name/team details
-    player_ids_valid = [PydanticObjectId(pid) for pid in team.player_ids if ObjectId.is_valid(pid)]
-    players = await Player.find({"_id": {"$in": player_ids_valid}}).to_list()
+    # Once the contest is locked, show the lineup frozen at lock time
+    snapshot = None
+    if contest.status in FROZEN_STATUSES:
+        snapshot = await ContestTeamSnapshot.find_one({"contest_id": contest.id, "team_id": team.id})
+    if snapshot:
+        roster = await get_roster(contest.id)
+        lineup = [roster[i] for i in snapshot.players]
+        multipliers = snapshot.multipliers
+        team_name = snapshot.team_name
+        captain_id = str(roster[snapshot.captain]) if snapshot.captain is not None else None
+        vice_id = str(roster[snapshot.vice_captain]) if snapshot.vice_captain is not None else None
+    else:
+        team_name = team.team_name
+        captain_id = str(team.captain_id) if team.captain_id else None
+        vice_id = str(team.vice_captain_id) if team.vice_captain_id else None
+        women = await women_slot_player_ids(player_oids(team.player_ids))
+        lineup, multipliers = team_lineup(
+            {"player_ids": team.player_ids, "captain_id": captain_id, "vice_captain_id": vice_id},
+            women,
+        )
 
-    players_by_id: Dict[str, Player] = {str(p.id): p for p in players}
+    # Load players for price/name/team details
+    players = await Player.find({"_id": {"$in": lineup}}).project(PlayerSummary).to_list()
+    players_by_id: Dict[str, PlayerSummary] = {str(p.id): p for p in players}
 
     # Fetch per-contest points for these players
     pcp_docs = []
-    if player_ids_valid:
+    if lineup:
         pcp_docs = await PlayerContestPoints.find({
             "contest_id": contest.id,
-            "player_id": {"$in": player_ids_valid},
-        }).to_list()
+            "player_id": {"$in": lineup},
+        }).project(ContestPlayerPoints).to_list()
     pcp_points_map: Dict[str, float] = {str(doc.player_id): float(doc.points or 0.0) for doc in pcp_docs}
 
-    # Fetch all slots to check for women's slot
-    from app.models.admin.slot import Slot
-    slots_map = {}
-    all_slots = await Slot.find_all().to_list()
-    for s in all_slots:
-        slots_map[str(s.id)] = s
-
-
-    # Fetch slots for women's slot multiplier
-    from app.models.admin.slot import Slot
-    slots_map = {}
-    all_slots = await Slot.find_all().to_list()
-    for s in all_slots:
-        slots_map[str(s.id)] = s
-
     player_items: List[ContestTeamPlayerSchema] = []
-    captain_id = str(team.captain_id) if team.captain_id else None
-    vice_id = str(team.vice_captain_id) if team.vice_captain_id else None
-    for pid in team.player_ids:
+    for oid, multiplier in zip(lineup, multipliers):
+        pid = str(oid)
         p = players_by_id.get(pid)
         if not p:
             continue
-        # Apply multipliers for this player's contest points
-        contest_pts = float(pcp_points_map.get(pid, 0.0))
-        
-        # Apply women's slot multiplier first (2x)
-        if p.slot:
-            slot = slots_map.get(str(p.slot))
-            if slot and getattr(slot, 'is_women_slot', False):
-                contest_pts *= 2.0
-        
-        # Then apply captain/vice-captain multiplier (stacks)
-        if captain_id and pid == captain_id:
-            contest_pts *= 2.0
-        elif vice_id and pid == vice_id:
-            contest_pts *= 1.5
+        # Women's slot and captain/vice-captain multipliers are combined per player
+        contest_pts = float(pcp_points_map.get(pid, 0.0)) * multiplier
         player_items.append(ContestTeamPlayerSchema(
             id=pid,
             name=p.name,
@@ -527,11 +521,11 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
 
     return ContestTeamResponse(
         team_id=str(team.id),
-        team_name=team.team_name,
+        team_name=team_name,
         contest_id=str(contest.id),
         base_points=0.0,
         contest_points=team_points,
-        captain_id=str(team.captain_id) if team.captain_id else None,
-        vice_captain_id=str(team.vice_captain_id) if team.vice_captain_id else None,
+        captain_id=captain_id,
+        vice_captain_id=vice_id,
         players=player_items,
     )
\ No newline at end of file
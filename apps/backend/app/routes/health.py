@@ -0,0 +1,80 @@
+"""Liveness and readiness probes.
+
+/api/health/live only proves the worker's event loop answers; restart the
+worker when it fails. /api/health/ready (also served at /api/health) checks
+what a request needs and returns 503 while any check fails, so the load
+balancer sheds traffic from a worker whose database or pool is wedged or
+whose loop is lagging before latency explodes. With
+MONGODB_INDEX_MODE=background a worker also stays unready until its index
+build has succeeded.
+"""
+import time
+from datetime import datetime
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app import cache
+from app.services import jobs, reference_data
+from app.utils import loop_lag
+from app.utils.mongo_pool import checked_out, pool_snapshot
+from config.database import indexes_ready, ping
+from config.settings import get_settings
+
+settings = get_settings()
+router = APIRouter(prefix="/api/health", tags=["health"])
+
+_started = time.monotonic()
+
+
+async def _check_mongo() -> dict:
+    try:
+        latency = await ping(settings.health_db_timeout_seconds)
+    except Exception as e:
+        return {"ok": False, "error": type(e).__name__}
+    return {"ok": True, "latency_ms": round(latency * 1000, 1)}
+
+
+def _check_pool() -> dict:
+    # MONGODB_MAX_POOL_SIZE applies per server
+    busiest = max((pool["checked_out"] for pool in pool_snapshot().values()), default=0)
+    limit = settings.mongodb_max_pool_size * settings.health_max_pool_usage
+    return {
+        "ok": busiest < limit,
+        "checked_out": checked_out(),
+        "busiest_server_checked_out": busiest,
+        "max_pool_size": settings.mongodb_max_pool_size,
+    }
+
+
+def _check_loop() -> dict:
+    lag_ms = loop_lag.current_lag() * 1000
+    return {"ok": lag_ms < settings.health_max_loop_lag_ms, "lag_ms": round(lag_ms, 1)}
+
+
+@router.get("/live")
+async def liveness():
+    return {"status": "alive", "uptime_seconds": round(time.monotonic() - _started, 1)}
+
+
+@router.get("")
+@router.get("/ready")
+async def readiness():
+    checks = {
+        "mongo": await _check_mongo(),
+        "pool": _check_pool(),
+        "event_loop": _check_loop(),
+        "reference_data": {"ok": reference_data.is_warm()},
+        # Unique and text indexes must exist before writes and searches are served
+        "indexes": {"ok": indexes_ready()},
+    }
+    ready = all(check["ok"] for check in checks.values())
+    cache_state = cache.get_cache().snapshot()
+    body = {
+        "status": "ready" if ready else "unavailable",
+        "checks": checks,
+        "background_jobs": jobs.running_jobs(),
+        "cache": {"backend": cache_state["backend"], "listening": cache_state["listening"]},
+        "timestamp": datetime.now().isoformat(),
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
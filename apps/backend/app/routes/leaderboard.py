@@ -6,7 +6,10 @@ from app.schemas.leaderboard import LeaderboardResponseSchema, LeaderboardEntryS
 from app.utils.security import decode_token
 from beanie import PydanticObjectId
 from app.models.player import Player as PublicPlayer
-from datetime import datetime
+from app.models.projections import PlayerPoints, TeamLineup, UserDisplay
+from app.utils.read_policy import ReadPolicy, find_as
+from app.cache import coalesce
+from app.services import team_totals
 
 router = APIRouter(prefix="/api/leaderboard", tags=["leaderboard"])
 
@@ -78,6 +81,80 @@ async def _compute_team_points(team: Team) -> float:
     return float(total)
 
 
+@coalesce("global_ranking")
+async def _global_ranking() -> Optional[List[Tuple[str, LeaderboardEntrySchema]]]:
+    """Global standings as (owner user id, entry) pairs; None when there are no teams.
+
+    User-independent, so concurrent leaderboard requests share one computation.
+    """
+    # Fetch all teams (only the fields used for scoring and display)
+    teams = await find_as(Team, TeamLineup, {}, ReadPolicy.LEADERBOARD)
+    if not teams:
+        return None
+
+    # Compute points for all teams with a single players query to avoid N+1
+    # 1) Collect all player ObjectIds across teams
+    all_player_ids: set[PydanticObjectId] = set()
+    team_player_ids_map: dict[str, list[PydanticObjectId]] = {}
+    for team in teams:
+        obj_ids: list[PydanticObjectId] = []
+        for pid in team.player_ids:
+            try:
+                obj_ids.append(PydanticObjectId(pid))
+            except Exception:
+                continue
+        team_player_ids_map[str(team.id)] = obj_ids
+        all_player_ids.update(obj_ids)
+
+    # 2) Fetch all needed players once
+    players = []
+    if all_player_ids:
+        players = await find_as(
+            PublicPlayer, PlayerPoints, {"_id": {"$in": list(all_player_ids)}}, ReadPolicy.LEADERBOARD
+        )
+
+    # 3) Build a points lookup
+    player_points_map = {str(p.id): float(p.points or 0.0) for p in players}
+
+    # 4) Compute per-team totals using the lookup
+    team_points_list: List[Tuple[TeamLineup, float]] = []
+    stale_team_ids: List[PydanticObjectId] = []
+    for team in teams:
+        ids_for_team = team_player_ids_map.get(str(team.id), [])
+        computed_points = sum(player_points_map.get(str(obj_id), 0.0) for obj_id in ids_for_team)
+        team_points_list.append((team, float(computed_points)))
+        if float(team.total_points or 0.0) != float(computed_points):
+            stale_team_ids.append(team.id)
+    # These reads may lag the primary: let the sync re-read there before writing totals
+    if stale_team_ids:
+        team_totals.schedule_sync(stale_team_ids)
+
+    # Sort by computed points desc
+    team_points_list.sort(key=lambda x: x[1], reverse=True)
+
+    # Fetch display fields of all team owners in one query
+    owner_ids = list({team.user_id for team in teams})
+    users = await find_as(User, UserDisplay, {"_id": {"$in": owner_ids}}, ReadPolicy.LEADERBOARD)
+    users_by_id = {u.id: u for u in users}
+
+    ranking: List[Tuple[str, LeaderboardEntrySchema]] = []
+    for idx, (team, points) in enumerate(team_points_list):
+        user = users_by_id.get(team.user_id)
+        if not user:
+            continue
+        entry = LeaderboardEntrySchema(
+            rank=idx + 1,
+            username=user.username,
+            displayName=user.display_name,
+            teamName=team.team_name,
+            points=points,
+            rankChange=team.rank_change,
+            avatarUrl=user.avatar_url,
+        )
+        ranking.append((str(team.user_id), entry))
+    return ranking
+
+
 @router.get("", response_model=LeaderboardResponseSchema)
 async def get_leaderboard(
     current_user: Optional[User] = Depends(get_optional_current_user),
@@ -87,80 +164,21 @@ async def get_leaderboard(
     If user is authenticated, also returns their position.
     """
     try:
-        # Fetch all teams
-        teams = await Team.find_all().to_list()
+        ranking = await _global_ranking()
 
         # If no teams exist, return mock data for development
-        if not teams:
+        if ranking is None:
             return _get_mock_leaderboard(current_user)
 
-        # Build leaderboard entries
-        entries = []
+        entries = [entry for _, entry in ranking]
         current_user_entry = None
-        
-        # Compute points for all teams with a single players query to avoid N+1
-        # 1) Collect all player ObjectIds across teams
-        all_player_ids: set[PydanticObjectId] = set()
-        team_player_ids_map: dict[str, list[PydanticObjectId]] = {}
-        for team in teams:
-            obj_ids: list[PydanticObjectId] = []
-            for pid in team.player_ids:
-                try:
-                    obj_ids.append(PydanticObjectId(pid))
-                except Exception:
-                    continue
-            team_player_ids_map[str(team.id)] = obj_ids
-            all_player_ids.update(obj_ids)
-
-        # 2) Fetch all needed players once
-        players = []
-        if all_player_ids:
-            players = await PublicPlayer.find({"_id": {"$in": list(all_player_ids)}}).to_list()
-
-        # 3) Build a points lookup
-        player_points_map = {str(p.id): float(p.points or 0.0) for p in players}
-
-        # 4) Compute per-team totals using the lookup and optionally sync stored totals
-        team_points_list: List[Tuple[Team, float]] = []
-        for team in teams:
-            ids_for_team = team_player_ids_map.get(str(team.id), [])
-            computed_points = sum(player_points_map.get(str(obj_id), 0.0) for obj_id in ids_for_team)
-            team_points_list.append((team, float(computed_points)))
-            # Sync stored total if differs
-            try:
-                if float(team.total_points or 0.0) != float(computed_points):
-                    team.total_points = float(computed_points)
-                    team.updated_at = datetime.utcnow()
-                    await team.save()
-            except Exception:
-                pass
+        if current_user:
+            # Check which entry is the current user's team (the last one if several)
+            current_user_id = str(current_user.id)
+            for user_id, entry in ranking:
+                if user_id == current_user_id:
+                    current_user_entry = entry
 
-        # Sort by computed points desc
-        team_points_list.sort(key=lambda x: x[1], reverse=True)
-
-        for idx, (team, points) in enumerate(team_points_list):
-            rank = idx + 1
-            # Get user info for this team
-            user = await User.get(team.user_id)
-            if not user:
-                continue
-            
-            entry = LeaderboardEntrySchema(
-                rank=rank,
-                username=user.username,
-                displayName=user.full_name or user.username,
-                teamName=team.team_name,
-                points=points,
-                rankChange=team.rank_change,
-                avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-            )
-            
-            entries.append(entry)
-            
-            # Check if this is the current user's team
-            if current_user and str(team.user_id) == str(current_user.id):
-                current_user_entry = entry
-        
         return LeaderboardResponseSchema(
             entries=entries,
             currentUserEntry=current_user_entry
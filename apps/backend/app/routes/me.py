@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Depends
+from typing import Dict, List, Tuple
+
+from bson import ObjectId
+
+from app.common.enums.contests import ContestStatus
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.contest_standing import ContestFinalStanding
+from app.models.projections import TeamLineup
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.models.user import User
+from app.routes.contests import to_contest_response
+from app.schemas.dashboard import DashboardEntry, DashboardResponse
+from app.services.contests.scoring import compute_standings_many
+from app.utils.dependencies import get_current_active_user
+
+router = APIRouter(prefix="/api/me", tags=["me"])
+
+
+async def _archived_ranks(contests: List[Contest], user_id: ObjectId) -> Tuple[Dict, Dict]:
+    """Archived (rank, points) per (contest, team) for the user, and row counts per contest."""
+    if not contests:
+        return {}, {}
+    versions = [{"contest_id": c.id, "version": c.final_standings_version} for c in contests]
+    coll = ContestFinalStanding.get_motor_collection()
+
+    mine = {}
+    async for row in coll.find(
+        {"$or": versions, "user_id": user_id},
+        {"contest_id": 1, "team_id": 1, "rank": 1, "points": 1},
+    ):
+        mine[(row["contest_id"], row["team_id"])] = (row["rank"], row["points"])
+
+    totals = {}
+    async for row in coll.aggregate([
+        {"$match": {"$or": versions}},
+        {"$group": {"_id": "$contest_id", "count": {"$sum": 1}}},
+    ]):
+        totals[row["_id"]] = row["count"]
+    return mine, totals
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(current_user: User = Depends(get_current_active_user)):
+    """All of the user's active enrollments with contest, team, points and rank.
+
+    Replaces the enrollments -> contest -> team request fan-out with a fixed
+    number of batched queries regardless of how many contests the user is in.
+    """
+    enrollments = await TeamContestEnrollment.find({
+        "user_id": current_user.id,
+        "status": EnrollmentStatus.ACTIVE,
+    }).to_list()
+    if not enrollments:
+        return DashboardResponse(entries=[])
+
+    contests = await Contest.find({"_id": {"$in": list({e.contest_id for e in enrollments})}}).to_list()
+    contests_by_id = {c.id: c for c in contests}
+    teams = await Team.find({"_id": {"$in": list({e.team_id for e in enrollments})}}).project(TeamLineup).to_list()
+    teams_by_id = {t.id: t for t in teams}
+
+    # Finalized contests come from the archive; everything else is scored in one batch
+    finalized = [
+        c for c in contests
+        if c.status == ContestStatus.COMPLETED and c.final_standings_version is not None
+    ]
+    finalized_ids = {c.id for c in finalized}
+    archived, archived_totals = await _archived_ranks(finalized, current_user.id)
+    standings = await compute_standings_many([c for c in contests if c.id not in finalized_ids])
+
+    live_ranks: Dict[Tuple[ObjectId, ObjectId], Tuple[int, float]] = {}
+    for contest_id, rows in standings.items():
+        for rank, row in enumerate(rows, start=1):
+            if row.user_id == current_user.id:
+                live_ranks[(contest_id, row.team_id)] = (rank, row.points)
+
+    contest_responses = {c.id: await to_contest_response(c) for c in contests}
+
+    entries: List[DashboardEntry] = []
+    for enr in enrollments:
+        contest = contests_by_id.get(enr.contest_id)
+        team = teams_by_id.get(enr.team_id)
+        if not contest or not team:
+            continue
+        key = (contest.id, team.id)
+        if contest.id in finalized_ids:
+            rank, points = archived.get(key, (None, 0.0))
+            total = archived_totals.get(contest.id, 0)
+        else:
+            rank, points = live_ranks.get(key, (None, 0.0))
+            total = len(standings.get(contest.id, []))
+        entries.append(DashboardEntry(
+            enrollment_id=str(enr.id),
+            enrolled_at=enr.enrolled_at,
+            contest=contest_responses[contest.id],
+            team_id=str(team.id),
+            team_name=team.team_name,
+            captain_id=team.captain_id,
+            vice_captain_id=team.vice_captain_id,
+            points=points,
+            rank=rank,
+            total_teams=total,
+        ))
+
+    entries.sort(key=lambda e: e.contest.start_at, reverse=True)
+    return DashboardResponse(entries=entries)
@@ -4,6 +4,8 @@ from beanie import PydanticObjectId
 from app.models.player import Player
 from app.models.contest import Contest
 from app.schemas.player import PlayerOut
+from app.services import reference_data
+from app.cache import coalesce
 
 router = APIRouter(prefix="/api/players", tags=["players"])
 
@@ -26,6 +28,7 @@ def serialize_player(player: Player) -> PlayerOut:
     )
 
 @router.get("", response_model=List[PlayerOut])
+@coalesce("player_catalogue")
 async def list_players(
     slot: Optional[str] = Query(None, description="Filter players by Slot ObjectId string"),
     gender: Optional[str] = Query(None, description="Filter by gender: 'male' or 'female'"),
@@ -34,14 +37,14 @@ async def list_players(
     skip: int = Query(0, ge=0),
 ):
     """Get list of players with optional filtering by slot (ObjectId string) and gender."""
-    # Build filters list
-    filters = []
-    
+    # Filtered from the warm catalogue, already sorted by team (for grouping), then name
+    players = (await reference_data.get()).players
+
     if slot is not None:
-        filters.append({"slot": str(slot)})
+        players = [p for p in players if p.slot == str(slot)]
     
     if gender is not None:
-        filters.append({"gender": gender})
+        players = [p for p in players if p.gender == gender]
     
     # If contest_id provided and contest is daily with restrictions, apply allowed team filter
     if contest_id:
@@ -50,19 +53,10 @@ async def list_players(
         except Exception:
             contest = None
         if contest and contest.contest_type == "daily" and contest.allowed_teams:
-            filters.append({"team": {"$in": contest.allowed_teams}})
-
-    # Construct final query
-    if len(filters) > 1:
-        query = {"$and": filters}
-    elif len(filters) == 1:
-        query = filters[0]
-    else:
-        query = {}
+            allowed = set(contest.allowed_teams)
+            players = [p for p in players if p.team in allowed]
 
-    # Sort by team first (for grouping), then by name alphabetically
-    players = await Player.find(query).sort("+team", "+name").skip(skip).limit(limit).to_list()
-    return [serialize_player(player) for player in players]
+    return [serialize_player(player) for player in players[skip:skip + limit]]
 
 @router.get("/{id}", response_model=PlayerOut)
 async def get_player(id: str):
@@ -6,6 +6,7 @@ from app.schemas.player_hot import PlayerHot, PlayerHotIds, PlayerHotSingle
 from app.schemas.player import PlayerOut
 from app.models.player import Player
 from app.services import hot_players as svc
+from app.cache import coalesce
 from app.common.consts.index import HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
 
 router = APIRouter(prefix="/api/players", tags=["players", "hot"])
@@ -30,6 +31,7 @@ def _serialize_player(player: Player) -> PlayerOut:
 
 
 @router.get("/hot", response_model=List[PlayerHot])
+@coalesce("hot_players")
 async def list_hot_players(
     contest_id: Optional[str] = Query(None),
     threshold: Optional[int] = Query(None, ge=1),
@@ -3,6 +3,7 @@ from typing import Optional
 
 from app.models.admin.slot import Slot
 from app.models.player import Player
+from app.services import reference_data
 from app.schemas.slot import SlotPublic, SlotListPublic
 
 router = APIRouter(prefix="/api/slots", tags=["slots"])
@@ -28,16 +29,12 @@ async def list_slots(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
 ):
-    total = await Slot.find_all().count()
+    ref = await reference_data.get()
     skip = (page - 1) * page_size
-    slots = await Slot.find_all().skip(skip).limit(page_size).to_list()
+    counts = ref.player_counts_by_slot()
+    results = [to_public(s, counts.get(str(s.id), 0)) for s in ref.slots[skip:skip + page_size]]
 
-    results: list[SlotPublic] = []
-    for s in slots:
-        cnt = await Player.find(Player.slot == str(s.id)).count()
-        results.append(to_public(s, cnt))
-
-    return {"slots": results, "total": total}
+    return {"slots": results, "total": len(ref.slots)}
 
 
 @router.get("/{slot_id}", response_model=SlotPublic)
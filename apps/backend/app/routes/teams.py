@@ -10,7 +10,7 @@ from app.models.contest import Contest
 from app.models.user import User
 from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamsListResponse
 from app.utils.dependencies import get_current_active_user
-from app.models.admin.slot import Slot
+from app.services import reference_data
 
 router = APIRouter(prefix="/api/teams", tags=["teams"])
 
@@ -72,21 +72,8 @@ async def create_team(
             slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
 
     # Build validation set: slots present in selection + all slots with min_select > 0
-    present_slot_ids = list(slot_counts.keys())
-    present_slot_oids = []
-    for sid in present_slot_ids:
-        try:
-            present_slot_oids.append(PydanticObjectId(sid))
-        except Exception:
-            # If slot id is malformed, skip; it won't be validated
-            continue
-    slots_present = await Slot.find({"_id": {"$in": present_slot_oids}}).to_list() if present_slot_oids else []
-    slots_with_min = await Slot.find(Slot.min_select > 0).to_list()
-
-    # Merge unique slots by id
-    slots_by_id: Dict[str, Slot] = {str(s.id): s for s in slots_present}
-    for s in slots_with_min:
-        slots_by_id.setdefault(str(s.id), s)
+    ref = await reference_data.get()
+    slots_by_id = ref.slots_to_validate(slot_counts)
 
     violations = []
     for sid, slot in slots_by_id.items():
@@ -302,15 +289,11 @@ async def update_team(
         "status": "active",
     }).to_list()
     if active_enrs:
-        from datetime import datetime as _dt
         contest_ids = [enr.contest_id for enr in active_enrs]
-        # Ongoing = status active AND start_at <= now < end_at
-        now = _dt.utcnow()
+        # Status is kept current by the contest lifecycle scheduler
         active_contest_count = await Contest.find({
             "_id": {"$in": contest_ids},
             "status": "ongoing",
-            "start_at": {"$lte": now},
-            "end_at": {"$gt": now},
         }).count()
         if active_contest_count > 0:
             raise HTTPException(
@@ -384,19 +367,8 @@ async def update_team(
                 for p in players:
                     if p.slot:
                         slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
-                present_slot_ids = list(slot_counts.keys())
-                present_slot_oids = []
-                for sid in present_slot_ids:
-                    try:
-                        present_slot_oids.append(PydanticObjectId(sid))
-                    except Exception:
-                        continue
-                slots_present = await Slot.find({"_id": {"$in": present_slot_oids}}).to_list() if present_slot_oids else []
-                slots_with_min = await Slot.find(Slot.min_select > 0).to_list()
-
-                slots_by_id: Dict[str, Slot] = {str(s.id): s for s in slots_present}
-                for s in slots_with_min:
-                    slots_by_id.setdefault(str(s.id), s)
+                ref = await reference_data.get()
+                slots_by_id = ref.slots_to_validate(slot_counts)
 
                 violations = []
                 for sid, slot in slots_by_id.items():
@@ -515,14 +487,11 @@ async def rename_team(
         "status": "active",
     }).to_list()
     if active_enrs:
-        from datetime import datetime as _dt
         contest_ids = [enr.contest_id for enr in active_enrs]
-        now = _dt.utcnow()
+        # Status is kept current by the contest lifecycle scheduler
         active_contest_count = await Contest.find({
             "_id": {"$in": contest_ids},
             "status": "ongoing",
-            "start_at": {"$lte": now},
-            "end_at": {"$gt": now},
         }).count()
         if active_contest_count > 0:
             raise HTTPException(
@@ -582,17 +551,10 @@ async def delete_team(
         )
     
     # Soft-remove any active enrollments for this team to keep referential consistency
-    active_enrollments = await TeamContestEnrollment.find({
+    await TeamContestEnrollment.find({
         "team_id": team.id,
         "status": "active",
-    }).to_list()
-
-    if active_enrollments:
-        now = datetime.utcnow()
-        for enr in active_enrollments:
-            enr.status = "removed"
-            enr.removed_at = now
-            await enr.save()
+    }).update_many({"$set": {"status": "removed", "removed_at": datetime.utcnow()}})
 
     await team.delete()
     
@@ -5,6 +5,7 @@ from app.models.user import User
 from app.schemas.user import UserResponse
 from app.utils.dependencies import get_current_active_user
 from app.utils.gridfs import open_avatar_stream
+from app.utils.phone import normalize_mobile_digits
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
@@ -46,7 +47,16 @@ async def update_current_user(
         current_user.full_name = full_name
 
     if mobile:
+        mobile_digits = normalize_mobile_digits(mobile)
+        if mobile_digits:
+            existing = await User.find_one(User.mobile_digits == mobile_digits)
+            if existing and existing.id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Mobile already registered"
+                )
         current_user.mobile = mobile
+        current_user.mobile_digits = mobile_digits
 
     if avatar_url:
         current_user.avatar_url = avatar_url
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    total: int
+    processed: int
+    progress: float  # 0.0 - 1.0
+    params: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
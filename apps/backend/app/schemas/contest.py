@@ -4,6 +4,25 @@ from datetime import datetime
 from app.utils.timezone import to_ist, IST
 
 
+def _parse_as_ist(v):
+    """Parse datetime as IST if naive, preserve timezone if already set."""
+    if isinstance(v, str):
+        # Parse ISO string
+        parsed = datetime.fromisoformat(v.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            # Treat naive datetime as IST (user's local time)
+            return parsed.replace(tzinfo=IST)
+        # Has timezone, convert to IST
+        return parsed.astimezone(IST)
+    if isinstance(v, datetime):
+        if v.tzinfo is None:
+            # Treat naive datetime as IST
+            return v.replace(tzinfo=IST)
+        # Has timezone, convert to IST
+        return v.astimezone(IST)
+    return v
+
+
 class ContestCreate(BaseModel):
     code: str = Field(..., min_length=1, max_length=100)
     name: str = Field(..., min_length=1, max_length=200)
@@ -21,22 +40,7 @@ class ContestCreate(BaseModel):
     @classmethod
     def parse_as_ist(cls, v):
         """Parse datetime as IST if naive, preserve timezone if already set."""
-        if isinstance(v, str):
-            # Parse ISO string
-            from datetime import datetime as dt
-            parsed = dt.fromisoformat(v.replace('Z', '+00:00'))
-            if parsed.tzinfo is None:
-                # Treat naive datetime as IST (user's local time)
-                return parsed.replace(tzinfo=IST)
-            # Has timezone, convert to IST
-            return parsed.astimezone(IST)
-        if isinstance(v, datetime):
-            if v.tzinfo is None:
-                # Treat naive datetime as IST
-                return v.replace(tzinfo=IST)
-            # Has timezone, convert to IST
-            return v.astimezone(IST)
-        return v
+        return _parse_as_ist(v)
 
 
 class ContestUpdate(BaseModel):
@@ -54,22 +58,24 @@ class ContestUpdate(BaseModel):
     @classmethod
     def parse_as_ist(cls, v):
         """Parse datetime as IST if naive, preserve timezone if already set."""
-        if isinstance(v, str):
-            # Parse ISO string
-            from datetime import datetime as dt
-            parsed = dt.fromisoformat(v.replace('Z', '+00:00'))
-            if parsed.tzinfo is None:
-                # Treat naive datetime as IST (user's local time)
-                return parsed.replace(tzinfo=IST)
-            # Has timezone, convert to IST
-            return parsed.astimezone(IST)
-        if isinstance(v, datetime):
-            if v.tzinfo is None:
-                # Treat naive datetime as IST
-                return v.replace(tzinfo=IST)
-            # Has timezone, convert to IST
-            return v.astimezone(IST)
-        return v
+        return _parse_as_ist(v)
+
+
+class ContestRolloverRequest(BaseModel):
+    """Clone a contest into a new window; omitted fields are copied from the source."""
+    code: str = Field(..., min_length=1, max_length=100)
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    start_at: datetime
+    end_at: datetime
+    allowed_teams: Optional[List[str]] = None
+    copy_enrollments: bool = True
+
+    @field_validator('start_at', 'end_at', mode='before')
+    @classmethod
+    def parse_as_ist(cls, v):
+        """Parse datetime as IST if naive, preserve timezone if already set."""
+        return _parse_as_ist(v)
 
 
 class ContestResponse(BaseModel):
@@ -101,6 +107,12 @@ class ContestResponse(BaseModel):
 
 class ContestListResponse(BaseModel):
     contests: List[ContestResponse]
-    total: int
+    total: Optional[int] = None  # omitted when count=none; capped when count=estimate
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class ContestRolloverResponse(BaseModel):
+    contest: ContestResponse
+    job_id: Optional[str] = None  # poll /api/admin/jobs/{job_id} for progress
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+from app.schemas.contest import ContestResponse
+
+
+class DashboardEntry(BaseModel):
+    """One of the user's active enrollments with its contest score"""
+    enrollment_id: str
+    enrolled_at: datetime
+    contest: ContestResponse
+    team_id: str
+    team_name: str
+    captain_id: Optional[str] = None
+    vice_captain_id: Optional[str] = None
+    points: float = 0.0
+    rank: Optional[int] = None  # None when the team is not ranked (e.g. deleted team)
+    total_teams: int = 0
+
+
+class DashboardResponse(BaseModel):
+    entries: List[DashboardEntry]
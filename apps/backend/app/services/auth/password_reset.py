@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from secrets import token_urlsafe
-import hashlib
 
 from beanie import PydanticObjectId
 from beanie.operators import In
@@ -10,7 +9,8 @@ from config.settings import get_settings
 from app.models.user import User, RefreshToken
 from app.models.password_reset import PasswordResetSession, PasswordResetToken
 from app.services.auth.twofactor import send_otp_autogen, verify_otp as provider_verify_otp
-from app.utils.security import get_password_hash
+from app.utils.security import get_password_hash_async, hash_token
+from app.utils.phone import normalize_mobile_digits
 
 settings = get_settings()
 
@@ -19,18 +19,11 @@ def _now():
     return datetime.utcnow()
 
 
-def _hash_token(token: str) -> str:
-    return hashlib.sha256(token.encode()).hexdigest()
-
-
 async def start_session(phone: str) -> None:
-    user: Optional[User] = None
-    input_digits = "".join(ch for ch in phone if ch.isdigit())
-    async for u in User.find(User.mobile != None):
-        digits = "".join(ch for ch in (u.mobile or "") if ch.isdigit())
-        if digits and digits == input_digits:
-            user = u
-            break
+    input_digits = normalize_mobile_digits(phone)
+    if not input_digits:
+        return
+    user: Optional[User] = await User.find_one(User.mobile_digits == input_digits)
     if not user:
         return
     await PasswordResetSession.find(
@@ -44,6 +37,7 @@ async def start_session(phone: str) -> None:
     session = PasswordResetSession(
         user_id=user.id,
         phone=phone,
+        phone_digits=input_digits,
         provider="2factor",
         provider_session_id=provider_session_id or "",
         status="pending",
@@ -57,14 +51,11 @@ async def start_session(phone: str) -> None:
 
 
 async def verify_otp_and_issue_token(phone: str, otp: str) -> Tuple[str, int]:
-    input_digits = "".join(ch for ch in phone if ch.isdigit())
-    session = await PasswordResetSession.find_one(
-        PasswordResetSession.phone == phone,
-        PasswordResetSession.status == "pending",
-    )
-    if not session:
+    input_digits = normalize_mobile_digits(phone)
+    session = None
+    if input_digits:
         session = await PasswordResetSession.find_one(
-            PasswordResetSession.phone.regex(input_digits),
+            PasswordResetSession.phone_digits == input_digits,
             PasswordResetSession.status == "pending",
         )
     if not session or session.expires_at < _now() or session.attempts >= session.max_attempts:
@@ -79,7 +70,7 @@ async def verify_otp_and_issue_token(phone: str, otp: str) -> Tuple[str, int]:
     session.status = "verified"
     await session.save()
     raw_token = token_urlsafe(48)
-    token_hash = _hash_token(raw_token)
+    token_hash = hash_token(raw_token)
     ttl = settings.reset_token_ttl_seconds
     token_doc = PasswordResetToken(
         user_id=session.user_id,
@@ -93,7 +84,7 @@ async def verify_otp_and_issue_token(phone: str, otp: str) -> Tuple[str, int]:
 
 
 async def reset_password(reset_token: str, new_password: str) -> None:
-    token_hash = _hash_token(reset_token)
+    token_hash = hash_token(reset_token)
     token_doc = await PasswordResetToken.find_one(PasswordResetToken.token_hash == token_hash)
     if not token_doc or token_doc.used_at is not None or token_doc.expires_at < _now():
         raise ValueError("Invalid or expired token")
@@ -103,13 +94,14 @@ async def reset_password(reset_token: str, new_password: str) -> None:
     user = await User.get(token_doc.user_id)
     if not user:
         raise ValueError("User not found")
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     user.updated_at = _now()
     await user.save()
-    # Revoke all refresh tokens for this user
-    async for rt in RefreshToken.find(RefreshToken.user_id == user.id, RefreshToken.revoked == False):
-        rt.revoked = True
-        await rt.save()
+    # Revoke all refresh tokens for this user in a single write
+    await RefreshToken.find(
+        RefreshToken.user_id == user.id,
+        RefreshToken.revoked == False,
+    ).update_many({"$set": {"revoked": True}})
     token_doc.used_at = _now()
     await token_doc.save()
     session.status = "completed"
@@ -1,7 +1,11 @@
+import asyncio
+import random
+import time
 import httpx
 import logging
 from typing import Optional, Tuple
 from config.settings import get_settings
+from app.utils import metrics
 
 settings = get_settings()
 logger = logging.getLogger("app.twofactor")
@@ -10,17 +14,154 @@ BASE_URL = getattr(settings, "twofactor_base_url", "https://2factor.in/API/V1")
 API_KEY = getattr(settings, "twofactor_api_key", None)
 TEMPLATE_NAME = getattr(settings, "twofactor_template_name", None)
 
+# Errors raised before the request reached the provider; always safe to retry
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ProviderUnavailable(Exception):
+    """Raised when the provider is short-circuited or saturated."""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a single probe through after a cool-down."""
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "half_open":
+            # Re-arm the timer so only one probe goes out per cool-down window
+            self.opened_at = time.monotonic()
+            return True
+        return state == "closed"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning("2Factor circuit opened after %s consecutive failures", self.failures)
+                metrics.incr("twofactor.breaker_opened")
+            self.opened_at = time.monotonic()
+
+
+_client: Optional[httpx.AsyncClient] = None
+_semaphore = asyncio.Semaphore(settings.twofactor_max_concurrency)
+breaker = CircuitBreaker(settings.twofactor_breaker_threshold, settings.twofactor_breaker_reset_seconds)
+
+
+async def start_client(
+    base_url: Optional[str] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """Create the shared keep-alive client (called from the app lifespan).
+
+    base_url/transport can point the client at a local stub provider.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = httpx.AsyncClient(
+        base_url=base_url or BASE_URL,
+        timeout=settings.twofactor_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.twofactor_max_connections,
+            max_keepalive_connections=settings.twofactor_max_connections,
+            keepalive_expiry=60,
+        ),
+        transport=transport,
+    )
+    breaker.record_success()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _get_client() -> httpx.AsyncClient:
+    # Scripts that never ran the lifespan still get a pooled client
+    if _client is None:
+        await start_client()
+    return _client
+
+
+def _backoff_delay(attempt: int) -> float:
+    return 0.2 * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+async def _provider_get(path: str, retry_on_server_error: bool) -> httpx.Response:
+    """GET against the provider with bounded concurrency, retries and circuit breaking.
+
+    Connection-phase failures are always retried. Server errors are only
+    retried when the call is idempotent (OTP verification, not OTP sends).
+    """
+    if not breaker.allow():
+        metrics.incr("twofactor.short_circuited")
+        raise ProviderUnavailable("2Factor circuit is open")
+
+    client = await _get_client()
+    try:
+        await asyncio.wait_for(_semaphore.acquire(), timeout=settings.twofactor_timeout_seconds)
+    except asyncio.TimeoutError:
+        metrics.incr("twofactor.saturated")
+        raise ProviderUnavailable("Too many concurrent 2Factor requests")
+
+    try:
+        attempt = 0
+        while True:
+            try:
+                resp = await client.get(path)
+            except _CONNECT_ERRORS:
+                if attempt >= settings.twofactor_max_retries:
+                    breaker.record_failure()
+                    raise
+            except httpx.HTTPError:
+                breaker.record_failure()
+                raise
+            else:
+                if resp.status_code < 500:
+                    breaker.record_success()
+                    return resp
+                if not retry_on_server_error or attempt >= settings.twofactor_max_retries:
+                    breaker.record_failure()
+                    return resp
+            metrics.incr("twofactor.retries")
+            await asyncio.sleep(_backoff_delay(attempt))
+            attempt += 1
+    finally:
+        _semaphore.release()
+
 
 async def send_otp_autogen(phone: str, template_name: Optional[str] = None) -> Tuple[bool, Optional[str], Optional[str]]:
     tpl = template_name or TEMPLATE_NAME
     if not API_KEY or not tpl:
         logger.error("2Factor config missing: api_key=%s, template=%s", bool(API_KEY), bool(tpl))
         return False, None, "Missing 2Factor configuration"
-    url = f"{BASE_URL}/{API_KEY}/SMS/{phone}/AUTOGEN/{tpl}"
-    logger.info("2Factor AUTOGEN GET %s", url.replace(API_KEY or "", "[redacted]"))
-    async with httpx.AsyncClient(timeout=10) as client:
+    path = f"/{API_KEY}/SMS/{phone}/AUTOGEN/{tpl}"
+    logger.info("2Factor AUTOGEN GET %s", path.replace(API_KEY or "", "[redacted]"))
+    with metrics.timed("twofactor.send"):
         try:
-            resp = await client.get(url)
+            resp = await _provider_get(path, retry_on_server_error=False)
             data = resp.json()
             if resp.status_code == 200 and str(data.get("Status")).lower() == "success":
                 return True, data.get("Details"), None
@@ -33,14 +174,14 @@ async def verify_otp(provider_session_id: str, otp: str) -> Tuple[bool, Optional
     if not API_KEY:
         logger.error("2Factor config missing: api_key=%s", bool(API_KEY))
         return False, "Missing 2Factor configuration"
-    url = f"{BASE_URL}/{API_KEY}/SMS/VERIFY/{provider_session_id}/{otp}"
-    logger.info("2Factor VERIFY GET %s", url.replace(API_KEY or "", "[redacted]").replace(otp, "[redacted]"))
-    async with httpx.AsyncClient(timeout=10) as client:
+    path = f"/{API_KEY}/SMS/VERIFY/{provider_session_id}/{otp}"
+    logger.info("2Factor VERIFY GET %s", path.replace(API_KEY or "", "[redacted]").replace(otp, "[redacted]"))
+    with metrics.timed("twofactor.verify"):
         try:
-            resp = await client.get(url)
+            resp = await _provider_get(path, retry_on_server_error=True)
             data = resp.json()
             if resp.status_code == 200 and str(data.get("Status")).lower() == "success":
                 return True, None
             return False, data.get("Details") or data.get("Message") or "OTP verification failed"
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
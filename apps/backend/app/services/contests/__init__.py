@@ -0,0 +1,4 @@
+"""Contest services package"""
+from app.services.contests.lifecycle import ContestLifecycleScheduler, scheduler, status_for_window
+
+__all__ = ["ContestLifecycleScheduler", "scheduler", "status_for_window"]
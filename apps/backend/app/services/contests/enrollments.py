@@ -0,0 +1,79 @@
+"""Set-based enrollment maintenance for contests."""
+from typing import Iterable, Optional
+
+from beanie import PydanticObjectId
+
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services.contests.snapshots import delete_snapshots
+from app.utils.timezone import now_ist
+
+
+def _valid_oids(values: Optional[Iterable[str]]) -> list[PydanticObjectId]:
+    oids = []
+    for value in values or []:
+        try:
+            oids.append(PydanticObjectId(value))
+        except Exception:
+            continue
+    return oids
+
+
+async def remove_enrollments(
+    contest: Contest,
+    enrollment_ids: Optional[Iterable[str]] = None,
+    team_ids: Optional[Iterable[str]] = None,
+    all_active: bool = False,
+) -> dict:
+    """Mark active enrollments of a contest as removed in one update.
+
+    Selects enrollments by id and/or team id (invalid ids are ignored), or
+    every active enrollment when all_active is set. Teams that were removed
+    also get their convenience Team.contest_id cleared when it pointed at
+    this contest.
+
+    Frozen snapshots of the removed teams are dropped as well.
+
+    Returns matched/modified counts for the enrollment update and the
+    number of teams cleared.
+    """
+    query: dict = {"contest_id": contest.id, "status": EnrollmentStatus.ACTIVE}
+    if not all_active:
+        selectors = []
+        eids = _valid_oids(enrollment_ids)
+        tids = _valid_oids(team_ids)
+        if eids:
+            selectors.append({"_id": {"$in": eids}})
+        if tids:
+            selectors.append({"team_id": {"$in": tids}})
+        if not selectors:
+            return {"matched": 0, "modified": 0, "teams_cleared": 0}
+        query["$or"] = selectors
+
+    coll = TeamContestEnrollment.get_motor_collection()
+    affected_team_ids = await coll.distinct("team_id", query)
+    if not affected_team_ids:
+        return {"matched": 0, "modified": 0, "teams_cleared": 0}
+
+    now = now_ist()
+    result = await coll.update_many(
+        {**query, "team_id": {"$in": affected_team_ids}},
+        {"$set": {"status": EnrollmentStatus.REMOVED.value, "removed_at": now}},
+    )
+
+    await delete_snapshots(contest.id, team_ids=affected_team_ids)
+
+    # Only one active enrollment per (team, contest) can exist, so none of
+    # these teams is still enrolled in this contest
+    teams_result = await Team.get_motor_collection().update_many(
+        {"_id": {"$in": affected_team_ids}, "contest_id": str(contest.id)},
+        {"$set": {"contest_id": None, "updated_at": now}},
+    )
+
+    return {
+        "matched": result.matched_count,
+        "modified": result.modified_count,
+        "teams_cleared": teams_result.modified_count,
+    }
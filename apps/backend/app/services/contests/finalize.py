@@ -0,0 +1,178 @@
+"""Final-results archival for completed contests.
+
+When a contest completes its standings can no longer change, so they are
+computed once and written to contest_final_standings together with the
+user display fields. Completed-contest leaderboards are then plain ranged
+reads on that collection.
+
+Each finalization writes a new version and only then points the contest
+at it, so readers never see a half-written archive. Admin corrections to a
+completed contest (points, enrollments) finalize again in the background,
+once per burst of corrections.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Dict, List, Optional, Set
+
+from beanie import PydanticObjectId
+
+from app.common.enums.contests import ContestStatus
+from app.models.contest import Contest
+from app.models.contest_standing import ContestFinalStanding
+from app.models.user import User
+from app.services.contests.scoring import compute_standings
+from app.utils.timezone import now_ist
+from config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("app.contests.finalize")
+
+INSERT_BATCH_SIZE = 1000
+
+
+async def finalize_contest(contest_id: PydanticObjectId) -> Optional[int]:
+    """Archive the final standings of a completed contest.
+
+    Returns the published version, or None when the contest is missing, not
+    completed, or a newer finalization won the race.
+    """
+    contest = await Contest.get(contest_id)
+    if not contest or contest.status != ContestStatus.COMPLETED:
+        return None
+
+    standings = await compute_standings(contest)
+    users = await User.get_motor_collection().find(
+        {"_id": {"$in": list({s.user_id for s in standings})}},
+        {"username": 1, "full_name": 1, "avatar_url": 1},
+    ).to_list(length=None)
+    users_by_id = {u["_id"]: u for u in users}
+
+    # Millisecond timestamps keep versions increasing across workers
+    version = time.time_ns() // 1_000_000
+    now = now_ist()
+    rows: List[ContestFinalStanding] = []
+    for standing in standings:
+        user = users_by_id.get(standing.user_id)
+        if not user:
+            continue
+        rows.append(ContestFinalStanding(
+            contest_id=contest.id,
+            version=version,
+            rank=len(rows) + 1,
+            team_id=standing.team_id,
+            user_id=standing.user_id,
+            team_name=standing.team_name,
+            rank_change=standing.rank_change,
+            points=standing.points,
+            username=user["username"],
+            display_name=user.get("full_name") or user["username"],
+            avatar_url=user.get("avatar_url"),
+            finalized_at=now,
+        ))
+
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await ContestFinalStanding.insert_many(rows[start:start + INSERT_BATCH_SIZE])
+
+    archive = ContestFinalStanding.get_motor_collection()
+    published = await Contest.get_motor_collection().update_one(
+        {
+            "_id": contest.id,
+            "$or": [
+                {"final_standings_version": None},
+                {"final_standings_version": {"$lt": version}},
+            ],
+        },
+        {"$set": {"final_standings_version": version, "finalized_at": now}},
+    )
+    if not published.modified_count:
+        await archive.delete_many({"contest_id": contest.id, "version": version})
+        return None
+
+    await archive.delete_many({"contest_id": contest.id, "version": {"$lt": version}})
+    logger.info("Finalized contest %s: %d standing(s), version %s", contest.id, len(rows), version)
+    return version
+
+
+async def finalize_contests(contest_ids: List[PydanticObjectId]) -> None:
+    """Lifecycle hook: archive standings of contests that just completed."""
+    for contest_id in contest_ids:
+        await finalize_contest(contest_id)
+
+
+# Scheduled re-finalizations that have not started computing yet, and all in flight
+_pending: Dict[PydanticObjectId, asyncio.Task] = {}
+_running: Set[asyncio.Task] = set()
+
+
+def refinalize_if_completed(contest: Contest) -> None:
+    """Schedule re-archiving after an admin change to an already completed contest.
+
+    Corrections arrive in bursts (e.g. one points upsert per player), so the
+    full recompute runs once in the background, CONTEST_REFINALIZE_DELAY_SECONDS
+    after the first change of a burst, instead of inline in every request.
+    """
+    if contest.status != ContestStatus.COMPLETED or contest.id in _pending:
+        return
+    # A fresh context keeps the task out of the scheduling request's stats
+    task = asyncio.create_task(
+        _refinalize_later(contest.id),
+        name=f"refinalize-{contest.id}",
+        context=contextvars.Context(),
+    )
+    _pending[contest.id] = task
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    task.add_done_callback(lambda t: _pending.pop(contest.id, None) if _pending.get(contest.id) is t else None)
+
+
+async def _refinalize_later(contest_id: PydanticObjectId) -> None:
+    await asyncio.sleep(settings.contest_refinalize_delay_seconds)
+    # Changes from here on may not be read by this run: let them schedule another
+    _pending.pop(contest_id, None)
+    try:
+        await finalize_contest(contest_id)
+    except Exception:
+        logger.exception("Re-finalizing contest %s failed", contest_id)
+
+
+async def drain_refinalize(timeout: float) -> None:
+    """Wait up to `timeout` seconds for scheduled re-finalizations (used on shutdown)."""
+    if _running:
+        await asyncio.wait(list(_running), timeout=timeout)
+
+
+async def delete_final_standings(contest_id: PydanticObjectId) -> None:
+    """Drop every archived standing of a contest."""
+    await ContestFinalStanding.get_motor_collection().delete_many({"contest_id": contest_id})
+
+
+async def archived_page(contest: Contest, skip: int, limit: int) -> List[dict]:
+    """Archived standings ranked skip+1 .. skip+limit."""
+    return await ContestFinalStanding.get_motor_collection().find(
+        {
+            "contest_id": contest.id,
+            "version": contest.final_standings_version,
+            "rank": {"$gt": skip, "$lte": skip + limit},
+        }
+    ).sort("rank", 1).to_list(length=None)
+
+
+async def archived_standings(contest: Contest) -> List[dict]:
+    """Every archived standing of a contest, in rank order."""
+    return await ContestFinalStanding.get_motor_collection().find(
+        {"contest_id": contest.id, "version": contest.final_standings_version}
+    ).sort("rank", 1).to_list(length=None)
+
+
+async def archived_user_entry(contest: Contest, user_id: PydanticObjectId) -> Optional[dict]:
+    """Best-ranked archived standing of a user in a contest."""
+    return await ContestFinalStanding.get_motor_collection().find_one(
+        {
+            "contest_id": contest.id,
+            "version": contest.final_standings_version,
+            "user_id": user_id,
+        },
+        sort=[("rank", 1)],
+    )
@@ -0,0 +1,158 @@
+"""Contest lifecycle scheduler.
+
+Contest status is derived from the (start_at, end_at) window. Instead of
+recomputing it on every request, a background task persists the status at
+each window boundary so endpoints and queries can trust the stored field.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from beanie import PydanticObjectId
+
+from app.common.enums.contests import ContestStatus
+from app.models.contest import Contest
+from app.utils.timezone import now_ist, to_ist
+from config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("app.contests.lifecycle")
+
+TransitionHook = Callable[[List[PydanticObjectId]], Awaitable[None]]
+
+# Time-window filter for each status the scheduler manages
+_WINDOW_FILTERS: Dict[ContestStatus, Callable[[datetime], dict]] = {
+    ContestStatus.COMPLETED: lambda now: {"end_at": {"$lte": now}},
+    ContestStatus.ONGOING: lambda now: {"start_at": {"$lte": now}, "end_at": {"$gt": now}},
+    ContestStatus.LIVE: lambda now: {"start_at": {"$gt": now}},
+}
+
+
+def status_for_window(start_at: datetime, end_at: datetime, now: Optional[datetime] = None) -> ContestStatus:
+    """Return the lifecycle status implied by a contest's time window."""
+    now = now or now_ist()
+    start = to_ist(start_at)
+    end = to_ist(end_at)
+    if end <= now:
+        return ContestStatus.COMPLETED
+    if start <= now < end:
+        return ContestStatus.ONGOING
+    return ContestStatus.LIVE
+
+
+async def sync_contest_statuses(now: Optional[datetime] = None) -> Dict[ContestStatus, List[PydanticObjectId]]:
+    """Persist time-derived statuses in bulk.
+
+    Archived contests are never touched. Returns the ids of contests that
+    transitioned, keyed by their new status.
+    """
+    now = now or now_ist()
+    coll = Contest.get_motor_collection()
+    transitioned: Dict[ContestStatus, List[PydanticObjectId]] = {}
+    for status, window in _WINDOW_FILTERS.items():
+        query = {**window(now), "status": {"$nin": [status.value, ContestStatus.ARCHIVED.value]}}
+        ids = [doc["_id"] async for doc in coll.find(query, {"_id": 1})]
+        if ids:
+            await coll.update_many(
+                {**query, "_id": {"$in": ids}},
+                {"$set": {"status": status.value, "updated_at": now}},
+            )
+            logger.info("Contest status -> %s for %d contest(s)", status.value, len(ids))
+        transitioned[status] = ids
+    return transitioned
+
+
+async def next_boundary(now: Optional[datetime] = None) -> Optional[datetime]:
+    """Return the nearest upcoming start_at/end_at across non-archived contests."""
+    now = now or now_ist()
+    coll = Contest.get_motor_collection()
+    base = {"status": {"$ne": ContestStatus.ARCHIVED.value}}
+    candidates = []
+    for field in ("start_at", "end_at"):
+        doc = await coll.find_one({**base, field: {"$gt": now}}, {field: 1}, sort=[(field, 1)])
+        if doc:
+            candidates.append(to_ist(doc[field]))
+    return min(candidates) if candidates else None
+
+
+class ContestLifecycleScheduler:
+    """Sleeps until the next contest boundary, then bulk-updates statuses.
+
+    The sleep is capped so edits made on other workers are picked up, and
+    notify() wakes the loop immediately after a local create/update.
+    """
+
+    def __init__(self, max_sleep_seconds: float = 60.0, retry_seconds: float = 5.0):
+        self.max_sleep_seconds = max_sleep_seconds
+        self.retry_seconds = retry_seconds
+        self._hooks: Dict[ContestStatus, List[TransitionHook]] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def on_transition(self, status: ContestStatus, hook: TransitionHook) -> None:
+        """Register a coroutine called with contest ids entering `status`."""
+        self._hooks.setdefault(status, []).append(hook)
+
+    def notify(self) -> None:
+        """Re-evaluate statuses now (e.g. after a contest window changed)."""
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="contest-lifecycle")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_hooks(self, status: ContestStatus, ids: List[PydanticObjectId]) -> None:
+        """Run the hooks of `status` for contests that just entered it.
+
+        Also called by writers that persist a transition themselves (e.g. an
+        admin edit of the window), which sync_contest_statuses() then no
+        longer sees.
+        """
+        for hook in self._hooks.get(status, []):
+            try:
+                await hook(ids)
+            except Exception:
+                logger.exception("Contest transition hook failed for status %s", status.value)
+
+    async def run_once(self) -> float:
+        """Sync statuses, run hooks and return how long to sleep."""
+        transitioned = await sync_contest_statuses()
+        for status, ids in transitioned.items():
+            if ids:
+                await self.run_hooks(status, ids)
+
+        now = now_ist()
+        boundary = await next_boundary(now)
+        if boundary is None:
+            return self.max_sleep_seconds
+        # Small slack so the boundary has definitely passed when we wake
+        delay = (boundary - now + timedelta(milliseconds=50)).total_seconds()
+        return max(0.0, min(delay, self.max_sleep_seconds))
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                delay = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Contest lifecycle sync failed")
+                delay = self.retry_seconds
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+scheduler = ContestLifecycleScheduler(max_sleep_seconds=settings.contest_scheduler_max_sleep_seconds)
@@ -0,0 +1,90 @@
+"""Contest listing with keyset pagination and text search.
+
+Pages are ordered by (start_at desc, _id desc). A cursor encodes the last
+row of the previous page so deep pages cost the same as the first one,
+unlike skip/limit which walks every skipped document.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Tuple
+
+from bson import ObjectId
+
+from app.models.contest import Contest
+
+CountMode = Literal["exact", "estimate", "none"]
+
+# "estimate" counts stop after this many matches
+COUNT_ESTIMATE_CAP = 1000
+
+SORT = [("start_at", -1), ("_id", -1)]
+
+
+def encode_cursor(contest: Contest) -> str:
+    start = contest.start_at
+    if start.tzinfo is not None:
+        # Mongo stores UTC; keep cursors naive UTC to compare like-for-like
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    raw = json.dumps({"s": start.isoformat(), "i": str(contest.id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["s"]), ObjectId(data["i"])
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def build_contest_filter(conditions: dict, search: Optional[str] = None) -> dict:
+    """Combine field conditions with a text search on code/name."""
+    query = dict(conditions)
+    if search and search.strip():
+        query["$text"] = {"$search": search.strip()}
+    return query
+
+
+async def list_contests_page(
+    query: dict,
+    *,
+    page_size: int,
+    cursor: Optional[str] = None,
+    page: int = 1,
+    count: CountMode = "exact",
+) -> Tuple[List[Contest], Optional[str], Optional[int]]:
+    """Return (rows, next_cursor, total) for a contest listing.
+
+    With a cursor the page is fetched by keyset; without one the legacy
+    page number is honoured so existing clients keep working.
+    """
+    find_query = dict(query)
+    skip = 0
+    if cursor:
+        start_at, last_id = decode_cursor(cursor)
+        find_query["$or"] = [
+            {"start_at": {"$lt": start_at}},
+            {"start_at": start_at, "_id": {"$lt": last_id}},
+        ]
+    else:
+        skip = (page - 1) * page_size
+
+    rows = await Contest.find(find_query).sort(SORT).skip(skip).limit(page_size + 1).to_list()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(rows[-1]) if has_more and rows else None
+
+    total: Optional[int] = None
+    coll = Contest.get_motor_collection()
+    if count == "exact":
+        total = await coll.count_documents(query)
+    elif count == "estimate":
+        if query:
+            total = await coll.count_documents(query, limit=COUNT_ESTIMATE_CAP)
+        else:
+            total = await coll.estimated_document_count()
+
+    return rows, next_cursor, total
@@ -0,0 +1,262 @@
+"""In-process live leaderboard fan-out for SSE clients.
+
+Each contest with at least one connected client gets a ContestFeed that
+recomputes the standings once per change and shares the result with every
+subscriber, so N clients cost one recompute instead of N polls. Changes are
+signalled with publish() (e.g. after admin point updates); a periodic
+refresh also picks up writes made by other worker processes. Once a
+completed contest is finalized the feed serves its archived standings and
+only reloads them when a re-finalization publishes a new version.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+
+from app.common.enums.contests import ContestStatus
+from app.models.contest import Contest
+from app.models.projections import UserDisplay
+from app.models.user import User
+from app.services.contests.finalize import archived_standings
+from app.services.contests.scoring import compute_standings
+from app.utils import metrics
+from app.utils.read_policy import ReadPolicy, find_as
+from config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("app.contests.live_feed")
+
+
+class ContestFeed:
+    """Shared, periodically refreshed standings of one contest."""
+
+    def __init__(self, contest_id: PydanticObjectId):
+        self.contest_id = contest_id
+        self.entries: List[dict] = []
+        # Best-ranked entry per user id; user ids stay server-side
+        self.by_user: Dict[str, dict] = {}
+        self.version = 0
+        self.subscribers = 0
+        self.closed = False
+        self._users: Dict[ObjectId, UserDisplay] = {}
+        self._archive_version: Optional[int] = None
+        self._dirty = asyncio.Event()
+        self._updated = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._dirty.set()  # initial load
+        # A fresh context keeps the shared task out of the first subscriber's request stats
+        self._task = asyncio.create_task(
+            self._run(), name=f"live-feed-{self.contest_id}", context=contextvars.Context()
+        )
+
+    async def stop(self) -> None:
+        self.closed = True
+        self._notify()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def mark_dirty(self) -> None:
+        self._dirty.set()
+
+    async def wait_for_update(self, version: int, timeout: float) -> bool:
+        """Wait until the feed is past `version`; False on timeout."""
+        if self.version > version or self.closed:
+            return True
+        updated = self._updated
+        try:
+            await asyncio.wait_for(updated.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _notify(self) -> None:
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._dirty.wait(), timeout=settings.live_feed_refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._dirty.clear()
+            try:
+                await self._refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live feed refresh failed for contest %s", self.contest_id)
+            # Bursts of publishes within this interval collapse into one recompute
+            await asyncio.sleep(settings.live_feed_min_interval_seconds)
+
+    async def _refresh(self) -> None:
+        contest = await Contest.get(self.contest_id)
+        if not contest:
+            self.entries = []
+            self.by_user = {}
+        elif contest.status == ContestStatus.COMPLETED and contest.final_standings_version is not None:
+            if contest.final_standings_version == self._archive_version:
+                return  # the archive only changes when the contest is re-finalized
+            self._archive_version = contest.final_standings_version
+            with metrics.timed("live_feed.archive_load"):
+                rows = await archived_standings(contest)
+            self._set_entries(rows)
+        else:
+            self._archive_version = None
+            with metrics.timed("live_feed.refresh"):
+                standings = await compute_standings(contest, ReadPolicy.LEADERBOARD)
+                missing = list({s.user_id for s in standings} - self._users.keys())
+                if missing:
+                    users = await find_as(User, UserDisplay, {"_id": {"$in": missing}}, ReadPolicy.LEADERBOARD)
+                    self._users.update({u.id: u for u in users})
+            rows = []
+            for standing in standings:
+                user = self._users.get(standing.user_id)
+                if user:
+                    rows.append({
+                        "team_id": standing.team_id,
+                        "user_id": standing.user_id,
+                        "team_name": standing.team_name,
+                        "points": standing.points,
+                        "rank_change": standing.rank_change,
+                        "username": user.username,
+                        "display_name": user.display_name,
+                        "avatar_url": user.avatar_url,
+                    })
+            self._set_entries(rows)
+        self.version += 1
+        self._notify()
+
+    def _set_entries(self, rows: List[dict]) -> None:
+        """Rank rows shaped like contest_final_standings documents into client entries."""
+        entries = []
+        by_user: Dict[str, dict] = {}
+        for row in rows:
+            entry = {
+                "rank": len(entries) + 1,
+                "username": row["username"],
+                "displayName": row["display_name"],
+                "teamName": row["team_name"],
+                "points": row["points"],
+                "rankChange": row.get("rank_change"),
+                "avatarUrl": row.get("avatar_url"),
+                "teamId": str(row["team_id"]),
+            }
+            entries.append(entry)
+            by_user.setdefault(str(row["user_id"]), entry)
+        self.entries = entries
+        self.by_user = by_user
+
+
+_feeds: Dict[PydanticObjectId, ContestFeed] = {}
+
+
+def publish(contest_id: PydanticObjectId) -> None:
+    """Signal that a contest's standings changed (no-op without subscribers)."""
+    feed = _feeds.get(contest_id)
+    if feed is not None:
+        metrics.incr("live_feed.published")
+        feed.mark_dirty()
+
+
+@asynccontextmanager
+async def subscribe(contest_id: PydanticObjectId) -> AsyncIterator[ContestFeed]:
+    """Attach to a contest feed, creating it on first use and dropping it after the last client."""
+    feed = _feeds.get(contest_id)
+    if feed is None:
+        feed = _feeds[contest_id] = ContestFeed(contest_id)
+        feed.start()
+    feed.subscribers += 1
+    try:
+        yield feed
+    finally:
+        feed.subscribers -= 1
+        if feed.subscribers == 0 and _feeds.get(contest_id) is feed:
+            del _feeds[contest_id]
+            await feed.stop()
+
+
+async def close_all() -> None:
+    """End every stream (called on shutdown)."""
+    feeds = list(_feeds.values())
+    _feeds.clear()
+    for feed in feeds:
+        await feed.stop()
+
+
+def stats() -> dict:
+    return {
+        "contests": len(_feeds),
+        "subscribers": sum(feed.subscribers for feed in _feeds.values()),
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def _window_delta(
+    previous: Dict[str, dict], window: List[dict]
+) -> Tuple[Dict[str, dict], List[dict], List[str]]:
+    """Entries new to the window (full) or with changed rank/points (compact), and removed team ids."""
+    current = {e["teamId"]: e for e in window}
+    changed = []
+    for entry in window:
+        before = previous.get(entry["teamId"])
+        if before is None:
+            changed.append(entry)
+        elif before["rank"] != entry["rank"] or before["points"] != entry["points"]:
+            changed.append({"teamId": entry["teamId"], "rank": entry["rank"], "points": entry["points"]})
+    removed = [team_id for team_id in previous if team_id not in current]
+    return current, changed, removed
+
+
+async def stream(
+    feed: ContestFeed,
+    skip: int,
+    limit: int,
+    user_id: Optional[str],
+    is_disconnected,
+) -> AsyncIterator[str]:
+    """SSE body: a `snapshot` event, then `delta` events and heartbeats.
+
+    Deltas only cover the client's window [skip, skip+limit) and its own
+    best-ranked entry (`me`).
+    """
+    await feed.wait_for_update(0, timeout=settings.live_feed_heartbeat_seconds)
+    version = feed.version
+    window = feed.entries[skip:skip + limit]
+    me = feed.by_user.get(user_id) if user_id else None
+    sent = {e["teamId"]: e for e in window}
+    yield _sse("snapshot", {"version": version, "entries": window, "me": me})
+
+    while not feed.closed:
+        if not await feed.wait_for_update(version, timeout=settings.live_feed_heartbeat_seconds):
+            if await is_disconnected():
+                return
+            yield ": ping\n\n"
+            continue
+        if feed.closed:
+            return
+        version = feed.version
+        sent, changed, removed = _window_delta(sent, feed.entries[skip:skip + limit])
+        new_me = feed.by_user.get(user_id) if user_id else None
+        me_changed = new_me != me
+        me = new_me
+        if changed or removed or me_changed:
+            payload: dict = {"version": version, "changed": changed, "removed": removed}
+            if me_changed:
+                payload["me"] = me
+            yield _sse("delta", payload)
@@ -0,0 +1,155 @@
+"""Contest rollover: clone a contest into a new time window.
+
+Used for recurring daily contests. The clone keeps the source contest's
+configuration, and its active enrollments are copied by a background job
+that drops teams whose players are not allowed in the new contest.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+
+from app.common.enums.contests import ContestStatus, ContestType
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.admin.job import AdminJob
+from app.models.contest import Contest
+from app.models.player import Player
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services.contests.lifecycle import scheduler as lifecycle_scheduler, status_for_window
+from app.services.contests.snapshots import freeze_contest
+from app.services.jobs import report_progress
+from app.utils.timezone import now_ist
+
+BATCH_SIZE = 1000
+
+
+async def create_rollover_contest(
+    source: Contest,
+    code: str,
+    start_at: datetime,
+    end_at: datetime,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    allowed_teams: Optional[List[str]] = None,
+) -> Contest:
+    """Create a copy of `source` for a new window; fields not given are inherited."""
+    now = now_ist()
+    contest = Contest(
+        code=code,
+        name=name or source.name,
+        description=description if description is not None else source.description,
+        start_at=start_at,
+        end_at=end_at,
+        status=status_for_window(start_at, end_at),
+        visibility=source.visibility,
+        points_scope=source.points_scope,
+        contest_type=source.contest_type,
+        allowed_teams=list(allowed_teams if allowed_teams is not None else source.allowed_teams or []),
+        created_at=now,
+        updated_at=now,
+    )
+    await contest.insert()
+    lifecycle_scheduler.notify()
+    return contest
+
+
+async def _disallowed_player_ids(allowed_teams: List[str]) -> Set[str]:
+    """Ids of players whose real-world team is outside `allowed_teams`.
+
+    Loads the player -> team catalogue once so each team can be validated
+    with a set intersection instead of a query per team.
+    """
+    allowed = set(allowed_teams)
+    coll = Player.get_motor_collection()
+    disallowed: Set[str] = set()
+    async for doc in coll.find({"team": {"$nin": [None, ""]}}, {"team": 1}):
+        if doc["team"] not in allowed:
+            disallowed.add(str(doc["_id"]))
+    return disallowed
+
+
+async def copy_enrollments(job: AdminJob, source_id: PydanticObjectId, target_id: PydanticObjectId) -> Dict[str, Any]:
+    """Background job body: copy active enrollments from source to target."""
+    target = await Contest.get(target_id)
+    if not target:
+        raise ValueError("Target contest not found")
+
+    disallowed: Set[str] = set()
+    if target.contest_type == ContestType.DAILY and target.allowed_teams:
+        disallowed = await _disallowed_player_ids(target.allowed_teams)
+
+    enr_coll = TeamContestEnrollment.get_motor_collection()
+    source_query = {"contest_id": source_id, "status": EnrollmentStatus.ACTIVE.value}
+    total = await enr_coll.count_documents(source_query)
+    await report_progress(job, 0, total)
+
+    processed = copied = skipped_disallowed = skipped_existing = 0
+    batch: List[dict] = []
+
+    async def flush() -> None:
+        nonlocal copied, skipped_disallowed, skipped_existing, processed
+        team_ids = [row["team_id"] for row in batch]
+        teams = await Team.get_motor_collection().find(
+            {"_id": {"$in": team_ids}}, {"player_ids": 1}
+        ).to_list(length=None)
+        players_by_team = {t["_id"]: t.get("player_ids") or [] for t in teams}
+
+        now = now_ist()
+        docs = []
+        for row in batch:
+            player_ids = players_by_team.get(row["team_id"])
+            if player_ids is None:
+                continue  # team deleted
+            if disallowed and not disallowed.isdisjoint(player_ids):
+                skipped_disallowed += 1
+                continue
+            docs.append(TeamContestEnrollment(
+                team_id=row["team_id"],
+                user_id=row["user_id"],
+                contest_id=target_id,
+                status=EnrollmentStatus.ACTIVE,
+                enrolled_at=now,
+            ))
+
+        inserted_team_ids = [doc.team_id for doc in docs]
+        if docs:
+            try:
+                await TeamContestEnrollment.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                if any(err.get("code") != 11000 for err in write_errors):
+                    raise
+                failed = {err["index"] for err in write_errors}
+                skipped_existing += len(failed)
+                inserted_team_ids = [tid for i, tid in enumerate(inserted_team_ids) if i not in failed]
+            copied += len(inserted_team_ids)
+            if inserted_team_ids:
+                await Team.get_motor_collection().update_many(
+                    {"_id": {"$in": inserted_team_ids}},
+                    {"$set": {"contest_id": str(target_id), "updated_at": now}},
+                )
+
+        processed += len(batch)
+        batch.clear()
+        await report_progress(job, processed)
+
+    async for row in enr_coll.find(source_query, {"team_id": 1, "user_id": 1}):
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+    # The new window may already have started while the copy ran
+    target = await Contest.get(target_id)
+    if target and target.status == ContestStatus.ONGOING:
+        await freeze_contest(target_id)
+
+    return {
+        "contest_id": str(target_id),
+        "copied": copied,
+        "skipped_disallowed": skipped_disallowed,
+        "skipped_existing": skipped_existing,
+    }
@@ -0,0 +1,125 @@
+"""Contest scoring over frozen team snapshots.
+
+Ongoing and completed contests are scored from ContestTeamSnapshot rows:
+per-contest player points are laid out once in roster-index order and each
+team's total is a sum over its int-coded players. Teams without a snapshot
+(contests that have not started, or enrollments frozen late) fall back to
+their live Team document.
+"""
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from bson import ObjectId
+
+from app.common.enums.contests import ContestStatus
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.contest_snapshot import ContestRoster, ContestTeamSnapshot
+from app.models.player_contest_points import PlayerContestPoints
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services.contests.snapshots import (
+    TEAM_LINEUP_PROJECTION,
+    player_oids,
+    team_lineup,
+    women_slot_player_ids,
+)
+from app.utils.read_policy import ReadPolicy, collection
+
+# Statuses whose teams are locked and scored from snapshots
+FROZEN_STATUSES = (ContestStatus.ONGOING, ContestStatus.COMPLETED, ContestStatus.ARCHIVED)
+
+
+class TeamStanding(NamedTuple):
+    team_id: ObjectId
+    user_id: ObjectId
+    team_name: str
+    rank_change: Optional[int]
+    points: float
+
+
+async def compute_standings(contest: Contest, policy: Optional[ReadPolicy] = None) -> List[TeamStanding]:
+    """Score every actively enrolled team of a contest, best first."""
+    standings = await compute_standings_many([contest], policy)
+    return standings.get(contest.id, [])
+
+
+async def compute_standings_many(
+    contests: List[Contest], policy: Optional[ReadPolicy] = None
+) -> Dict[ObjectId, List[TeamStanding]]:
+    """Score several contests with a fixed number of queries.
+
+    Returns sorted standings keyed by contest id (contests without active
+    enrollments map to an empty list). Reads go to the primary unless a
+    read `policy` is given; archiving must not use a stale one.
+    """
+    contest_ids = [c.id for c in contests]
+    if not contest_ids:
+        return {}
+
+    enrolled: Dict[ObjectId, Set[ObjectId]] = {cid: set() for cid in contest_ids}
+    async for row in collection(TeamContestEnrollment, policy).find(
+        {"contest_id": {"$in": contest_ids}, "status": EnrollmentStatus.ACTIVE.value},
+        {"_id": 0, "contest_id": 1, "team_id": 1},
+    ):
+        enrolled[row["contest_id"]].add(row["team_id"])
+
+    active_ids = [cid for cid, teams in enrolled.items() if teams]
+    points: Dict[ObjectId, Dict[ObjectId, float]] = {cid: {} for cid in active_ids}
+    if active_ids:
+        async for doc in collection(PlayerContestPoints, policy).find(
+            {"contest_id": {"$in": active_ids}}, {"_id": 0, "contest_id": 1, "player_id": 1, "points": 1}
+        ):
+            points[doc["contest_id"]][doc["player_id"]] = float(doc.get("points") or 0.0)
+
+    standings: Dict[ObjectId, List[TeamStanding]] = {cid: [] for cid in contest_ids}
+
+    # Locked contests: score frozen snapshots against their roster
+    frozen_ids = [c.id for c in contests if c.status in FROZEN_STATUSES and enrolled[c.id]]
+    if frozen_ids:
+        rosters = {
+            doc["contest_id"]: doc.get("player_ids") or []
+            async for doc in collection(ContestRoster, policy).find(
+                {"contest_id": {"$in": frozen_ids}}, {"contest_id": 1, "player_ids": 1}
+            )
+        }
+        roster_points = {
+            cid: [points[cid].get(pid, 0.0) for pid in roster] for cid, roster in rosters.items()
+        }
+        async for snap in collection(ContestTeamSnapshot, policy).find(
+            {"contest_id": {"$in": frozen_ids}},
+            {"contest_id": 1, "team_id": 1, "user_id": 1, "team_name": 1, "rank_change": 1, "players": 1, "multipliers": 1},
+        ):
+            cid = snap["contest_id"]
+            if snap["team_id"] not in enrolled[cid] or cid not in roster_points:
+                continue
+            enrolled[cid].discard(snap["team_id"])
+            pts = roster_points[cid]
+            total = sum(pts[i] * m for i, m in zip(snap["players"], snap["multipliers"]))
+            standings[cid].append(TeamStanding(
+                snap["team_id"], snap["user_id"], snap["team_name"], snap.get("rank_change"), float(total),
+            ))
+
+    # Teams not frozen yet are scored from their live lineup
+    live_team_ids = set().union(*enrolled.values())
+    if live_team_ids:
+        teams = await collection(Team, policy).find(
+            {"_id": {"$in": list(live_team_ids)}}, TEAM_LINEUP_PROJECTION
+        ).to_list(length=None)
+        women = await women_slot_player_ids(
+            {oid for team in teams for oid in player_oids(team.get("player_ids") or [])}
+        )
+        lineups = {team["_id"]: (team, *team_lineup(team, women)) for team in teams}
+        for cid, team_ids in enrolled.items():
+            for team_id in team_ids:
+                if team_id not in lineups:
+                    continue
+                team, oids, multipliers = lineups[team_id]
+                total = sum(points[cid].get(oid, 0.0) * m for oid, m in zip(oids, multipliers))
+                standings[cid].append(TeamStanding(
+                    team["_id"], team["user_id"], team.get("team_name") or "", team.get("rank_change"), float(total),
+                ))
+
+    # Ties are broken by team id so ranks are stable between requests
+    for rows in standings.values():
+        rows.sort(key=lambda s: (-s.points, s.team_id))
+    return standings
@@ -0,0 +1,206 @@
+"""Lock-time team snapshots for contests.
+
+When a contest goes ongoing, every actively enrolled team is copied into
+ContestTeamSnapshot with its players encoded as indices into the contest's
+ContestRoster. Scoring then reads these small immutable documents instead
+of joining live teams, and later team edits cannot change contest scores.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.admin.slot import Slot
+from app.models.contest_snapshot import ContestRoster, ContestTeamSnapshot
+from app.models.player import Player
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.utils.timezone import now_ist
+
+logger = logging.getLogger("app.contests.snapshots")
+
+WOMEN_SLOT_MULTIPLIER = 2.0
+CAPTAIN_MULTIPLIER = 2.0
+VICE_CAPTAIN_MULTIPLIER = 1.5
+
+BATCH_SIZE = 500
+
+# Team fields needed to build a lineup
+TEAM_LINEUP_PROJECTION = {
+    "user_id": 1,
+    "team_name": 1,
+    "rank_change": 1,
+    "player_ids": 1,
+    "captain_id": 1,
+    "vice_captain_id": 1,
+}
+
+
+def player_oids(player_ids: Iterable[str]) -> List[ObjectId]:
+    """Valid ObjectIds from a team's player id strings, in order and without repeats."""
+    return list(dict.fromkeys(ObjectId(pid) for pid in player_ids if ObjectId.is_valid(pid)))
+
+
+def player_multiplier(pid: str, women_player_ids: Set[str], captain_id: Optional[str], vice_id: Optional[str]) -> float:
+    """Score multiplier for one player: women's slot first, then captain/vice-captain (stacks)."""
+    multiplier = WOMEN_SLOT_MULTIPLIER if pid in women_player_ids else 1.0
+    if captain_id and pid == captain_id:
+        multiplier *= CAPTAIN_MULTIPLIER
+    elif vice_id and pid == vice_id:
+        multiplier *= VICE_CAPTAIN_MULTIPLIER
+    return multiplier
+
+
+async def women_slot_player_ids(oids: Iterable[ObjectId]) -> Set[str]:
+    """Ids (as strings) of the given players that sit in a women's slot."""
+    oids = list(oids)
+    if not oids:
+        return set()
+    slot_ids = await Slot.get_motor_collection().distinct("_id", {"is_women_slot": True})
+    if not slot_ids:
+        return set()
+    # Player.slot is normally the slot id string, but older rows may hold an ObjectId
+    slot_values = [str(sid) for sid in slot_ids] + list(slot_ids)
+    docs = Player.get_motor_collection().find(
+        {"_id": {"$in": oids}, "slot": {"$in": slot_values}}, {"_id": 1}
+    )
+    return {str(doc["_id"]) async for doc in docs}
+
+
+def team_lineup(team: dict, women_player_ids: Set[str]) -> Tuple[List[ObjectId], List[float]]:
+    """Players of a raw team document and their score multipliers."""
+    captain_id = team.get("captain_id")
+    vice_id = team.get("vice_captain_id")
+    oids = player_oids(team.get("player_ids") or [])
+    multipliers = [player_multiplier(str(oid), women_player_ids, captain_id, vice_id) for oid in oids]
+    return oids, multipliers
+
+
+async def get_roster(contest_id: PydanticObjectId) -> List[ObjectId]:
+    """The contest's player index table (empty if nothing was frozen yet)."""
+    doc = await ContestRoster.get_motor_collection().find_one(
+        {"contest_id": contest_id}, {"player_ids": 1}
+    )
+    return list(doc["player_ids"]) if doc else []
+
+
+async def _ensure_roster(contest_id: PydanticObjectId, oids: Iterable[ObjectId]) -> Dict[ObjectId, int]:
+    """Append unseen players to the contest roster and return the full index map.
+
+    Appends are guarded by the current array size so concurrent writers
+    never reorder existing indices; a writer that loses the race retries.
+    """
+    coll = ContestRoster.get_motor_collection()
+    wanted = list(dict.fromkeys(oids))
+    while True:
+        doc = await coll.find_one({"contest_id": contest_id})
+        if doc is None:
+            try:
+                await ContestRoster(contest_id=contest_id, created_at=now_ist(), updated_at=now_ist()).insert()
+            except DuplicateKeyError:
+                pass
+            continue
+
+        current = doc.get("player_ids") or []
+        index = {pid: i for i, pid in enumerate(current)}
+        missing = [pid for pid in wanted if pid not in index]
+        if not missing:
+            return index
+
+        result = await coll.update_one(
+            {"_id": doc["_id"], "player_ids": {"$size": len(current)}},
+            {"$push": {"player_ids": {"$each": missing}}, "$set": {"updated_at": now_ist()}},
+        )
+        if result.modified_count:
+            for pid in missing:
+                index[pid] = len(index)
+            return index
+
+
+async def _write_snapshots(contest_id: PydanticObjectId, teams: List[dict]) -> int:
+    all_oids = [oid for team in teams for oid in player_oids(team.get("player_ids") or [])]
+
+    women = await women_slot_player_ids(set(all_oids))
+    index = await _ensure_roster(contest_id, all_oids)
+
+    now = now_ist()
+    docs = []
+    for team in teams:
+        oids, multipliers = team_lineup(team, women)
+        captain_id = team.get("captain_id")
+        vice_id = team.get("vice_captain_id")
+        docs.append(ContestTeamSnapshot(
+            contest_id=contest_id,
+            team_id=team["_id"],
+            user_id=team["user_id"],
+            team_name=team.get("team_name") or "",
+            rank_change=team.get("rank_change"),
+            players=[index[oid] for oid in oids],
+            multipliers=multipliers,
+            captain=index.get(ObjectId(captain_id)) if captain_id and ObjectId.is_valid(captain_id) else None,
+            vice_captain=index.get(ObjectId(vice_id)) if vice_id and ObjectId.is_valid(vice_id) else None,
+            created_at=now,
+        ))
+    if not docs:
+        return 0
+
+    # Snapshots are immutable: a concurrent freeze of the same team keeps the first copy
+    try:
+        await ContestTeamSnapshot.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != 11000 for err in write_errors):
+            raise
+        return len(docs) - len(write_errors)
+    return len(docs)
+
+
+async def freeze_contest(
+    contest_id: PydanticObjectId,
+    team_ids: Optional[Iterable[PydanticObjectId]] = None,
+) -> int:
+    """Snapshot actively enrolled teams of a contest that have no snapshot yet.
+
+    Idempotent; limit to `team_ids` when given (e.g. a team enrolling after
+    the contest started). Returns the number of snapshots written.
+    """
+    enr_query: dict = {"contest_id": contest_id, "status": EnrollmentStatus.ACTIVE.value}
+    if team_ids is not None:
+        enr_query["team_id"] = {"$in": list(team_ids)}
+    enrolled = await TeamContestEnrollment.get_motor_collection().distinct("team_id", enr_query)
+    if not enrolled:
+        return 0
+
+    existing = set(await ContestTeamSnapshot.get_motor_collection().distinct(
+        "team_id", {"contest_id": contest_id, "team_id": {"$in": enrolled}}
+    ))
+    pending = [tid for tid in enrolled if tid not in existing]
+
+    written = 0
+    team_coll = Team.get_motor_collection()
+    for start in range(0, len(pending), BATCH_SIZE):
+        chunk = pending[start:start + BATCH_SIZE]
+        teams = await team_coll.find({"_id": {"$in": chunk}}, TEAM_LINEUP_PROJECTION).to_list(length=None)
+        written += await _write_snapshots(contest_id, teams)
+    return written
+
+
+async def freeze_contests(contest_ids: List[PydanticObjectId]) -> None:
+    """Lifecycle hook: freeze every contest that just went ongoing."""
+    for contest_id in contest_ids:
+        written = await freeze_contest(contest_id)
+        logger.info("Froze %d team snapshot(s) for contest %s", written, contest_id)
+
+
+async def delete_snapshots(contest_id: PydanticObjectId, team_ids: Optional[Iterable[ObjectId]] = None) -> int:
+    """Drop snapshots of a contest (all of them, or only for `team_ids`)."""
+    query: dict = {"contest_id": contest_id}
+    if team_ids is not None:
+        query["team_id"] = {"$in": list(team_ids)}
+    result = await ContestTeamSnapshot.get_motor_collection().delete_many(query)
+    if team_ids is None:
+        await ContestRoster.get_motor_collection().delete_one({"contest_id": contest_id})
+    return result.deleted_count
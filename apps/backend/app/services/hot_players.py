@@ -5,7 +5,9 @@ from beanie import PydanticObjectId
 
 from app.models.team import Team
 from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.models.projections import EnrollmentTeamRef
 from app.common.enums.enrollments import EnrollmentStatus
+from app.utils.read_policy import ReadPolicy, collection
 
 
 async def count_global(player_id: str) -> int:
@@ -27,7 +29,7 @@ async def count_in_contest(player_id: str, contest_id: str) -> int:
     enrollments = await TeamContestEnrollment.find({
         "contest_id": contest_oid,
         "status": EnrollmentStatus.ACTIVE,
-    }).project(TeamContestEnrollment.team_id).to_list()
+    }).project(EnrollmentTeamRef).to_list()
 
     if not enrollments:
         return 0
@@ -45,8 +47,9 @@ async def aggregate_hot_global(skip: int = 0, limit: int = 200) -> List[Dict[str
     Returns list of documents: {"_id": player_id_str, "selection_count": int}
     sorted by selection_count desc.
     """
-    coll = Team.get_motor_collection()
+    coll = collection(Team, ReadPolicy.LEADERBOARD)
     pipeline = [
+        {"$project": {"_id": 0, "player_ids": 1}},
         {"$unwind": "$player_ids"},
         {"$group": {"_id": "$player_ids", "selection_count": {"$sum": 1}}},
         {"$sort": {"selection_count": -1}},
@@ -67,15 +70,18 @@ async def aggregate_hot_in_contest(contest_id: str, skip: int = 0, limit: int =
     except Exception:
         return []
 
-    enr_coll = TeamContestEnrollment.get_motor_collection()
+    enr_coll = collection(TeamContestEnrollment, ReadPolicy.LEADERBOARD)
     team_collection_name = Team.get_motor_collection().name
     pipeline = [
         {"$match": {"contest_id": contest_oid, "status": EnrollmentStatus.ACTIVE}},
+        {"$project": {"_id": 0, "team_id": 1}},
         {
             "$lookup": {
                 "from": team_collection_name,
                 "localField": "team_id",
                 "foreignField": "_id",
+                # Only player_ids is needed from each joined team
+                "pipeline": [{"$project": {"_id": 0, "player_ids": 1}}],
                 "as": "team",
             }
         },
@@ -0,0 +1,123 @@
+"""Background job runner for long admin operations.
+
+Jobs run as asyncio tasks in the worker that accepted the request, while
+their status and progress are persisted in AdminJob so any worker can
+report them. A running job refreshes its heartbeat; jobs whose worker was
+stopped or crashed before they finished are marked failed ("interrupted")
+on shutdown, at the next startup, or when their heartbeat goes stale.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from beanie import PydanticObjectId
+
+from app.models.admin.job import AdminJob
+
+logger = logging.getLogger("app.jobs")
+
+JobFn = Callable[[AdminJob], Awaitable[Dict[str, Any]]]
+
+HEARTBEAT_SECONDS = 30
+# A pending or running job without a heartbeat for this long has lost its worker
+STALE_AFTER = timedelta(seconds=3 * HEARTBEAT_SECONDS)
+INTERRUPTED = "interrupted: the worker stopped before the job finished"
+
+_running: Set[asyncio.Task] = set()
+
+
+async def start_job(kind: str, user_id: str, params: Dict[str, Any], fn: JobFn) -> AdminJob:
+    """Persist a job record and run `fn(job)` in the background."""
+    job = AdminJob(kind=kind, user_id=user_id, params=params)
+    await job.insert()
+    task = asyncio.create_task(_run(job, fn), name=f"job-{kind}-{job.id}")
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return job
+
+
+async def _run(job: AdminJob, fn: JobFn) -> None:
+    now = datetime.utcnow()
+    await AdminJob.find_one(AdminJob.id == job.id).update(
+        {"$set": {"status": "running", "started_at": now, "heartbeat_at": now}}
+    )
+    heartbeat = asyncio.create_task(_heartbeat(job), name=f"job-heartbeat-{job.id}")
+    try:
+        result = await fn(job)
+        update = {"status": "completed", "result": result}
+    except asyncio.CancelledError:
+        logger.warning("Job %s (%s) interrupted", job.id, job.kind)
+        await _finish(job, {"status": "failed", "error": INTERRUPTED})
+        raise
+    except Exception as e:
+        logger.exception("Job %s (%s) failed", job.id, job.kind)
+        update = {"status": "failed", "error": str(e)}
+    finally:
+        heartbeat.cancel()
+    await _finish(job, update)
+
+
+async def _finish(job: AdminJob, update: Dict[str, Any]) -> None:
+    update["completed_at"] = datetime.utcnow()
+    await AdminJob.find_one(AdminJob.id == job.id).update({"$set": update})
+
+
+async def _heartbeat(job: AdminJob) -> None:
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        await AdminJob.find_one(AdminJob.id == job.id).update({"$set": {"heartbeat_at": datetime.utcnow()}})
+
+
+def _interrupted_query(now: datetime) -> Dict[str, Any]:
+    cutoff = now - STALE_AFTER
+    return {
+        "status": {"$in": ["pending", "running"]},
+        "$or": [
+            {"heartbeat_at": {"$lt": cutoff}},
+            {"heartbeat_at": None, "created_at": {"$lt": cutoff}},
+        ],
+    }
+
+
+async def fail_interrupted(job_id: Optional[PydanticObjectId] = None) -> int:
+    """Mark pending/running jobs with a stale heartbeat as failed; returns how many.
+
+    Called on startup for every job, and by the job status endpoint for the
+    polled one. Jobs of live workers keep a fresh heartbeat and are untouched.
+    """
+    now = datetime.utcnow()
+    query = _interrupted_query(now)
+    if job_id is not None:
+        query["_id"] = job_id
+    result = await AdminJob.get_motor_collection().update_many(
+        query, {"$set": {"status": "failed", "error": INTERRUPTED, "completed_at": now}}
+    )
+    if result.modified_count:
+        logger.warning("Marked %d interrupted job(s) as failed", result.modified_count)
+    return result.modified_count
+
+
+async def report_progress(job: AdminJob, processed: int, total: Optional[int] = None) -> None:
+    """Persist progress counters for a running job."""
+    fields: Dict[str, Any] = {"processed": processed}
+    if total is not None:
+        fields["total"] = total
+    await AdminJob.find_one(AdminJob.id == job.id).update({"$set": fields})
+
+
+def running_jobs() -> int:
+    """Number of background jobs in flight in this worker."""
+    return len(_running)
+
+
+async def drain(timeout: float) -> None:
+    """Wait up to `timeout` seconds for in-flight jobs, then interrupt the rest (used on shutdown)."""
+    if _running:
+        await asyncio.wait(set(_running), timeout=timeout)
+    leftover = set(_running)
+    for task in leftover:
+        task.cancel()
+    if leftover:
+        # Let the interrupted jobs record their failure before MongoDB is closed
+        await asyncio.wait(leftover, timeout=5)
@@ -6,6 +6,7 @@ from fastapi import UploadFile
 
 from app.models.admin.player import Player
 from app.models.admin.import_log import ImportLog
+from app.services import reference_data
 from app.utils.import_players.import_parsers import parse_xlsx, parse_csv, detect_format
 from app.utils.import_players.import_validators import (
     validate_player_row,
@@ -318,6 +319,9 @@ class PlayerImportService:
 
         if not dry_run and len(errors) == 0:
             created, updated, skipped = await PlayerImportService.save_players(valid_data)
+        if (not dry_run and len(errors) == 0) or slot_strategy == "create":
+            # Imported players (and slots created while resolving rows) change the catalogue
+            await reference_data.invalidate()
 
         # Create import log
         await PlayerImportService.create_import_log(
@@ -0,0 +1,114 @@
+"""Warm in-process copies of slow-changing reference data.
+
+Slots and the public player catalogue are loaded once per worker in the
+lifespan and re-read after REFERENCE_DATA_TTL_SECONDS, or on the next access
+after an admin write calls invalidate(). Invalidation bumps the
+"reference_data" cache namespace version, which the shared cache broadcasts
+to the other workers (immediately with CACHE_BACKEND=redis; with the memory
+backend they catch up within the TTL). Scoring and snapshot freezing keep
+reading the database.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app import cache
+from app.models.admin.slot import Slot
+from app.models.player import Player
+from app.utils import metrics
+from app.utils.read_policy import ReadPolicy, find_as
+from config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("app.reference_data")
+
+
+class ReferenceData:
+    """One consistent load of slots and players."""
+
+    def __init__(self, slots: List[Slot], players: List[Player], version: int):
+        self.slots = slots
+        self.slots_by_id: Dict[str, Slot] = {str(s.id): s for s in slots}
+        # Same order as the catalogue endpoint: team, then name (players without a team first)
+        self.players = sorted(players, key=lambda p: (p.team is not None, p.team or "", p.name))
+        self.players_by_id: Dict[str, Player] = {str(p.id): p for p in players}
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def slots_to_validate(self, slot_ids: Iterable[str]) -> Dict[str, Slot]:
+        """Slots a lineup is checked against: those it uses plus every slot with a minimum."""
+        result = {sid: self.slots_by_id[sid] for sid in slot_ids if sid in self.slots_by_id}
+        for slot in self.slots:
+            if slot.min_select > 0:
+                result.setdefault(str(slot.id), slot)
+        return result
+
+    def player_counts_by_slot(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for player in self.players:
+            if player.slot:
+                counts[player.slot] = counts.get(player.slot, 0) + 1
+        return counts
+
+
+_current: Optional[ReferenceData] = None
+_lock = asyncio.Lock()
+
+
+def _namespace() -> cache.Namespace:
+    return cache.get_cache().namespace("reference_data")
+
+
+async def _load(version: int) -> ReferenceData:
+    with metrics.timed("reference_data.load"):
+        slots = await find_as(Slot, Slot, {}, ReadPolicy.CATALOGUE)
+        players = await find_as(Player, Player, {}, ReadPolicy.CATALOGUE)
+    return ReferenceData(slots, players, version)
+
+
+def _fresh(data: Optional[ReferenceData], version: int) -> bool:
+    return (
+        data is not None
+        and data.version == version
+        and time.monotonic() - data.loaded_at < settings.reference_data_ttl_seconds
+    )
+
+
+async def get() -> ReferenceData:
+    """Current reference data, reloading it first when stale or invalidated."""
+    global _current
+    version = await _namespace().version()
+    if _fresh(_current, version):
+        return _current
+    async with _lock:
+        # Concurrent callers wait for a single reload
+        version = await _namespace().version()
+        if not _fresh(_current, version):
+            _current = await _load(version)
+            metrics.incr("reference_data.reloads")
+    return _current
+
+
+async def warm() -> None:
+    """Load reference data ahead of the first request (called from the lifespan)."""
+    started = time.perf_counter()
+    data = await get()
+    logger.info(
+        "Reference data warmed: %d slots, %d players in %.1fms",
+        len(data.slots), len(data.players), (time.perf_counter() - started) * 1000,
+    )
+
+
+async def invalidate() -> None:
+    """Mark every worker's copy stale after a slot or player write.
+
+    The copy is kept: the version bump makes the next get() reload it, and
+    is_warm() keeps reporting the worker ready meanwhile.
+    """
+    await _namespace().invalidate()
+
+
+def is_warm() -> bool:
+    """True once the data has been loaded at least once in this worker."""
+    return _current is not None
@@ -0,0 +1,108 @@
+"""Keep Team.total_points in line with the players' current points.
+
+The global leaderboard scores teams from LEADERBOARD-policy reads, which may
+come from a lagging secondary, so it never writes the totals it computes.
+It passes the teams whose computed and stored totals disagree to
+schedule_sync(), and sync_team_totals() re-reads just those teams and their
+players from the primary before writing: a stale secondary cannot overwrite
+a newer total. While a secondary lags every recompute disagrees, so syncs
+run at most once per SYNC_INTERVAL_WINDOWS coalesce windows.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.models.player import Player
+from app.models.projections import PlayerPoints, TeamLineup
+from app.models.team import Team
+from app.utils.read_policy import find_as
+from config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("app.team_totals")
+
+SYNC_INTERVAL_WINDOWS = 10
+# Teams re-read per primary query
+BATCH_SIZE = 1000
+
+_pending: Set[PydanticObjectId] = set()
+_task: Optional[asyncio.Task] = None
+_last_run: Optional[float] = None
+
+
+async def sync_team_totals(team_ids: List[PydanticObjectId]) -> int:
+    """Store the current total of the given teams where it differs; returns the number updated."""
+    updated = 0
+    for i in range(0, len(team_ids), BATCH_SIZE):
+        updated += await _sync_batch(team_ids[i:i + BATCH_SIZE])
+    return updated
+
+
+async def _sync_batch(team_ids: List[PydanticObjectId]) -> int:
+    # Primary reads: the totals written must not be older than the stored ones
+    teams = await find_as(Team, TeamLineup, {"_id": {"$in": team_ids}}, None)
+    team_player_ids: dict[PydanticObjectId, list[PydanticObjectId]] = {}
+    for team in teams:
+        obj_ids: list[PydanticObjectId] = []
+        for pid in team.player_ids:
+            try:
+                obj_ids.append(PydanticObjectId(pid))
+            except Exception:
+                continue
+        team_player_ids[team.id] = obj_ids
+
+    all_player_ids = {pid for ids in team_player_ids.values() for pid in ids}
+    players = []
+    if all_player_ids:
+        players = await find_as(Player, PlayerPoints, {"_id": {"$in": list(all_player_ids)}}, None)
+    points = {p.id: float(p.points or 0.0) for p in players}
+
+    now = datetime.utcnow()
+    updates = []
+    for team in teams:
+        total = float(sum(points.get(pid, 0.0) for pid in team_player_ids[team.id]))
+        if float(team.total_points or 0.0) != total:
+            updates.append(UpdateOne({"_id": team.id}, {"$set": {"total_points": total, "updated_at": now}}))
+    if updates:
+        await Team.get_motor_collection().bulk_write(updates, ordered=False)
+    return len(updates)
+
+
+def schedule_sync(team_ids: Iterable[PydanticObjectId]) -> None:
+    """Queue teams for a background sync; runs are spaced SYNC_INTERVAL_WINDOWS coalesce windows apart."""
+    global _task
+    _pending.update(team_ids)
+    if not _pending or (_task is not None and not _task.done()):
+        return
+    # A fresh context keeps the task out of the scheduling request's stats
+    _task = asyncio.create_task(_sync(), name="team-totals-sync", context=contextvars.Context())
+
+
+async def _sync() -> None:
+    global _last_run
+    if _last_run is not None:
+        interval = settings.coalesce_window_seconds * SYNC_INTERVAL_WINDOWS
+        await asyncio.sleep(max(0.0, _last_run + interval - time.monotonic()))
+    # Teams reported while this run computes wait for the next one
+    team_ids = list(_pending)
+    _pending.clear()
+    _last_run = time.monotonic()
+    try:
+        updated = await sync_team_totals(team_ids)
+    except Exception:
+        logger.exception("Syncing team totals failed")
+        return
+    if updated:
+        logger.info("Synced total_points of %d teams", updated)
+
+
+async def drain(timeout: float) -> None:
+    """Wait up to `timeout` seconds for an in-flight sync (used on shutdown)."""
+    if _task is not None and not _task.done():
+        await asyncio.wait({_task}, timeout=timeout)
@@ -1,6 +1,9 @@
 from .security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    PasswordHasherBusy,
     create_access_token,
     create_refresh_token,
     decode_token
@@ -14,6 +17,9 @@ from .dependencies import (
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "PasswordHasherBusy",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
@@ -0,0 +1,136 @@
+"""Opt-in detector for code that blocks the event loop.
+
+With BLOCKING_DETECTION=true the lifespan calls install(), which wraps
+asyncio's Handle._run so every loop callback is timed. A callback that runs
+for BLOCKING_THRESHOLD_MS or longer (bcrypt, openpyxl, synchronous file
+I/O, large in-memory sorts...) is:
+
+- attributed to the route of the request whose context it ran in
+  (RequestStats carries the ASGI scope), or to "<background>";
+- counted per route in snapshot() (the "blocking" section of
+  /api/admin/metrics) and in the "event_loop.blocking" histogram;
+- logged as a structured "loop_blocked" record on the "app.blocking" logger.
+
+The loop's slow_callback_duration is set to the same threshold, so with
+BLOCKING_ASYNCIO_DEBUG=true asyncio's own debug mode also reports slow
+callbacks (with creation tracebacks, at a much higher overhead). Timing
+every callback costs two clock reads per callback: meant for staging, not
+left on in production. uvloop implements handles in C and cannot be
+wrapped; serve.py switches to the asyncio loop when detection is on.
+"""
+import asyncio
+import logging
+import time
+from asyncio import events
+from typing import Dict, Optional
+
+from app.utils import metrics
+from app.utils.request_stats import RequestStats, route_name, stats_in
+
+logger = logging.getLogger("app.blocking")
+
+BACKGROUND = "<background>"
+
+_original_run = events.Handle._run
+_threshold = 0.1
+_installed = False
+
+
+class _RouteBlocking:
+    __slots__ = ("count", "total_seconds", "max_seconds", "last_callback")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_callback = ""
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1000, 1),
+            "max_ms": round(self.max_seconds * 1000, 1),
+            "last_callback": self.last_callback,
+        }
+
+
+_by_route: Dict[str, _RouteBlocking] = {}
+
+
+def _describe(handle: events.Handle) -> str:
+    """Task name and coroutine of a task step, else the callback's name."""
+    callback = handle._callback
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        return f"{owner.get_name()} {getattr(coro, '__qualname__', type(coro).__name__)}"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+def _report(handle: events.Handle, seconds: float, stats: Optional[RequestStats]) -> None:
+    route = route_name(stats.scope) if stats is not None and stats.scope is not None else None
+    callback = _describe(handle)
+
+    entry = _by_route.get(route or BACKGROUND)
+    if entry is None:
+        entry = _by_route[route or BACKGROUND] = _RouteBlocking()
+    entry.count += 1
+    entry.total_seconds += seconds
+    entry.max_seconds = max(entry.max_seconds, seconds)
+    entry.last_callback = callback
+    metrics.observe("event_loop.blocking", seconds)
+
+    logger.warning(
+        "Event loop blocked for %.1fms by %s (%s)",
+        seconds * 1000,
+        callback,
+        route or "background",
+        extra={"event": "loop_blocked", "blocking_ms": round(seconds * 1000, 1), "route": route, "callback": callback},
+    )
+
+
+def _timed_run(self: events.Handle) -> None:
+    context = self._context
+    # A request's stats scope may close during its last callback, so look before and after
+    stats = stats_in(context) if context is not None else None
+    started = time.perf_counter()
+    try:
+        _original_run(self)
+    finally:
+        elapsed = time.perf_counter() - started
+        if elapsed >= _threshold:
+            if stats is None and context is not None:
+                stats = stats_in(context)
+            _report(self, elapsed, stats)
+
+
+def install(threshold_ms: float, asyncio_debug: bool = False) -> None:
+    """Start timing loop callbacks (call from inside the running loop)."""
+    global _threshold, _installed
+    _threshold = threshold_ms / 1000
+    loop = asyncio.get_running_loop()
+    loop.slow_callback_duration = _threshold
+    if asyncio_debug:
+        loop.set_debug(True)
+    if not isinstance(loop, asyncio.BaseEventLoop):
+        logger.warning("Blocking detection needs the asyncio event loop; %s callbacks are not timed", type(loop).__name__)
+        return
+    if not _installed:
+        events.Handle._run = _timed_run
+        _installed = True
+    logger.info("Blocking detection on: callbacks over %.0fms are reported", threshold_ms)
+
+
+def uninstall() -> None:
+    global _installed
+    if _installed:
+        events.Handle._run = _original_run
+        _installed = False
+
+
+def snapshot() -> dict:
+    return {
+        "enabled": _installed,
+        "threshold_ms": round(_threshold * 1000, 1),
+        "routes": {name: entry.summary() for name, entry in sorted(_by_route.items())},
+    }
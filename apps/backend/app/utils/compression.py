@@ -0,0 +1,113 @@
+"""Response compression middleware.
+
+Compresses complete response bodies of at least COMPRESSION_MINIMUM_SIZE
+bytes with Brotli when the client accepts it and the `brotli` package is
+installed, otherwise with gzip. Streaming responses (Server-Sent Events,
+file downloads) and bodies that already carry a Content-Encoding are passed
+through untouched: compressing a stream would hold events back in the
+compressor's buffer.
+"""
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils import metrics
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+
+def _accepted(accept_encoding: str) -> set:
+    """Codings listed in an Accept-Encoding header, minus those refused with q=0."""
+    codings = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            codings.add(coding.strip())
+    return codings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    codings = _accepted(accept_encoding)
+    if brotli is not None and "br" in codings:
+        return "br"
+    if "gzip" in codings:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """ASGI middleware that Brotli/gzip-encodes large, non-streaming responses."""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            passthrough = True  # only the first body chunk is inspected
+            headers = MutableHeaders(raw=list(start_message["headers"]))
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or headers.get("content-type", "").startswith("text/event-stream")
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            with metrics.timed(f"compression.{encoding}"):
+                compressed = self.compress(body, encoding)
+            metrics.incr("compression.bytes_in", len(body))
+            metrics.incr("compression.bytes_out", len(compressed))
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The encoded bytes differ from the identity representation
+                headers["ETag"] = f"W/{etag}"
+            await send({**start_message, "headers": headers.raw})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
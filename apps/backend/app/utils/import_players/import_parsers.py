@@ -2,8 +2,6 @@
 import csv
 import io
 from typing import List, Dict, Any, BinaryIO
-from openpyxl import load_workbook
-from openpyxl.utils.exceptions import InvalidFileException
 
 
 def normalize_header(header: str) -> str:
@@ -22,6 +20,10 @@ def parse_xlsx(file: BinaryIO, header_row: int = 1) -> tuple[List[str], List[Dic
     Returns:
         Tuple of (headers, rows) where rows are dicts with normalized keys
     """
+    # openpyxl is slow to import and only needed for XLSX uploads
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
     try:
         wb = load_workbook(file, read_only=True, data_only=True)
         ws = wb.active
@@ -2,9 +2,6 @@
 import io
 import csv
 from typing import BinaryIO, Optional
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.worksheet.datavalidation import DataValidation
 
 
 # Define standard columns
@@ -49,6 +46,11 @@ async def generate_xlsx_template(slot_codes: Optional[list[str]] = None) -> Bina
     Returns:
         Binary file-like object with XLSX content
     """
+    # openpyxl is slow to import and only needed for this download
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.worksheet.datavalidation import DataValidation
+
     wb = Workbook()
     ws = wb.active
     
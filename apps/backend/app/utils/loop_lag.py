@@ -0,0 +1,65 @@
+"""Event-loop lag sampler.
+
+A background ticker sleeps EVENT_LOOP_LAG_INTERVAL_SECONDS at a time and
+records how late each wake-up was. Lag means callbacks are queued behind
+slow or blocking code, so every request in the worker waits that long on
+top of its own work. The readiness probe reads current_lag() and
+/api/admin/metrics reports the "event_loop.lag" histogram.
+"""
+import asyncio
+from collections import deque
+from typing import Deque, Optional
+
+from app.utils import metrics
+
+# Roughly the last 30s at the default interval
+RECENT_SAMPLES = 60
+
+_task: Optional[asyncio.Task] = None
+_recent: Deque[float] = deque(maxlen=RECENT_SAMPLES)
+_next_tick: Optional[float] = None
+
+
+async def _run(interval: float) -> None:
+    global _next_tick
+    loop = asyncio.get_running_loop()
+    while True:
+        _next_tick = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - _next_tick)
+        _recent.append(lag)
+        metrics.observe("event_loop.lag", lag)
+
+
+def start(interval: float) -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run(interval), name="event-loop-lag")
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+
+def current_lag() -> float:
+    """Seconds the loop is currently behind: the last sample, or the overdue tick."""
+    if _next_tick is None:
+        return 0.0
+    last = _recent[-1] if _recent else 0.0
+    overdue = asyncio.get_running_loop().time() - _next_tick
+    return max(last, overdue, 0.0)
+
+
+def snapshot() -> dict:
+    return {
+        "running": _task is not None and not _task.done(),
+        "lag_ms": round(current_lag() * 1000, 1) if _task is not None else None,
+        "recent_max_ms": round(max(_recent, default=0.0) * 1000, 1),
+    }
@@ -0,0 +1,109 @@
+"""Lightweight in-process metrics registry.
+
+Keeps counters and bounded latency samples per metric name so hot paths can be
+observed without an external metrics stack. Values are per worker process.
+"""
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator
+
+# Number of most recent samples kept per latency metric
+MAX_SAMPLES = 2048
+
+
+class LatencyHistogram:
+    """Bounded window of latency samples (seconds) with percentile summary."""
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": _percentile_ms(ordered, 50),
+            "p95_ms": _percentile_ms(ordered, 95),
+            "p99_ms": _percentile_ms(ordered, 99),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+
+
+class ValueHistogram:
+    """Bounded window of plain numeric samples (e.g. queries per request)."""
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+            "max": ordered[-1] if ordered else 0,
+        }
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    if not ordered:
+        return 0
+    idx = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[idx]
+
+
+def _percentile_ms(ordered: list, pct: float) -> float:
+    return round(_percentile(ordered, pct) * 1000, 3)
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_counters: Dict[str, int] = {}
+
+
+def observe(name: str, seconds: float) -> None:
+    """Record a latency sample (in seconds) for the given metric."""
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms[name] = LatencyHistogram()
+    hist.observe(seconds)
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """Increment a counter."""
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Context manager recording the wall time of the enclosed block."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+def snapshot() -> dict:
+    """Return a JSON-serializable view of all counters and latency summaries."""
+    return {
+        "counters": dict(sorted(_counters.items())),
+        "latency": {name: hist.summary() for name, hist in sorted(_histograms.items())},
+    }
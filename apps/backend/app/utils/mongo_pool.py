@@ -0,0 +1,121 @@
+"""MongoDB connection pool monitoring.
+
+A pymongo ConnectionPoolListener that tracks, per server, how many
+connections are open, checked out and waiting for a checkout, plus checkout
+wait times and failures. /api/admin/metrics exposes the snapshot; sustained
+waiters or a checked-out count at MONGODB_MAX_POOL_SIZE mean the pool is
+the bottleneck.
+"""
+import threading
+from typing import Dict
+
+from pymongo import monitoring
+
+from app.utils import metrics
+
+
+class _ServerPool:
+    __slots__ = ("open", "checked_out", "waiting", "max_waiting", "checkouts", "failures", "cleared")
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.checkouts = 0
+        self.failures: Dict[str, int] = {}
+        self.cleared = 0
+
+    def summary(self) -> dict:
+        return {
+            "open": self.open,
+            "checked_out": self.checked_out,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "checkouts": self.checkouts,
+            "checkout_failures": dict(self.failures),
+            "cleared": self.cleared,
+        }
+
+
+# Events arrive on Motor's executor threads
+_lock = threading.Lock()
+_pools: Dict[str, _ServerPool] = {}
+
+
+def _pool(address) -> _ServerPool:
+    key = f"{address[0]}:{address[1]}"
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = _ServerPool()
+    return pool
+
+
+def pool_snapshot() -> dict:
+    """Pool gauges of this worker keyed by "host:port"."""
+    with _lock:
+        return {address: pool.summary() for address, pool in sorted(_pools.items())}
+
+
+def checked_out() -> int:
+    """Connections currently checked out across all servers."""
+    with _lock:
+        return sum(pool.checked_out for pool in _pools.values())
+
+
+class PoolListener(monitoring.ConnectionPoolListener):
+    """Keeps the per-server gauges above up to date."""
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with _lock:
+            _pool(event.address)
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with _lock:
+            _pool(event.address).cleared += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        with _lock:
+            _pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with _lock:
+            _pool(event.address).open += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with _lock:
+            pool = _pool(event.address)
+            pool.open = max(0, pool.open - 1)
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        with _lock:
+            pool = _pool(event.address)
+            pool.waiting += 1
+            pool.max_waiting = max(pool.max_waiting, pool.waiting)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with _lock:
+            pool = _pool(event.address)
+            pool.waiting = max(0, pool.waiting - 1)
+            pool.failures[event.reason] = pool.failures.get(event.reason, 0) + 1
+        metrics.incr("mongo.pool.checkout_failed")
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        with _lock:
+            pool = _pool(event.address)
+            pool.waiting = max(0, pool.waiting - 1)
+            pool.checked_out += 1
+            pool.checkouts += 1
+        if event.duration is not None:
+            metrics.observe("mongo.pool.checkout_wait", event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with _lock:
+            pool = _pool(event.address)
+            pool.checked_out = max(0, pool.checked_out - 1)
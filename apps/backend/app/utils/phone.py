@@ -0,0 +1,14 @@
+"""Phone number normalization helpers."""
+from typing import Optional
+
+
+def normalize_mobile_digits(value: Optional[str]) -> Optional[str]:
+    """Strip everything but digits from a mobile number.
+
+    Returns None when the input has no digits so that empty values are not
+    covered by the unique index on User.mobile_digits.
+    """
+    if not value:
+        return None
+    digits = "".join(ch for ch in value if ch.isdigit())
+    return digits or None
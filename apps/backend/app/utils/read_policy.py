@@ -0,0 +1,77 @@
+"""Read-preference policies for queries that tolerate bounded staleness.
+
+Beanie queries always go to the primary. Hot read paths that can serve
+slightly stale data (leaderboards, hot player lists, the player catalogue)
+instead read through collections bound to a policy's read preference, so a
+replica set's secondaries share the load. Against a standalone server every
+policy reads from the only node.
+"""
+from enum import Enum
+from typing import Any, List, Optional, Type, TypeVar
+
+from beanie.odm.utils.projection import get_projection
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import BaseModel
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+
+from config.settings import get_settings
+
+settings = get_settings()
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+class ReadPolicy(str, Enum):
+    LEADERBOARD = "leaderboard"  # contest/global standings, hot player counts
+    CATALOGUE = "catalogue"  # player listings
+
+
+def read_preference(policy: ReadPolicy):
+    """The configured pymongo read preference of a policy."""
+    if policy == ReadPolicy.LEADERBOARD:
+        mode = settings.mongodb_leaderboard_read_preference
+    else:
+        mode = settings.mongodb_catalogue_read_preference
+    if mode == "primary":
+        return Primary()
+    return _MODES[mode](max_staleness=settings.mongodb_max_staleness_seconds)
+
+
+def collection(document_model, policy: Optional[ReadPolicy] = None) -> AsyncIOMotorCollection:
+    """Motor collection of a Beanie document, bound to `policy` (primary when None)."""
+    coll = document_model.get_motor_collection()
+    if policy is None:
+        return coll
+    preference = read_preference(policy)
+    if isinstance(preference, Primary):
+        return coll  # the client default
+    return coll.with_options(read_preference=preference)
+
+
+async def find_as(
+    document_model,
+    projection_model: Type[ModelT],
+    query: dict,
+    policy: Optional[ReadPolicy],
+    **kwargs: Any,
+) -> List[ModelT]:
+    """`document_model.find(query).project(projection_model)` under a read policy.
+
+    Extra keyword arguments (sort, skip, limit) go to Motor's find().
+    """
+    cursor = collection(document_model, policy).find(query, get_projection(projection_model), **kwargs)
+    return [projection_model.model_validate(doc) async for doc in cursor]
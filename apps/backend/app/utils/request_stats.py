@@ -0,0 +1,198 @@
+"""Per-request database and serialization instrumentation.
+
+A pymongo CommandListener attributes every MongoDB command to the request
+that issued it through a context variable (Motor copies the context into
+its executor threads). RequestStatsMiddleware opens that scope per HTTP
+request, reports the totals as a Server-Timing header and records per-route
+histograms that /api/admin/metrics exposes.
+"""
+import logging
+import time
+from contextvars import Context, ContextVar
+from typing import Dict, Optional
+
+from pymongo import monitoring
+
+from app.utils.metrics import LatencyHistogram, ValueHistogram
+from config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("app.requests")
+
+
+class RequestStats:
+    """Counters for one request."""
+
+    __slots__ = ("db_queries", "db_seconds", "db_docs", "serialize_seconds", "scope")
+
+    def __init__(self, scope=None):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.db_docs = 0
+        self.serialize_seconds = 0.0
+        # ASGI scope, for attributing loop blocking to the route (app/utils/blocking.py)
+        self.scope = scope
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled, if any."""
+    return _current.get()
+
+
+def stats_in(context: Context) -> Optional[RequestStats]:
+    """Stats of the request a callback's context belongs to, if any."""
+    return context.get(_current)
+
+
+def _returned_docs(reply) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        if batch is not None:
+            return len(batch)
+    values = reply.get("values")  # distinct
+    if isinstance(values, list):
+        return len(values)
+    return 0
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Adds each successful or failed command to the current request's stats."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        stats = _current.get()
+        if stats is None:
+            return
+        stats.db_queries += 1
+        stats.db_seconds += event.duration_micros / 1_000_000
+        stats.db_docs += _returned_docs(event.reply)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        stats = _current.get()
+        if stats is None:
+            return
+        stats.db_queries += 1
+        stats.db_seconds += event.duration_micros / 1_000_000
+
+
+class RouteStats:
+    """Histograms for one route template."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.db_time = LatencyHistogram()
+        self.serialize_time = LatencyHistogram()
+        self.queries = ValueHistogram()
+        self.docs = ValueHistogram()
+
+    def summary(self) -> dict:
+        return {
+            "latency": self.latency.summary(),
+            "db_time": self.db_time.summary(),
+            "serialize_time": self.serialize_time.summary(),
+            "queries": self.queries.summary(),
+            "docs": self.docs.summary(),
+        }
+
+
+_routes: Dict[str, RouteStats] = {}
+
+
+def route_snapshot() -> dict:
+    """Per-route histograms for this worker, keyed by "METHOD /path/{template}"."""
+    return {name: stats.summary() for name, stats in sorted(_routes.items())}
+
+
+def route_name(scope) -> Optional[str]:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return None  # unmatched (404) requests are not tracked per route
+    return f"{scope.get('method', '')} {path}"
+
+
+def _server_timing(stats: RequestStats, total_seconds: float) -> bytes:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_queries} queries, {stats.db_docs} docs", '
+        f"ser;dur={stats.serialize_seconds * 1000:.1f}, "
+        f"app;dur={total_seconds * 1000:.1f}"
+    ).encode("latin-1")
+
+
+class RequestStatsMiddleware:
+    """ASGI middleware that scopes RequestStats to each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        # Event streams stay open for the whole connection: time them to the first byte
+        first_byte: Optional[float] = None
+
+        async def send_with_timing(message):
+            nonlocal first_byte
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = next((v for k, v in headers if k.lower() == b"content-type"), b"")
+                if content_type.startswith(b"text/event-stream"):
+                    first_byte = time.perf_counter() - started
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - started)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if first_byte is not None:
+                self._record(scope, stats, first_byte, streaming=True)
+            else:
+                self._record(scope, stats, time.perf_counter() - started)
+
+    @staticmethod
+    def _record(scope, stats: RequestStats, total_seconds: float, streaming: bool = False) -> None:
+        """Record a finished request in its route's histograms and the slow-request log.
+
+        For event streams total_seconds is the time to first byte, and the
+        slow-request log is skipped: their other stats span the connection.
+        """
+        name = route_name(scope)
+        if name is not None:
+            route = _routes.get(name)
+            if route is None:
+                route = _routes[name] = RouteStats()
+            route.latency.observe(total_seconds)
+            route.db_time.observe(stats.db_seconds)
+            route.serialize_time.observe(stats.serialize_seconds)
+            route.queries.observe(stats.db_queries)
+            route.docs.observe(stats.db_docs)
+
+        if streaming:
+            return
+        if (
+            total_seconds * 1000 >= settings.slow_request_ms
+            or stats.db_queries >= settings.slow_request_queries
+        ):
+            logger.warning(
+                "Slow request %s %s: %.1fms, %d queries (%.1fms db, %d docs), %.1fms serialize",
+                scope.get("method"),
+                name or scope.get("path"),
+                total_seconds * 1000,
+                stats.db_queries,
+                stats.db_seconds * 1000,
+                stats.db_docs,
+                stats.serialize_seconds * 1000,
+            )
@@ -0,0 +1,48 @@
+"""Response classes used as the application's defaults."""
+import time
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.utils.request_stats import current_stats
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not encode itself (datetimes, UUIDs and enums it does)."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode `content` to compact UTF-8 JSON.
+
+    Timezone-aware datetimes keep their offset (IST values render as
+    "...+05:30"), ObjectIds become hex strings and Pydantic models are dumped
+    by alias.
+    """
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class TimedJSONResponse(JSONResponse):
+    """orjson-encoded JSONResponse that adds its render time to the request's stats."""
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        stats = current_stats()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - started
+        return body
@@ -1,11 +1,36 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from config.settings import get_settings
+from app.utils import metrics
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes produced with a different cost factor are flagged by needs_update(),
+# which lets login transparently rehash when BCRYPT_ROUNDS is tuned.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+)
+
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+_pending_hash_jobs = 0
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool queue is full; mapped to 503 by the app."""
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -18,6 +43,48 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash uses outdated bcrypt settings"""
+    return pwd_context.needs_update(hashed_password)
+
+
+async def _run_in_hash_pool(name: str, fn: Callable[..., T], *args) -> T:
+    """Run a CPU-bound hashing call in the bounded pool with admission control."""
+    global _pending_hash_jobs
+    if _pending_hash_jobs >= settings.password_hash_max_pending:
+        metrics.incr("password_hash.rejected")
+        raise PasswordHasherBusy("Password hashing queue is full")
+
+    _pending_hash_jobs += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _pending_hash_jobs -= 1
+        metrics.observe(name, time.perf_counter() - started)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop"""
+    return await _run_in_hash_pool("password_hash.verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await _run_in_hash_pool("password_hash.hash", get_password_hash, password)
+
+
+def pending_hash_jobs() -> int:
+    """Number of hashing calls queued or running in the pool"""
+    return _pending_hash_jobs
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the hashing pool (called on application shutdown)"""
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -49,7 +116,9 @@ def create_refresh_token(data: dict, expires_days: int = 7) -> str:
     to_encode.update({
         "exp": expire,
         "type": "refresh",
-        "iat": datetime.utcnow()
+        "iat": datetime.utcnow(),
+        # Unique id so two tokens issued in the same second never collide
+        "jti": uuid.uuid4().hex,
     })
 
     encoded_jwt = jwt.encode(
@@ -60,6 +129,11 @@ def create_refresh_token(data: dict, expires_days: int = 7) -> str:
     return encoded_jwt
 
 
+def hash_token(token: str) -> str:
+    """Return the SHA-256 hex digest used to store opaque tokens"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def decode_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT token"""
     try:
@@ -0,0 +1,34 @@
+"""Startup phase timings.
+
+main.py and config/database.py wrap each cold-start step in phase(); the
+lifespan logs the breakdown once the app is ready and /api/admin/metrics
+reports it under "startup".
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+_phases: Dict[str, float] = {}
+
+
+def record(name: str, seconds: float) -> None:
+    _phases[name] = round(seconds * 1000, 1)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the wall time of the enclosed startup step."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def snapshot() -> dict:
+    """Phase durations in milliseconds, in the order they ran."""
+    return {"phases_ms": dict(_phases), "total_ms": round(sum(_phases.values()), 1)}
+
+
+def summary() -> str:
+    return ", ".join(f"{name} {ms:.0f}ms" for name, ms in _phases.items())
@@ -0,0 +1,265 @@
+"""
+Synthetic data generator for the benchmark suite.
+
+Writes slots, players, users, teams, contests, enrollments and per-contest
+player points into a scratch database at a configurable scale. Teams are
+valid under create_team's rules (4 players per slot, at most 3 players from
+one real-world team), and generation is deterministic for a given --seed.
+
+Contests created (codes are fixed so the runner can find them):
+    BENCH-ONGOING    started an hour ago, ends tomorrow; every team enrolled
+    BENCH-COMPLETED  ended yesterday; every team enrolled
+    BENCH-LIVE-<n>   future contests with a share of teams enrolled
+
+Run:
+    python benchmarks/datagen.py --db bench --users 5000 --players 300
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.utils.security import get_password_hash
+from app.utils.timezone import now_ist
+from config.settings import get_settings
+
+SLOTS = [
+    {"code": "BAT", "name": "Batters", "is_women_slot": False},
+    {"code": "BOWL", "name": "Bowlers", "is_women_slot": False},
+    {"code": "AR", "name": "All-rounders", "is_women_slot": False},
+    {"code": "WOMEN", "name": "Women", "is_women_slot": True},
+]
+PER_SLOT = 4
+MAX_PER_REAL_TEAM = 3
+REAL_TEAMS = ["CSK", "MI", "RCB", "KKR", "DC", "SRH", "RR", "PBKS", "GT", "LSG"]
+BENCH_PASSWORD = "bench-password"
+INSERT_BATCH = 5000
+
+COLLECTIONS = [
+    "slots", "players", "users", "teams", "contests",
+    "team_contest_enrollments", "player_contest_points",
+    "contest_rosters", "contest_team_snapshots", "contest_final_standings",
+    "admin_jobs", "import_logs",
+]
+
+
+class Scale(NamedTuple):
+    users: int = 1000
+    teams_per_user: int = 1
+    players: int = 200
+    live_contests: int = 3
+    live_enroll_share: float = 0.3
+
+
+def pick_lineup(players_by_slot: Dict[str, List[dict]], rng: random.Random) -> List[dict]:
+    """Random valid lineup: PER_SLOT players per slot, at most MAX_PER_REAL_TEAM per real team."""
+    while True:
+        per_team: Dict[str, int] = {}
+        lineup: List[dict] = []
+        for slot_players in players_by_slot.values():
+            picked = 0
+            for player in rng.sample(slot_players, len(slot_players)):
+                if per_team.get(player["team"], 0) >= MAX_PER_REAL_TEAM:
+                    continue
+                per_team[player["team"]] = per_team.get(player["team"], 0) + 1
+                lineup.append(player)
+                picked += 1
+                if picked == PER_SLOT:
+                    break
+        if len(lineup) == PER_SLOT * len(players_by_slot):
+            return lineup
+
+
+async def _insert(coll, docs: List[dict]) -> None:
+    for start in range(0, len(docs), INSERT_BATCH):
+        await coll.insert_many(docs[start:start + INSERT_BATCH])
+
+
+async def generate(db, scale: Scale, seed: int = 42) -> dict:
+    """Wipe the benchmark collections of `db` and fill them; returns a summary."""
+    rng = random.Random(seed)
+    now = now_ist()
+    for name in COLLECTIONS:
+        await db[name].delete_many({})
+
+    slots = [
+        {"_id": ObjectId(), **slot, "min_select": PER_SLOT, "max_select": PER_SLOT, "created_at": now, "updated_at": now}
+        for slot in SLOTS
+    ]
+    await db.slots.insert_many(slots)
+
+    players: List[dict] = []
+    players_by_slot: Dict[str, List[dict]] = {}
+    per_slot = max(PER_SLOT * 3, scale.players // len(slots))
+    for slot in slots:
+        for i in range(per_slot):
+            player = {
+                "_id": ObjectId(),
+                "name": f"{slot['code'].title()} Player {i}",
+                "team": REAL_TEAMS[i % len(REAL_TEAMS)],
+                "price": round(rng.uniform(6, 12), 1),
+                "slot": str(slot["_id"]),
+                "points": float(rng.randint(0, 500)),
+                "is_available": True,
+                "gender": "female" if slot["is_women_slot"] else "male",
+                "created_at": now,
+                "updated_at": now,
+            }
+            players.append(player)
+            players_by_slot.setdefault(slot["code"], []).append(player)
+    await _insert(db.players, players)
+
+    # Hashing once keeps generation fast; every bench user shares the password
+    hashed = get_password_hash(BENCH_PASSWORD)
+    users = [{
+        "_id": ObjectId(),
+        "username": "bench-admin",
+        "email": "bench-admin@example.com",
+        "hashed_password": hashed,
+        "full_name": "Bench Admin",
+        "mobile": "9000000000",
+        "mobile_digits": "9000000000",
+        "is_active": True,
+        "is_verified": True,
+        "is_admin": True,
+        "created_at": now,
+        "updated_at": now,
+    }]
+    for i in range(scale.users):
+        users.append({
+            "_id": ObjectId(),
+            "username": f"bench-user-{i}",
+            "email": f"bench-user-{i}@example.com",
+            "hashed_password": hashed,
+            "full_name": f"Bench User {i}",
+            "mobile": f"8{i:09d}",
+            "mobile_digits": f"8{i:09d}",
+            "is_active": True,
+            "is_verified": True,
+            "is_admin": False,
+            "avatar_url": None,
+            "created_at": now,
+            "updated_at": now,
+        })
+    await _insert(db.users, users)
+
+    teams: List[dict] = []
+    for user in users[1:]:
+        for n in range(scale.teams_per_user):
+            lineup = pick_lineup(players_by_slot, rng)
+            ids = [str(p["_id"]) for p in lineup]
+            teams.append({
+                "_id": ObjectId(),
+                "user_id": user["_id"],
+                "team_name": f"{user['username']} XI {n + 1}",
+                "player_ids": ids,
+                "captain_id": ids[0],
+                "vice_captain_id": ids[1],
+                "total_points": 0.0,
+                "total_value": round(sum(p["price"] for p in lineup), 1),
+                "created_at": now,
+                "updated_at": now,
+            })
+    await _insert(db.teams, teams)
+
+    def contest(code: str, start, end, status: str) -> dict:
+        return {
+            "_id": ObjectId(),
+            "code": code,
+            "name": code.replace("-", " ").title(),
+            "start_at": start,
+            "end_at": end,
+            "status": status,
+            "visibility": "public",
+            "points_scope": "time_window",
+            "contest_type": "full",
+            "allowed_teams": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    contests = [
+        contest("BENCH-ONGOING", now - timedelta(hours=1), now + timedelta(days=1), "ongoing"),
+        contest("BENCH-COMPLETED", now - timedelta(days=2), now - timedelta(days=1), "completed"),
+    ]
+    for i in range(scale.live_contests):
+        contests.append(contest(f"BENCH-LIVE-{i}", now + timedelta(days=i + 1), now + timedelta(days=i + 2), "live"))
+    await db.contests.insert_many(contests)
+
+    enrollments: List[dict] = []
+    for c in contests:
+        enrolled = teams if c["status"] != "live" else rng.sample(teams, int(len(teams) * scale.live_enroll_share))
+        for team in enrolled:
+            enrollments.append({
+                "_id": ObjectId(),
+                "team_id": team["_id"],
+                "user_id": team["user_id"],
+                "contest_id": c["_id"],
+                "status": "active",
+                "enrolled_at": now,
+            })
+    await _insert(db.team_contest_enrollments, enrollments)
+
+    points = [
+        {
+            "_id": ObjectId(),
+            "player_id": p["_id"],
+            "contest_id": c["_id"],
+            "points": float(rng.randint(0, 150)),
+            "updated_at": now,
+        }
+        for c in contests if c["status"] != "live"
+        for p in players
+    ]
+    await _insert(db.player_contest_points, points)
+
+    return {
+        "slots": len(slots),
+        "players": len(players),
+        "users": len(users),
+        "teams": len(teams),
+        "contests": len(contests),
+        "enrollments": len(enrollments),
+        "player_contest_points": len(points),
+    }
+
+
+async def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=settings.mongodb_url)
+    parser.add_argument("--db", default="bench", help="Scratch database name")
+    parser.add_argument("--users", type=int, default=Scale.users)
+    parser.add_argument("--teams-per-user", type=int, default=Scale.teams_per_user)
+    parser.add_argument("--players", type=int, default=Scale.players)
+    parser.add_argument("--live-contests", type=int, default=Scale.live_contests)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.db == settings.mongodb_db_name:
+        parser.error("--db must not be the application database")
+
+    client = AsyncIOMotorClient(args.mongo_url)
+    try:
+        summary = await generate(
+            client[args.db],
+            Scale(args.users, args.teams_per_user, args.players, args.live_contests),
+            seed=args.seed,
+        )
+        print(f"Generated into {args.db}: {summary}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,177 @@
+"""
+Benchmark: response encoding time and size, stdlib json vs orjson.
+
+Builds two synthetic payloads that match the largest hot responses:
+
+- leaderboard: LeaderboardResponseSchema with --entries rows (default 200)
+- players:     List[PlayerOut] with --players rows (default 1000), with
+               IST-aware created_at/updated_at
+
+and encodes each through the paths a route can take:
+
+- fastapi+json:     response_model validate + JSON-mode dump + json.dumps
+                    (the previous default JSONResponse)
+- fastapi+orjson:   response_model validate + JSON-mode dump + orjson
+                    (the current default TimedJSONResponse)
+- jsonable+json:    jsonable_encoder + json.dumps (routes without a response_model)
+- orjson-direct:    model_dump + orjson with the app's default hook, no
+                    FastAPI validation step
+
+Reported per path: best-of --repeat encode time, body bytes, and the body
+size after gzip and (when installed) Brotli at the configured levels.
+No database is needed.
+Run:
+    python benchmarks/encode_bench.py
+    python benchmarks/encode_bench.py --entries 1000 --players 5000 --json out.json
+"""
+
+import argparse
+import gzip
+import json
+import random
+import string
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.schemas.leaderboard import LeaderboardEntrySchema, LeaderboardResponseSchema
+from app.schemas.player import PlayerOut
+from app.utils.compression import brotli
+from app.utils.responses import dumps as orjson_dumps
+from app.utils.timezone import now_ist
+from config.settings import get_settings
+
+settings = get_settings()
+
+TEAMS = ["DV SPARTANS", "RS WARRIORS", "KP TITANS", "MB STRIKERS", "SL KINGS", "GR ROYALS"]
+
+
+def _word(n: int) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=n))
+
+
+def leaderboard_payload(entries: int) -> LeaderboardResponseSchema:
+    rows = [
+        LeaderboardEntrySchema(
+            rank=i + 1,
+            username=_word(10),
+            displayName=f"{_word(6).title()} {_word(8).title()}",
+            teamName=f"{_word(7).title()} XI",
+            points=round(random.uniform(0, 2500), 1),
+            rankChange=random.randint(-20, 20),
+            avatarUrl=f"https://cdn.example.com/avatars/{ObjectId()}.png",
+            teamId=str(ObjectId()),
+        )
+        for i in range(entries)
+    ]
+    return LeaderboardResponseSchema(entries=rows, currentUserEntry=rows[len(rows) // 2])
+
+
+def players_payload(count: int) -> List[PlayerOut]:
+    now = now_ist()
+    return [
+        PlayerOut(
+            id=str(ObjectId()),
+            name=f"{_word(6).title()} {_word(7).title()}",
+            team=random.choice(TEAMS),
+            price=random.choice([500, 750, 1000, 1250]),
+            slot=str(ObjectId()),
+            points=round(random.uniform(0, 300), 1),
+            is_available=True,
+            stats={"matches": random.randint(0, 40), "runs": random.randint(0, 900), "wickets": random.randint(0, 40)},
+            form=random.choice(["good", "average", None]),
+            image_url=f"https://cdn.example.com/players/{ObjectId()}.jpg",
+            gender=random.choice(["male", "female"]),
+            created_at=now - timedelta(days=random.randint(1, 300)),
+            updated_at=now,
+        )
+        for _ in range(count)
+    ]
+
+
+def stdlib_dumps(content: Any) -> bytes:
+    # What starlette's JSONResponse.render does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def encoders(annotation) -> dict:
+    adapter = TypeAdapter(annotation)
+
+    def fastapi_dump(payload):
+        # FastAPI's serialize_response for a response_model (pydantic v2)
+        return adapter.dump_python(adapter.validate_python(payload), mode="json", by_alias=True)
+
+    return {
+        "fastapi+json": lambda payload: stdlib_dumps(fastapi_dump(payload)),
+        "fastapi+orjson": lambda payload: orjson_dumps(fastapi_dump(payload)),
+        "jsonable+json": lambda payload: stdlib_dumps(jsonable_encoder(payload)),
+        "orjson-direct": lambda payload: orjson_dumps(payload),
+    }
+
+
+def best_of(fn: Callable[[], bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_payload(name: str, payload: Any, annotation, repeat: int) -> List[dict]:
+    results = []
+    for path, encode in encoders(annotation).items():
+        body = encode(payload)
+        seconds = best_of(lambda: encode(payload), repeat)
+        row = {
+            "payload": name,
+            "path": path,
+            "encode_ms": round(seconds * 1000, 3),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=settings.compression_gzip_level)),
+        }
+        if brotli is not None:
+            row["br_bytes"] = len(brotli.compress(body, quality=settings.compression_brotli_quality))
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200, help="Leaderboard rows")
+    parser.add_argument("--players", type=int, default=1000, help="Player list rows")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", help="Write results to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = run_payload("leaderboard", leaderboard_payload(args.entries), LeaderboardResponseSchema, args.repeat)
+    results += run_payload("players", players_payload(args.players), List[PlayerOut], args.repeat)
+
+    print(f"{'payload':<12} {'path':<16} {'encode_ms':>10} {'bytes':>9} {'gzip':>8} {'br':>8}")
+    for row in results:
+        br = row.get("br_bytes", "-")
+        print(
+            f"{row['payload']:<12} {row['path']:<16} {row['encode_ms']:>10.3f} "
+            f"{row['bytes']:>9} {row['gzip_bytes']:>8} {br:>8}"
+        )
+    if brotli is None:
+        print("(brotli not installed: br sizes skipped)")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2))
+        print(f"[OK] Wrote {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Benchmark: full-document reads vs projection models on contest hot paths.
+
+Seeds a scratch database with a synthetic contest of N enrolled teams (one
+user and one team per enrollment) and, for each hot-path read, compares the
+full Beanie document load against the projection model now used by the
+routes:
+
+- users:       User (incl. hashed_password)   vs UserDisplay
+- players:     Player                          vs PlayerSummary
+- enrollments: TeamContestEnrollment           vs EnrollmentTeamRef
+
+Reported per scenario:
+- wire_bytes:  size of the BSON reply batches (find_raw_batches)
+- decode_ms:   bson.decode_all over those batches
+- load_ms:     end-to-end Beanie query + model validation (best of --repeat)
+
+Requires a reachable MongoDB. The scratch database is dropped afterwards
+unless --keep is given (re-use it with --skip-seed).
+Run:
+    python benchmarks/projection_bench.py --teams 50000
+    python benchmarks/projection_bench.py --mongo-url mongodb://localhost:27017 --json out.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+import bson
+from beanie import PydanticObjectId, init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.player import Player
+from app.models.projections import EnrollmentTeamRef, PlayerSummary, UserDisplay
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.models.user import User
+from config.settings import get_settings
+
+settings = get_settings()
+
+PLAYER_COUNT = 300
+TEAM_SIZE = 11
+INSERT_BATCH = 5000
+# A bcrypt hash is 60 characters; the full User load pays for it on every row
+FAKE_BCRYPT = "$2b$12$" + "x" * 53
+
+
+def _word(n: int) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=n))
+
+
+async def seed(db, teams: int, contest_id: PydanticObjectId) -> None:
+    players = [
+        {
+            "_id": PydanticObjectId(),
+            "name": f"{_word(6).title()} {_word(8).title()}",
+            "team": random.choice(["CSK", "MI", "RCB", "KKR", "DC", "SRH", "RR", "PBKS"]),
+            "price": round(random.uniform(6, 12), 1),
+            "slot": str(PydanticObjectId()),
+            "points": float(random.randint(0, 500)),
+            "is_available": True,
+            "stats": {"matches": random.randint(0, 50), "runs": random.randint(0, 2000), "wickets": random.randint(0, 80)},
+            "form": "good",
+            "image_url": f"https://cdn.example.com/players/{_word(12)}.png",
+            "gender": "male",
+        }
+        for _ in range(PLAYER_COUNT)
+    ]
+    await db.players.insert_many(players)
+    player_ids = [str(p["_id"]) for p in players]
+
+    for start in range(0, teams, INSERT_BATCH):
+        count = min(INSERT_BATCH, teams - start)
+        users, team_docs, enrollments = [], [], []
+        for i in range(start, start + count):
+            user_id, team_id = PydanticObjectId(), PydanticObjectId()
+            lineup = random.sample(player_ids, TEAM_SIZE)
+            users.append({
+                "_id": user_id,
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "hashed_password": FAKE_BCRYPT,
+                "full_name": f"{_word(6).title()} {_word(9).title()}",
+                "mobile": f"+91{random.randint(6000000000, 9999999999)}",
+                "is_active": True,
+                "is_verified": True,
+                "is_admin": False,
+                "avatar_url": f"/api/users/{user_id}/avatar",
+                "avatar_file_id": str(PydanticObjectId()),
+            })
+            team_docs.append({
+                "_id": team_id,
+                "user_id": user_id,
+                "team_name": f"{_word(7).title()} XI",
+                "player_ids": lineup,
+                "captain_id": lineup[0],
+                "vice_captain_id": lineup[1],
+            })
+            enrollments.append({
+                "team_id": team_id,
+                "user_id": user_id,
+                "contest_id": contest_id,
+                "status": EnrollmentStatus.ACTIVE.value,
+            })
+        await db.users.insert_many(users)
+        await db.teams.insert_many(team_docs)
+        await db.team_contest_enrollments.insert_many(enrollments)
+        print(f"  seeded {start + count}/{teams} teams")
+
+
+async def _wire(coll, query: dict, projection) -> tuple[int, float]:
+    """Reply bytes for a query and the time to decode them."""
+    batches = []
+    async for batch in coll.find_raw_batches(query, projection):
+        batches.append(batch)
+    started = time.perf_counter()
+    for batch in batches:
+        bson.decode_all(batch)
+    return sum(len(b) for b in batches), (time.perf_counter() - started) * 1000
+
+
+async def _best_ms(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def run_scenario(name: str, model, projection_model, query: dict, repeat: int) -> dict:
+    coll = model.get_motor_collection()
+    projection = {field.alias or key: 1 for key, field in projection_model.model_fields.items()}
+
+    full_bytes, full_decode = await _wire(coll, query, None)
+    proj_bytes, proj_decode = await _wire(coll, query, projection)
+    full_load = await _best_ms(repeat, lambda: model.find(query).to_list())
+    proj_load = await _best_ms(repeat, lambda: model.find(query).project(projection_model).to_list())
+
+    def ratio(a: float, b: float) -> float:
+        return round(a / b, 2) if b else 0.0
+
+    return {
+        "scenario": name,
+        "full": {"wire_bytes": full_bytes, "decode_ms": round(full_decode, 2), "load_ms": round(full_load, 2)},
+        "projected": {"wire_bytes": proj_bytes, "decode_ms": round(proj_decode, 2), "load_ms": round(proj_load, 2)},
+        "reduction": {
+            "wire_bytes_x": ratio(full_bytes, proj_bytes),
+            "decode_x": ratio(full_decode, proj_decode),
+            "load_x": ratio(full_load, proj_load),
+        },
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=settings.mongodb_url)
+    parser.add_argument("--db", default="bench_projection", help="Scratch database name")
+    parser.add_argument("--teams", type=int, default=50000, help="Enrolled teams in the synthetic contest")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="Re-use data from a previous --keep run")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database afterwards")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    if args.db == settings.mongodb_db_name:
+        parser.error("--db must not be the application database")
+
+    random.seed(args.seed)
+    client = AsyncIOMotorClient(args.mongo_url)
+    db = client[args.db]
+    try:
+        await init_beanie(database=db, document_models=[User, Team, TeamContestEnrollment, Player])
+
+        meta = await db.bench_meta.find_one({"_id": "contest"})
+        if args.skip_seed and meta:
+            contest_id = meta["contest_id"]
+        else:
+            for name in ("users", "teams", "team_contest_enrollments", "players", "bench_meta"):
+                await db[name].delete_many({})
+            contest_id = PydanticObjectId()
+            print(f"Seeding {args.teams} teams into {args.db} ...")
+            await seed(db, args.teams, contest_id)
+            await db.bench_meta.insert_one({"_id": "contest", "contest_id": contest_id})
+
+        enr_query = {"contest_id": contest_id, "status": EnrollmentStatus.ACTIVE.value}
+        user_ids = await db.team_contest_enrollments.distinct("user_id", enr_query)
+        player_ids = [p["_id"] async for p in db.players.find({}, {"_id": 1})]
+
+        results = [
+            await run_scenario("users", User, UserDisplay, {"_id": {"$in": user_ids}}, args.repeat),
+            await run_scenario("players", Player, PlayerSummary, {"_id": {"$in": player_ids}}, args.repeat),
+            await run_scenario("enrollments", TeamContestEnrollment, EnrollmentTeamRef, enr_query, args.repeat),
+        ]
+
+        print(f"\n{'scenario':<12} {'full KiB':>10} {'proj KiB':>10} {'bytes x':>8} "
+              f"{'decode x':>9} {'full ms':>9} {'proj ms':>9} {'load x':>7}")
+        for r in results:
+            print(
+                f"{r['scenario']:<12} {r['full']['wire_bytes'] / 1024:>10.1f} {r['projected']['wire_bytes'] / 1024:>10.1f} "
+                f"{r['reduction']['wire_bytes_x']:>8} {r['reduction']['decode_x']:>9} "
+                f"{r['full']['load_ms']:>9} {r['projected']['load_ms']:>9} {r['reduction']['load_x']:>7}"
+            )
+
+        if args.json:
+            Path(args.json).write_text(json.dumps({"teams": args.teams, "results": results}, indent=2))
+            print(f"\nWrote {args.json}")
+    finally:
+        if not args.keep:
+            await client.drop_database(args.db)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,363 @@
+"""
+Load-test and micro-benchmark runner for the hot API endpoints.
+
+Generates a synthetic dataset (see datagen.py), starts the application
+in-process and drives it through an ASGI transport, so every measurement
+covers routing, dependencies, database access and serialization but not the
+network or the ASGI server. Scenarios:
+
+- contest_leaderboard_ongoing    GET  /api/contests/{id}/leaderboard (snapshot scoring)
+- contest_leaderboard_completed  GET  /api/contests/{id}/leaderboard (final standings archive)
+- global_leaderboard             GET  /api/leaderboard
+- hot_players_contest            GET  /api/players/hot?contest_id=...
+- hot_players_global             GET  /api/players/hot
+- create_team                    POST /api/teams/
+- upsert_player_points           PUT  /api/admin/contests/{id}/player-points
+- player_import                  POST /api/admin/players/import (CSV, persisted)
+
+Each scenario reports throughput and latency percentiles; results are
+printed and optionally written as JSON. With --baseline the run is compared
+against a previous --save-baseline file and exits with status 1 when a
+scenario's p95 latency or throughput regresses by more than --tolerance.
+
+Backends: "mongo" needs a reachable mongod (--mongo-url); "mongomock" runs
+against an in-memory mongomock-motor client. Mongomock numbers are only
+comparable with other mongomock runs.
+
+Run:
+    python benchmarks/run.py --backend mongomock --users 200 --output results.json
+    python benchmarks/run.py --users 5000 --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --users 5000 --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, NamedTuple
+
+import httpx
+
+# Add parent directory to path to import from app
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+sys.path.append(str(BACKEND_DIR / "benchmarks"))
+
+
+# $lookup with a sub-pipeline is not implemented by mongomock
+MONGOMOCK_UNSUPPORTED = {"hot_players_contest"}
+
+
+class Scenario(NamedTuple):
+    name: str
+    requests: int
+    concurrency: int
+    send: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+    expected: tuple = (200,)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, warmup: int) -> dict:
+    for i in range(warmup):
+        try:
+            await scenario.send(client, i)
+        except Exception:
+            pass  # counted in the measured run
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(scenario.requests))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                response = await scenario.send(client, warmup + i)
+                outcome = None if response.status_code in scenario.expected else str(response.status_code)
+            except Exception as e:
+                outcome = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            if outcome is not None:
+                errors[outcome] = errors.get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ms = sorted(v * 1000 for v in latencies)
+    return {
+        "requests": len(ms),
+        "concurrency": scenario.concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ms, 50), 2),
+            "p95": round(percentile(ms, 95), 2),
+            "p99": round(percentile(ms, 99), 2),
+            "max": round(ms[-1], 2) if ms else 0.0,
+            "mean": round(sum(ms) / len(ms), 2) if ms else 0.0,
+        },
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of p95 latency or throughput beyond `tolerance` (a fraction)."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        p95, base_p95 = current["latency_ms"]["p95"], base["latency_ms"]["p95"]
+        if base_p95 and p95 > base_p95 * (1 + tolerance):
+            regressions.append(f"{name}: p95 {p95}ms vs baseline {base_p95}ms")
+        rps, base_rps = current["throughput_rps"], base["throughput_rps"]
+        if base_rps and rps < base_rps * (1 - tolerance):
+            regressions.append(f"{name}: throughput {rps} rps vs baseline {base_rps} rps")
+        if current["errors"] and not base["errors"]:
+            regressions.append(f"{name}: errors {current['errors']}")
+    return regressions
+
+
+def import_csv(rows: int, batch: int, slot_codes: List[str]) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["name", "team", "points", "slot_code", "slot_name", "gender",
+                     "mobile", "status", "image_url", "matches", "runs", "wickets"])
+    for i in range(rows):
+        code = slot_codes[i % len(slot_codes)]
+        writer.writerow([
+            f"Import Player {batch}-{i}", "BENCH XI", i % 300, code, "",
+            "female" if code == "WOMEN" else "male", "", "active", "", i % 50, i * 7 % 2000, i % 80,
+        ])
+    return out.getvalue().encode()
+
+
+def build_scenarios(ctx: dict, scale: float) -> List[Scenario]:
+    def n(count: int) -> int:
+        return max(1, int(count * scale))
+
+    ongoing, completed = ctx["ongoing_id"], ctx["completed_id"]
+    user_headers = ctx["user_headers"]
+    admin_headers = ctx["admin_headers"]
+    rng = random.Random(7)
+
+    def as_user(i: int) -> dict:
+        return user_headers[i % len(user_headers)]
+
+    async def ongoing_leaderboard(client, i):
+        return await client.get(f"/api/contests/{ongoing}/leaderboard?skip=0&limit=50", headers=as_user(i))
+
+    async def completed_leaderboard(client, i):
+        return await client.get(f"/api/contests/{completed}/leaderboard?skip=0&limit=50", headers=as_user(i))
+
+    async def global_leaderboard(client, i):
+        return await client.get("/api/leaderboard", headers=as_user(i))
+
+    async def hot_contest(client, i):
+        return await client.get(f"/api/players/hot?contest_id={ongoing}&limit=50")
+
+    async def hot_global(client, i):
+        return await client.get("/api/players/hot?limit=50")
+
+    async def create_team(client, i):
+        ids = [str(p["_id"]) for p in ctx["lineups"][i % len(ctx["lineups"])]]
+        body = {"team_name": f"Bench Team {i}", "player_ids": ids, "captain_id": ids[0], "vice_captain_id": ids[1]}
+        return await client.post("/api/teams/", json=body, headers=as_user(i))
+
+    async def upsert_points(client, i):
+        updates = [{"player_id": pid, "points": float(rng.randint(0, 150))} for pid in rng.sample(ctx["player_ids"], 50)]
+        return await client.put(f"/api/admin/contests/{ongoing}/player-points", json={"updates": updates}, headers=admin_headers)
+
+    async def player_import(client, i):
+        # Batches cycle so later runs update existing players instead of growing the catalogue
+        content = import_csv(200, i % 5, ctx["slot_codes"])
+        return await client.post(
+            "/api/admin/players/import",
+            files={"file": ("players.csv", content, "text/csv")},
+            data={"dry_run": "false", "conflict": "update", "slot_strategy": "lookup", "header_row": "1"},
+            headers=admin_headers,
+        )
+
+    return [
+        Scenario("contest_leaderboard_ongoing", n(200), 10, ongoing_leaderboard),
+        Scenario("contest_leaderboard_completed", n(500), 10, completed_leaderboard),
+        Scenario("global_leaderboard", n(100), 5, global_leaderboard),
+        Scenario("hot_players_contest", n(200), 10, hot_contest),
+        Scenario("hot_players_global", n(200), 10, hot_global),
+        Scenario("create_team", n(200), 10, create_team, (201,)),
+        Scenario("upsert_player_points", n(100), 5, upsert_points),
+        Scenario("player_import", n(20), 2, player_import),
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["mongo", "mongomock"], default="mongo")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGODB_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="bench", help="Scratch database name")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--teams-per-user", type=int, default=1)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--live-contests", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-datagen", action="store_true", help="Re-use data from a previous run (mongo only)")
+    parser.add_argument("--scenarios", help="Comma-separated scenario names (default: all)")
+    parser.add_argument("--requests-scale", type=float, default=1.0, help="Multiplier for requests per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per scenario")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--save-baseline", help="Write results to this file as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression as a fraction (0.2 = 20%%)")
+    args = parser.parse_args()
+    if args.skip_datagen and args.backend == "mongomock":
+        parser.error("--skip-datagen needs a persistent backend")
+    return args
+
+
+async def main(args: argparse.Namespace) -> int:
+    # App modules read settings at import time, so point them at the scratch
+    # database before importing anything else
+    import config.settings as app_settings
+
+    if args.db == app_settings.settings.mongodb_db_name:
+        raise SystemExit("--db must not be the application database")
+    os.environ["MONGODB_URL"] = args.mongo_url
+    os.environ["MONGODB_DB_NAME"] = args.db
+    if args.backend == "mongomock":
+        # mongomock-motor's with_options() returns a synchronous collection
+        os.environ["MONGODB_LEADERBOARD_READ_PREFERENCE"] = "primary"
+        os.environ["MONGODB_CATALOGUE_READ_PREFERENCE"] = "primary"
+    app_settings.get_settings.cache_clear()
+    app_settings.settings = app_settings.get_settings()
+
+    import datagen
+    import config.database as database
+    from main import app, lifespan
+    from app.models.contest import Contest
+    from app.services.contests.finalize import finalize_contest
+    from app.services.contests.snapshots import freeze_contest
+    from app.utils.security import create_access_token
+
+    if args.backend == "mongomock":
+        from mongomock_motor import AsyncMongoMockClient
+
+        mock = AsyncMongoMockClient()
+        database.AsyncIOMotorClient = lambda *a, **kw: mock
+        db = mock[args.db]
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        data_client = AsyncIOMotorClient(args.mongo_url)
+        db = data_client[args.db]
+
+    if not args.skip_datagen:
+        scale = datagen.Scale(args.users, args.teams_per_user, args.players, args.live_contests)
+        summary = await datagen.generate(db, scale, seed=args.seed)
+        print(f"Generated into {args.db}: {summary}")
+
+    async with lifespan(app):
+        ongoing = await Contest.find_one(Contest.code == "BENCH-ONGOING")
+        completed = await Contest.find_one(Contest.code == "BENCH-COMPLETED")
+        if not ongoing or not completed:
+            raise SystemExit(f"No benchmark contests in {args.db}; run without --skip-datagen")
+        await freeze_contest(ongoing.id)
+        await finalize_contest(completed.id)
+
+        slots = await db.slots.find({}, {"code": 1}).to_list(length=None)
+        players = await db.players.find({}, {"team": 1, "slot": 1}).to_list(length=None)
+        codes = {str(s["_id"]): s["code"] for s in slots}
+        players_by_slot: Dict[str, List[dict]] = {}
+        for p in players:
+            players_by_slot.setdefault(codes.get(p.get("slot"), ""), []).append(p)
+        players_by_slot.pop("", None)
+        rng = random.Random(args.seed)
+        ctx = {
+            "ongoing_id": str(ongoing.id),
+            "completed_id": str(completed.id),
+            "player_ids": [str(p["_id"]) for p in players],
+            "slot_codes": sorted(codes.values()),
+            "lineups": [datagen.pick_lineup(players_by_slot, rng) for _ in range(50)],
+            "admin_headers": {"Authorization": f"Bearer {create_access_token({'sub': 'bench-admin'})}"},
+            "user_headers": [
+                {"Authorization": f"Bearer {create_access_token({'sub': f'bench-user-{i}'})}"}
+                for i in range(min(args.users, 100))
+            ],
+        }
+
+        scenarios = build_scenarios(ctx, args.requests_scale)
+        if args.scenarios:
+            wanted = set(args.scenarios.split(","))
+            unknown = wanted - {s.name for s in scenarios}
+            if unknown:
+                raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = [s for s in scenarios if s.name in wanted]
+        if args.backend == "mongomock":
+            skipped = [s.name for s in scenarios if s.name in MONGOMOCK_UNSUPPORTED]
+            if skipped:
+                print(f"Skipping on mongomock: {', '.join(skipped)}")
+            scenarios = [s for s in scenarios if s.name not in MONGOMOCK_UNSUPPORTED]
+
+        results = {
+            "meta": {
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "backend": args.backend,
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "users": args.users,
+                "teams_per_user": args.teams_per_user,
+                "players": args.players,
+                "requests_scale": args.requests_scale,
+            },
+            "scenarios": {},
+        }
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for scenario in scenarios:
+                result = await run_scenario(client, scenario, args.warmup)
+                results["scenarios"][scenario.name] = result
+                lat = result["latency_ms"]
+                print(
+                    f"{scenario.name:<30} {result['throughput_rps']:>9.1f} rps  p50 {lat['p50']:>8.2f}  "
+                    f"p95 {lat['p95']:>8.2f}  p99 {lat['p99']:>8.2f} ms  errors {sum(result['errors'].values())}"
+                )
+
+    if args.backend == "mongo":
+        data_client.close()
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(results, indent=2))
+            print(f"Wrote {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("meta", {}).get("backend") != args.backend:
+            print(f"Warning: baseline was recorded with backend {baseline.get('meta', {}).get('backend')}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -1,24 +1,142 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
 from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
+from beanie.odm.utils.init import Initializer
 from config.settings import get_settings
+from app.utils import startup
+from app.utils.mongo_pool import PoolListener
+from app.utils.request_stats import MongoCommandListener
 from app.models.user import User, RefreshToken, UserProfile
 from app.models.sponsor import Sponsor
 from app.models.carousel import CarouselImage
 from app.models.team import Team
 from app.models.contest import Contest
 from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.models.contest_snapshot import ContestRoster, ContestTeamSnapshot
+from app.models.contest_standing import ContestFinalStanding
 from app.models.admin.player import Player as AdminPlayer
 from app.models.admin.slot import Slot
 from app.models.admin.import_log import ImportLog
+from app.models.admin.job import AdminJob
 from app.models.player import Player as PublicPlayer
 from app.models.player_contest_points import PlayerContestPoints
 from app.models.password_reset import PasswordResetSession, PasswordResetToken
 
 settings = get_settings()
+logger = logging.getLogger("app.database")
+
+# Document models registered with Beanie
+DOCUMENT_MODELS = [
+    User,
+    RefreshToken,
+    UserProfile,
+    Sponsor,
+    CarouselImage,
+    Team,
+    AdminPlayer,
+    PublicPlayer,
+    PlayerContestPoints,
+    Slot,
+    ImportLog,
+    AdminJob,
+    Contest,
+    TeamContestEnrollment,
+    ContestRoster,
+    ContestTeamSnapshot,
+    ContestFinalStanding,
+    PasswordResetSession,
+    PasswordResetToken,
+]
 
 # MongoDB client
 client: AsyncIOMotorClient = None
 
+# Background index build started by connect_to_mongo() in "background" mode
+INDEX_BUILD_RETRY_SECONDS = 30
+
+_index_task: Optional[asyncio.Task] = None
+_indexes_ready = False
+
+
+class _DeferredIndexInitializer(Initializer):
+    """Beanie initializer that skips index verification at startup."""
+
+    async def init_indexes(self, cls, allow_index_dropping: bool = False):
+        return None
+
+
+async def ensure_indexes(allow_index_dropping: bool = False) -> Dict[str, float]:
+    """Create the declared indexes of every document model (Beanie must be initialized).
+
+    Returns seconds spent per model. With allow_index_dropping, indexes that
+    are no longer declared are dropped as well.
+    """
+    global _indexes_ready
+    initializer = Initializer(
+        database=get_database(),
+        document_models=DOCUMENT_MODELS,
+        allow_index_dropping=allow_index_dropping,
+    )
+    timings: Dict[str, float] = {}
+    for model in DOCUMENT_MODELS:
+        started = time.perf_counter()
+        await initializer.init_indexes(model, allow_index_dropping)
+        timings[model.__name__] = time.perf_counter() - started
+    _indexes_ready = True
+    return timings
+
+
+async def _build_indexes() -> None:
+    # The worker reports not ready until this succeeds, so keep retrying
+    started = time.perf_counter()
+    while True:
+        try:
+            await ensure_indexes()
+            break
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Background index build failed; retrying in %ss", INDEX_BUILD_RETRY_SECONDS)
+        await asyncio.sleep(INDEX_BUILD_RETRY_SECONDS)
+    logger.info("Background index build finished in %.0fms", (time.perf_counter() - started) * 1000)
+
+
+def _start_index_build() -> None:
+    global _index_task
+    _index_task = asyncio.create_task(_build_indexes(), name="ensure-indexes")
+
+
+def indexes_ready() -> bool:
+    """Whether this process has created or verified the indexes.
+
+    The readiness probe gates on this, so in "background" mode a worker takes
+    no traffic before the unique and text indexes exist.
+    """
+    # "startup" builds them before serving; "skip" leaves them to manage.py ensure-indexes
+    return _indexes_ready or settings.mongodb_index_mode != "background"
+
+
+def client_options() -> dict:
+    """Pool, timeout and compression options for the application client."""
+    options = {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "maxConnecting": settings.mongodb_max_connecting,
+        "maxIdleTimeMS": settings.mongodb_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.mongodb_wait_queue_timeout_ms,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongodb_connect_timeout_ms,
+        "socketTimeoutMS": settings.mongodb_socket_timeout_ms,
+        "event_listeners": [MongoCommandListener(), PoolListener()],
+    }
+    compressors = [c.strip() for c in settings.mongodb_compressors.split(",") if c.strip()]
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
 
 async def connect_to_mongo():
     """Connect to MongoDB and initialize Beanie ODM"""
@@ -26,35 +144,26 @@ async def connect_to_mongo():
 
     try:
         # Create MongoDB client
-        client = AsyncIOMotorClient(settings.mongodb_url)
+        client = AsyncIOMotorClient(settings.mongodb_url, **client_options())
 
         # Test connection
-        await client.admin.command('ping')
+        with startup.phase("mongo_connect"):
+            await client.admin.command('ping')
         print(f"[OK] Connected to MongoDB at {settings.mongodb_url}")
 
-        # Initialize Beanie with document models
-        await init_beanie(
-            database=client[settings.mongodb_db_name],
-            document_models=[
-                User,
-                RefreshToken,
-                UserProfile,
-                Sponsor,
-                CarouselImage,
-                Team,
-                AdminPlayer,
-                PublicPlayer,
-                PlayerContestPoints,
-                Slot,
-                ImportLog,
-                Contest,
-                TeamContestEnrollment,
-                PasswordResetSession,
-                PasswordResetToken,
-            ]
-        )
+        # Initialize Beanie with document models; outside "startup" mode
+        # index creation is left to ensure_indexes()
+        initializer = Initializer if settings.mongodb_index_mode == "startup" else _DeferredIndexInitializer
+        with startup.phase("beanie_init"):
+            await initializer(
+                database=client[settings.mongodb_db_name],
+                document_models=DOCUMENT_MODELS,
+            )
         print(f"[OK] Initialized Beanie ODM with database: {settings.mongodb_db_name}")
 
+        if settings.mongodb_index_mode == "background":
+            _start_index_build()
+
     except Exception as e:
         print(f"[ERROR] Failed to connect to MongoDB: {e}")
         raise
@@ -63,11 +172,22 @@ async def connect_to_mongo():
 async def close_mongo_connection():
     """Close MongoDB connection"""
     global client
+    if _index_task is not None and not _index_task.done():
+        _index_task.cancel()
     if client:
         client.close()
         print("[OK] Closed MongoDB connection")
 
 
+async def ping(timeout: float) -> float:
+    """Round-trip a ping to MongoDB within `timeout` seconds; returns the latency."""
+    if client is None:
+        raise Exception("Database not initialized. Call connect_to_mongo() first.")
+    started = time.perf_counter()
+    await asyncio.wait_for(client.admin.command("ping"), timeout=timeout)
+    return time.perf_counter() - started
+
+
 def get_database():
     """Get MongoDB database instance"""
     if client is None:
@@ -4,7 +4,7 @@ from typing import Optional
 from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import Field, field_validator
 
 # Get the root directory of the monorepo (two levels up from backend/config)
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent.parent
@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     # Environment
     node_env: str = Field(default="development", alias="NODE_ENV")
     debug: bool = Field(default=True, alias="DEBUG")
+    log_level: str = Field(default="CRITICAL", alias="LOG_LEVEL")
     
     # Security
     secret_key: str = Field(..., min_length=32, alias="SECRET_KEY")
@@ -27,10 +28,75 @@ class Settings(BaseSettings):
     # MongoDB Database
     mongodb_url: str = Field(default="mongodb://localhost:27017", alias="MONGODB_URL")
     mongodb_db_name: str = Field(default="world-tower", alias="MONGODB_DB_NAME")
+    # Index creation: "startup" verifies indexes before serving, "background" builds them
+    # after startup (readiness fails until done), "skip" leaves them to
+    # `python manage.py ensure-indexes` (run on deploy)
+    mongodb_index_mode: str = Field(default="startup", pattern="^(startup|background|skip)$", alias="MONGODB_INDEX_MODE")
+    # Connection pool (per worker process) and timeouts
+    mongodb_max_pool_size: int = Field(default=100, ge=1, alias="MONGODB_MAX_POOL_SIZE")
+    mongodb_min_pool_size: int = Field(default=0, ge=0, alias="MONGODB_MIN_POOL_SIZE")
+    mongodb_max_connecting: int = Field(default=2, ge=1, alias="MONGODB_MAX_CONNECTING")
+    mongodb_max_idle_time_ms: Optional[int] = Field(default=300000, gt=0, alias="MONGODB_MAX_IDLE_TIME_MS")
+    mongodb_wait_queue_timeout_ms: Optional[int] = Field(default=None, gt=0, alias="MONGODB_WAIT_QUEUE_TIMEOUT_MS")
+    mongodb_server_selection_timeout_ms: int = Field(default=5000, gt=0, alias="MONGODB_SERVER_SELECTION_TIMEOUT_MS")
+    mongodb_connect_timeout_ms: int = Field(default=10000, gt=0, alias="MONGODB_CONNECT_TIMEOUT_MS")
+    mongodb_socket_timeout_ms: Optional[int] = Field(default=None, gt=0, alias="MONGODB_SOCKET_TIMEOUT_MS")
+    # Wire compression, comma separated in order of preference (zstd needs zstandard, snappy needs python-snappy)
+    mongodb_compressors: str = Field(default="", alias="MONGODB_COMPRESSORS")
+    # Read preferences for queries that tolerate bounded staleness (see app/utils/read_policy.py)
+    mongodb_leaderboard_read_preference: str = Field(
+        default="secondaryPreferred",
+        pattern="^(primary|primaryPreferred|secondary|secondaryPreferred|nearest)$",
+        alias="MONGODB_LEADERBOARD_READ_PREFERENCE",
+    )
+    mongodb_catalogue_read_preference: str = Field(
+        default="secondaryPreferred",
+        pattern="^(primary|primaryPreferred|secondary|secondaryPreferred|nearest)$",
+        alias="MONGODB_CATALOGUE_READ_PREFERENCE",
+    )
+    # MongoDB requires at least 90 seconds; -1 means no staleness bound
+    mongodb_max_staleness_seconds: int = Field(default=90, alias="MONGODB_MAX_STALENESS_SECONDS")
     
     # API Configuration
     api_host: str = Field(default="0.0.0.0", alias="API_HOST")
     api_port: int = Field(default=8000, alias="API_PORT")
+
+    # Production server (serve.py): worker processes, 0 = one per available CPU.
+    # Each worker holds its own MongoDB pool of up to MONGODB_MAX_POOL_SIZE connections.
+    web_concurrency: int = Field(default=0, ge=0, alias="WEB_CONCURRENCY")
+    # Time in-flight requests and background jobs get to finish after SIGTERM
+    server_graceful_shutdown_seconds: int = Field(default=30, ge=0, alias="SERVER_GRACEFUL_SHUTDOWN_SECONDS")
+    server_keep_alive_seconds: int = Field(default=5, ge=1, alias="SERVER_KEEP_ALIVE_SECONDS")
+
+    # Slots and player catalogue cached per worker (see app/services/reference_data.py)
+    reference_data_ttl_seconds: float = Field(default=60.0, gt=0, alias="REFERENCE_DATA_TTL_SECONDS")
+
+    # Response compression (see app/utils/compression.py); Brotli is used when installed
+    compression_minimum_size: int = Field(default=1024, ge=0, alias="COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(default=6, ge=1, le=9, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, ge=0, le=11, alias="COMPRESSION_BROTLI_QUALITY")
+
+    # Shared cache (see app/cache); "redis" uses REDIS_URL and is shared by all workers
+    cache_backend: str = Field(default="memory", pattern="^(memory|redis)$", alias="CACHE_BACKEND")
+    cache_key_prefix: str = Field(default="walle", alias="CACHE_KEY_PREFIX")
+    cache_max_entries: int = Field(default=10000, ge=1, alias="CACHE_MAX_ENTRIES")
+    cache_default_ttl_seconds: float = Field(default=30.0, gt=0, alias="CACHE_DEFAULT_TTL_SECONDS")
+    # How long other workers wait for one worker's recompute of a missed key
+    cache_lock_seconds: float = Field(default=5.0, gt=0, alias="CACHE_LOCK_SECONDS")
+    # Result-sharing window of coalesced read endpoints (see app/cache/coalesce.py)
+    coalesce_window_seconds: float = Field(default=1.0, gt=0, alias="COALESCE_WINDOW_SECONDS")
+
+    # Readiness probe thresholds (see app/routes/health.py)
+    event_loop_lag_interval_seconds: float = Field(default=0.5, gt=0, alias="EVENT_LOOP_LAG_INTERVAL_SECONDS")
+    health_db_timeout_seconds: float = Field(default=1.0, gt=0, alias="HEALTH_DB_TIMEOUT_SECONDS")
+    health_max_loop_lag_ms: float = Field(default=500.0, gt=0, alias="HEALTH_MAX_LOOP_LAG_MS")
+    # Not ready once a server's pool has this share of MONGODB_MAX_POOL_SIZE checked out
+    health_max_pool_usage: float = Field(default=0.9, gt=0, le=1, alias="HEALTH_MAX_POOL_USAGE")
+
+    # Opt-in event-loop blocking detector for staging (see app/utils/blocking.py)
+    blocking_detection: bool = Field(default=False, alias="BLOCKING_DETECTION")
+    blocking_threshold_ms: float = Field(default=100.0, gt=0, alias="BLOCKING_THRESHOLD_MS")
+    blocking_asyncio_debug: bool = Field(default=False, alias="BLOCKING_ASYNCIO_DEBUG")
     
     # CORS
     cors_origins: str = Field(
@@ -48,10 +114,45 @@ class Settings(BaseSettings):
     twofactor_api_key: Optional[str] = Field(default=None, alias="TWOFACTOR_API_KEY")
     twofactor_template_name: Optional[str] = Field(default=None, alias="TWOFACTOR_TEMPLATE_NAME")
     twofactor_base_url: str = Field(default="https://2factor.in/API/V1", alias="TWOFACTOR_BASE_URL")
+    twofactor_timeout_seconds: float = Field(default=10.0, gt=0, alias="TWOFACTOR_TIMEOUT_SECONDS")
+    twofactor_max_connections: int = Field(default=20, ge=1, alias="TWOFACTOR_MAX_CONNECTIONS")
+    twofactor_max_concurrency: int = Field(default=10, ge=1, alias="TWOFACTOR_MAX_CONCURRENCY")
+    twofactor_max_retries: int = Field(default=2, ge=0, alias="TWOFACTOR_MAX_RETRIES")
+    twofactor_breaker_threshold: int = Field(default=5, ge=1, alias="TWOFACTOR_BREAKER_THRESHOLD")
+    twofactor_breaker_reset_seconds: float = Field(default=30.0, gt=0, alias="TWOFACTOR_BREAKER_RESET_SECONDS")
     otp_expiry_seconds: int = Field(default=600, alias="OTP_EXPIRY_SECONDS")
     otp_max_attempts: int = Field(default=5, alias="OTP_MAX_ATTEMPTS")
     reset_token_ttl_seconds: int = Field(default=600, alias="RESET_TOKEN_TTL_SECONDS")
-    
+
+    # Password hashing (bcrypt runs off the event loop in a bounded pool)
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, alias="BCRYPT_ROUNDS")
+    password_hash_workers: int = Field(default=4, ge=1, alias="PASSWORD_HASH_WORKERS")
+    password_hash_max_pending: int = Field(default=64, ge=1, alias="PASSWORD_HASH_MAX_PENDING")
+
+    # Contest lifecycle scheduler (upper bound between status syncs)
+    contest_scheduler_max_sleep_seconds: float = Field(default=60.0, gt=0, alias="CONTEST_SCHEDULER_MAX_SLEEP_SECONDS")
+    # HTTP cache lifetime for leaderboards of finalized (completed) contests
+    contest_archive_cache_seconds: int = Field(default=3600, ge=0, alias="CONTEST_ARCHIVE_CACHE_SECONDS")
+    # Admin corrections to a completed contest are re-archived once per burst, this long after the first
+    contest_refinalize_delay_seconds: float = Field(default=2.0, ge=0, alias="CONTEST_REFINALIZE_DELAY_SECONDS")
+
+    # Request instrumentation: log requests slower than / issuing more queries than these
+    slow_request_ms: float = Field(default=1000.0, gt=0, alias="SLOW_REQUEST_MS")
+    slow_request_queries: int = Field(default=50, ge=1, alias="SLOW_REQUEST_QUERIES")
+
+    # Live leaderboard SSE feed
+    live_feed_heartbeat_seconds: float = Field(default=15.0, gt=0, alias="LIVE_FEED_HEARTBEAT_SECONDS")
+    # Periodic recompute so point updates made on other workers still reach clients
+    live_feed_refresh_seconds: float = Field(default=15.0, gt=0, alias="LIVE_FEED_REFRESH_SECONDS")
+    live_feed_min_interval_seconds: float = Field(default=0.5, ge=0, alias="LIVE_FEED_MIN_INTERVAL_SECONDS")
+
+    @field_validator("mongodb_max_staleness_seconds")
+    @classmethod
+    def _check_max_staleness(cls, value: int) -> int:
+        if value != -1 and value < 90:
+            raise ValueError("must be -1 (no bound) or at least 90 seconds")
+        return value
+
     @property
     def cors_origins_list(self) -> list[str]:
         """Convert CORS origins string to list and support wildcard patterns."""
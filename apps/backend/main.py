@@ -1,14 +1,32 @@
-from fastapi import FastAPI
+import time
+
+# Module import time is reported as the first startup phase
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
-from datetime import datetime
 from config.settings import settings
 import logging
 from config.database import connect_to_mongo, close_mongo_connection
-from app.routes import auth_router, users_router, sponsors_router, leaderboard_router, contests_router
+from app.utils.request_stats import RequestStatsMiddleware
+from app.utils.compression import CompressionMiddleware
+from app.utils import blocking, loop_lag, startup
+from app.utils.responses import TimedJSONResponse
+from app.utils.security import PasswordHasherBusy, shutdown_hash_pool
+from app.services.auth import twofactor
+from app.common.enums.contests import ContestStatus
+from app.services.contests.lifecycle import scheduler as contest_scheduler
+from app.services.contests.snapshots import freeze_contests
+from app.services.contests.finalize import drain_refinalize, finalize_contests
+from app.services.contests import live_feed
+from app import cache
+from app.services import jobs, reference_data, team_totals
+from app.routes import auth_router, users_router, sponsors_router, leaderboard_router, contests_router, me_router, health_router
 from app.routes.players import router as players_router
 from app.routes.players_hot import router as players_hot_router
 from app.routes.slots import router as slots_router
@@ -20,23 +38,52 @@ from app.routes.admin import (
     players_import_router as admin_players_import_router,
     contests_router as admin_contests_router,
     users_teams_router as admin_users_teams_router,
+    metrics_router as admin_metrics_router,
+    jobs_router as admin_jobs_router,
 )
 
 # Logging configuration
 logging.basicConfig(
-    level=logging.CRITICAL,
+    level=settings.log_level.upper(),
     format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
 )
 logger = logging.getLogger("app.startup")
 
+# Freeze enrolled team lineups when a contest goes ongoing
+contest_scheduler.on_transition(ContestStatus.ONGOING, freeze_contests)
+# Archive final standings when a contest completes
+contest_scheduler.on_transition(ContestStatus.COMPLETED, finalize_contests)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
+    if settings.blocking_detection:
+        blocking.install(settings.blocking_threshold_ms, settings.blocking_asyncio_debug)
     # Startup: Connect to MongoDB
     await connect_to_mongo()
+    await cache.start()
+    # Jobs left running by a stopped or crashed worker would otherwise never finish
+    await jobs.fail_interrupted()
+    with startup.phase("reference_data"):
+        await reference_data.warm()
+    with startup.phase("twofactor_client"):
+        await twofactor.start_client()
+    contest_scheduler.start()
+    loop_lag.start(settings.event_loop_lag_interval_seconds)
+    logger.info("Startup phases: %s", startup.summary())
     yield
-    # Shutdown: Close MongoDB connection
+    # Shutdown: stop background tasks, then close MongoDB connection
+    await loop_lag.stop()
+    await contest_scheduler.stop()
+    await live_feed.close_all()
+    await jobs.drain(timeout=settings.server_graceful_shutdown_seconds)
+    await drain_refinalize(timeout=settings.server_graceful_shutdown_seconds)
+    await team_totals.drain(timeout=settings.server_graceful_shutdown_seconds)
     await close_mongo_connection()
+    await cache.close()
+    await twofactor.close_client()
+    shutdown_hash_pool()
+    blocking.uninstall()
 
 
 app = FastAPI(
@@ -44,7 +91,19 @@ app = FastAPI(
     description="Fantasy Cricket Platform API with MongoDB Authentication",
     version="1.0.0",
     debug=settings.debug,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
+)
+
+# Per-request query count, DB time and serialization time (Server-Timing header)
+app.add_middleware(RequestStatsMiddleware)
+
+# Brotli/gzip for large JSON bodies; outside RequestStats so Server-Timing excludes it
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
 )
 
 # CORS middleware with wildcard support (exact origins + optional regex)
@@ -58,23 +117,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed load when the password hashing queue is saturated."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 # Log CORS configuration (helpful for debugging in deployments)
 logger.info("CORS exact origins: %s", settings.cors_exact_origins)
 logger.info("CORS origin regex: %s", settings.cors_origin_regex)
 
 # Include routers
+app.include_router(health_router)
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(sponsors_router)
 app.include_router(leaderboard_router)
 app.include_router(contests_router)
+app.include_router(me_router)
 app.include_router(admin_players_router)
 app.include_router(admin_slots_router)
 app.include_router(admin_players_import_router)
 app.include_router(admin_contests_router)
 app.include_router(admin_users_teams_router)
-app.include_router(players_router)
+app.include_router(admin_metrics_router)
+app.include_router(admin_jobs_router)
+# /api/players/hot must be matched before /api/players/{id}
 app.include_router(players_hot_router)
+app.include_router(players_router)
 app.include_router(slots_router)
 app.include_router(teams_router)
 app.include_router(carousel_router)
@@ -89,14 +162,6 @@ async def root():
         "version": "1.0.0"
     }
 
-@app.get("/api/health")
-async def health_check():
-    return {
-        "status": "healthy",
-        "database": "MongoDB connected",
-        "timestamp": datetime.now()
-    }
-
 # Real players endpoints are provided via players_router
 
 @app.get("/api/leaderboard")
@@ -110,12 +175,16 @@ async def get_leaderboard():
         ]
     }
 
+startup.record("module_import", time.perf_counter() - _import_started)
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.is_development,
-        log_level="critical",
-        access_log=False
+        log_level=settings.log_level.lower(),
+        access_log=False,
+        # uvloop callbacks cannot be timed by the blocking detector
+        loop="asyncio" if settings.blocking_detection else "auto",
     )
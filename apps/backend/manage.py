@@ -0,0 +1,54 @@
+"""
+One-shot management commands.
+
+Commands:
+    ensure-indexes   Create the indexes declared on every document model.
+                     Run it on deploy when the app starts with
+                     MONGODB_INDEX_MODE=skip (or background).
+
+Run:
+    python manage.py ensure-indexes
+    python manage.py ensure-indexes --allow-index-dropping
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+# Connect without the startup index pass; this command does it explicitly
+os.environ["MONGODB_INDEX_MODE"] = "skip"
+
+from config.database import close_mongo_connection, connect_to_mongo, ensure_indexes
+
+
+async def cmd_ensure_indexes(args: argparse.Namespace) -> None:
+    await connect_to_mongo()
+    try:
+        started = time.perf_counter()
+        timings = await ensure_indexes(allow_index_dropping=args.allow_index_dropping)
+        for model, seconds in timings.items():
+            print(f"  {model:<28} {seconds * 1000:>8.1f}ms")
+        print(f"[OK] Indexes ensured for {len(timings)} models in {(time.perf_counter() - started) * 1000:.0f}ms")
+    finally:
+        await close_mongo_connection()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure-indexes", help="Create declared indexes on all collections")
+    ensure.add_argument(
+        "--allow-index-dropping",
+        action="store_true",
+        help="Also drop indexes that are no longer declared on the models",
+    )
+    ensure.set_defaults(func=cmd_ensure_indexes)
+
+    args = parser.parse_args()
+    asyncio.run(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
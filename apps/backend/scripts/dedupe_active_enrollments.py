@@ -0,0 +1,68 @@
+"""
+Migration: remove duplicate active enrollments before the partial unique index.
+- Finds (team_id, contest_id) pairs with more than one active enrollment.
+- Keeps the earliest enrollment and marks the others as removed.
+The unique index `team_contest_active_unique` cannot be built while
+duplicates exist, so run this before deploying it:
+    python scripts/dedupe_active_enrollments.py [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config.settings import get_settings
+
+settings = get_settings()
+
+
+async def dedupe(dry_run: bool) -> None:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    try:
+        await client.admin.command("ping")
+        print(f"✓ Connected to MongoDB at {settings.mongodb_url}")
+        coll = client[settings.mongodb_db_name]["team_contest_enrollments"]
+
+        pipeline = [
+            {"$match": {"status": "active"}},
+            {"$sort": {"enrolled_at": 1, "_id": 1}},
+            {"$group": {
+                "_id": {"team_id": "$team_id", "contest_id": "$contest_id"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1},
+            }},
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+        extra_ids = []
+        async for group in coll.aggregate(pipeline):
+            key = group["_id"]
+            print(f"[DUP] team={key['team_id']} contest={key['contest_id']} active={group['count']}")
+            extra_ids.extend(group["ids"][1:])
+
+        print(f"Duplicate active enrollments to remove: {len(extra_ids)}")
+        if extra_ids and not dry_run:
+            result = await coll.update_many(
+                {"_id": {"$in": extra_ids}},
+                {"$set": {"status": "removed", "removed_at": datetime.utcnow()}},
+            )
+            print(f"✓ Marked {result.modified_count} enrollments as removed")
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove duplicate active enrollments")
+    parser.add_argument("--dry-run", action="store_true", help="Report duplicates without writing")
+    args = parser.parse_args()
+    asyncio.run(dedupe(dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Backfill: archive final standings for completed contests that were never finalized.
+New completions are finalized by the contest lifecycle scheduler; this covers
+contests that completed before the archive existed. Ongoing and completed
+contests without team snapshots are scored from live teams as before.
+Run:
+    python scripts/finalize_completed_contests.py --dry-run
+    python scripts/finalize_completed_contests.py
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config.database import connect_to_mongo, close_mongo_connection
+from app.common.enums.contests import ContestStatus
+from app.models.contest import Contest
+from app.services.contests.finalize import finalize_contest
+
+
+async def backfill(dry_run: bool) -> None:
+    contests = await Contest.find({
+        "status": ContestStatus.COMPLETED.value,
+        "final_standings_version": None,
+    }).to_list()
+    print(f"Found {len(contests)} completed contest(s) without archived standings")
+
+    for contest in contests:
+        if dry_run:
+            print(f"[PLAN] Finalize contest {contest.code} ({contest.id})")
+            continue
+        version = await finalize_contest(contest.id)
+        print(f"[OK] Finalized contest {contest.code} ({contest.id}) version={version}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="List contests without writing")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await backfill(dry_run=args.dry_run)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Migration: backfill `mobile_digits` on users and `phone_digits` on reset sessions.
+- Computes the digits-only form of User.mobile and stores it for indexed lookups.
+- Mobiles shared by several users are left unset and reported, since
+  `mobile_digits` carries a unique (partial) index; resolve them manually.
+- Backfills PasswordResetSession.phone_digits for sessions still pending.
+- Creates the unique index once the data is consistent.
+Run before deploying the code that relies on the index:
+    python scripts/migrate_add_mobile_digits.py [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel, UpdateOne
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.utils.phone import normalize_mobile_digits
+from config.settings import get_settings
+
+settings = get_settings()
+
+
+async def backfill(dry_run: bool) -> None:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    try:
+        await client.admin.command("ping")
+        print(f"✓ Connected to MongoDB at {settings.mongodb_url}")
+        db = client[settings.mongodb_db_name]
+        users = db["users"]
+
+        # Group users by normalized mobile to detect conflicts up front
+        by_digits = defaultdict(list)
+        async for doc in users.find({"mobile": {"$nin": [None, ""]}}, {"mobile": 1, "username": 1}):
+            digits = normalize_mobile_digits(doc.get("mobile"))
+            if digits:
+                by_digits[digits].append(doc)
+
+        ops = []
+        conflicts = 0
+        for digits, docs in by_digits.items():
+            if len(docs) > 1:
+                conflicts += 1
+                names = ", ".join(d.get("username", str(d["_id"])) for d in docs)
+                print(f"[CONFLICT] mobile digits {digits} shared by: {names}")
+                continue
+            ops.append(UpdateOne({"_id": docs[0]["_id"]}, {"$set": {"mobile_digits": digits}}))
+
+        print(f"Users to backfill: {len(ops)}, conflicting numbers: {conflicts}")
+        if ops and not dry_run:
+            result = await users.bulk_write(ops, ordered=False)
+            print(f"✓ Updated {result.modified_count} users")
+
+        sessions = db["password_reset_sessions"]
+        session_ops = []
+        async for doc in sessions.find({"status": "pending", "phone_digits": {"$exists": False}}, {"phone": 1}):
+            digits = normalize_mobile_digits(doc.get("phone"))
+            if digits:
+                session_ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"phone_digits": digits}}))
+        print(f"Pending reset sessions to backfill: {len(session_ops)}")
+        if session_ops and not dry_run:
+            result = await sessions.bulk_write(session_ops, ordered=False)
+            print(f"✓ Updated {result.modified_count} sessions")
+
+        if not dry_run:
+            await users.create_indexes([
+                IndexModel(
+                    [("mobile_digits", 1)],
+                    name="mobile_digits_unique",
+                    unique=True,
+                    partialFilterExpression={"mobile_digits": {"$type": "string"}},
+                )
+            ])
+            print("✓ Ensured unique index on users.mobile_digits")
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill normalized mobile digits")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    args = parser.parse_args()
+    asyncio.run(backfill(dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
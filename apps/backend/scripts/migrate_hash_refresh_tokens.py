@@ -0,0 +1,80 @@
+"""
+Migration: store refresh tokens as SHA-256 digests grouped into families.
+- Replaces the raw `token` field with `token_hash` (sha256 hex of the JWT).
+- Assigns each existing token its own `family_id` (the document id).
+- Drops the old unique `token_1` index, which would otherwise reject new
+  documents that no longer carry a `token` field.
+Run before deploying the hashed refresh-token code:
+    python scripts/migrate_hash_refresh_tokens.py [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.utils.security import hash_token
+from config.settings import get_settings
+
+settings = get_settings()
+
+BATCH_SIZE = 1000
+
+
+async def migrate(dry_run: bool) -> None:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    try:
+        await client.admin.command("ping")
+        print(f"✓ Connected to MongoDB at {settings.mongodb_url}")
+        coll = client[settings.mongodb_db_name]["refresh_tokens"]
+
+        pending = await coll.count_documents({"token": {"$exists": True}})
+        print(f"Refresh tokens to migrate: {pending}")
+
+        migrated = 0
+        ops = []
+        async for doc in coll.find({"token": {"$exists": True}}, {"token": 1}):
+            ops.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {
+                    "$set": {"token_hash": hash_token(doc["token"]), "family_id": str(doc["_id"])},
+                    "$unset": {"token": ""},
+                },
+            ))
+            if len(ops) >= BATCH_SIZE:
+                if not dry_run:
+                    await coll.bulk_write(ops, ordered=False)
+                migrated += len(ops)
+                ops = []
+        if ops:
+            if not dry_run:
+                await coll.bulk_write(ops, ordered=False)
+            migrated += len(ops)
+        print(f"{'[PLAN]' if dry_run else '[OK]'} Hashed {migrated} refresh tokens")
+
+        indexes = await coll.index_information()
+        if "token_1" in indexes:
+            if dry_run:
+                print("[PLAN] Drop index token_1")
+            else:
+                await coll.drop_index("token_1")
+                print("[OK] Dropped index token_1")
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hash stored refresh tokens")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    args = parser.parse_args()
+    asyncio.run(migrate(dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
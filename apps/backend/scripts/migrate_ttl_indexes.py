@@ -0,0 +1,67 @@
+"""
+Migration: turn the plain `expires_at` indexes into TTL indexes.
+- refresh_tokens: documents are deleted as soon as expires_at passes.
+- password_reset_sessions / password_reset_tokens: deleted one day after expiry.
+An existing index with the same key but different options makes index creation
+fail on startup, so this converts them in place with collMod (no rebuild).
+Run before deploying the TTL index declarations:
+    python scripts/migrate_ttl_indexes.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
+
+# Add parent directory to path to import from app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.models.password_reset import RESET_RECORD_RETENTION_SECONDS
+from config.settings import get_settings
+
+settings = get_settings()
+
+TTL_COLLECTIONS = {
+    "refresh_tokens": 0,
+    "password_reset_sessions": RESET_RECORD_RETENTION_SECONDS,
+    "password_reset_tokens": RESET_RECORD_RETENTION_SECONDS,
+}
+
+
+async def migrate() -> None:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    try:
+        await client.admin.command("ping")
+        print(f"✓ Connected to MongoDB at {settings.mongodb_url}")
+        db = client[settings.mongodb_db_name]
+
+        for name, ttl in TTL_COLLECTIONS.items():
+            indexes = await db[name].index_information()
+            current = indexes.get("expires_at_1")
+            if current is None:
+                print(f"[SKIP] {name}: no expires_at_1 index (created on next startup)")
+                continue
+            if current.get("expireAfterSeconds") == ttl:
+                print(f"[SKIP] {name}: already a TTL index ({ttl}s)")
+                continue
+            try:
+                await db.command(
+                    "collMod",
+                    name,
+                    index={"keyPattern": {"expires_at": 1}, "expireAfterSeconds": ttl},
+                )
+                print(f"[OK] {name}: expires_at_1 is now a TTL index ({ttl}s)")
+            except OperationFailure as e:
+                # Older servers cannot convert a non-TTL index; rebuild it instead
+                print(f"[WARN] {name}: collMod failed ({e}); recreating index")
+                await db[name].drop_index("expires_at_1")
+                await db[name].create_index([("expires_at", 1)], name="expires_at_1", expireAfterSeconds=ttl)
+                print(f"[OK] {name}: recreated expires_at_1 as a TTL index ({ttl}s)")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,57 @@
+"""
+Local stand-in for the 2Factor OTP API, for load and failure testing.
+- Accepts any API key and template; the OTP is always STUB_OTP (default 123456).
+- STUB_LATENCY_MS adds a fixed delay to every response.
+- STUB_FAILURE_RATE (0..1) makes that share of requests answer 503.
+Run:
+    python scripts/twofactor_stub.py            # listens on 127.0.0.1:9100
+    TWOFACTOR_BASE_URL=http://127.0.0.1:9100 uvicorn main:app
+"""
+
+import asyncio
+import os
+import random
+from uuid import uuid4
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "0"))
+FAILURE_RATE = float(os.getenv("STUB_FAILURE_RATE", "0"))
+STUB_OTP = os.getenv("STUB_OTP", "123456")
+
+app = FastAPI(title="2Factor stub")
+sessions: dict[str, str] = {}
+
+
+async def _simulate():
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if FAILURE_RATE and random.random() < FAILURE_RATE:
+        return JSONResponse(status_code=503, content={"Status": "Error", "Details": "Stub failure"})
+    return None
+
+
+@app.get("/{api_key}/SMS/VERIFY/{session_id}/{otp}")
+async def verify(api_key: str, session_id: str, otp: str):
+    failure = await _simulate()
+    if failure:
+        return failure
+    if sessions.get(session_id) == otp:
+        return {"Status": "Success", "Details": "OTP Matched"}
+    return {"Status": "Error", "Details": "OTP Mismatch"}
+
+
+@app.get("/{api_key}/SMS/{phone}/AUTOGEN/{template}")
+async def autogen(api_key: str, phone: str, template: str):
+    failure = await _simulate()
+    if failure:
+        return failure
+    session_id = str(uuid4())
+    sessions[session_id] = STUB_OTP
+    return {"Status": "Success", "Details": session_id}
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("STUB_PORT", "9100")), log_level="warning")
@@ -0,0 +1,71 @@
+"""
+Production server entry point.
+
+Runs uvicorn with WEB_CONCURRENCY worker processes, or one per CPU available
+to the container (CPU affinity and cgroup quota) when unset. Each worker runs
+the app lifespan itself: it connects to MongoDB, warms the reference data
+cache and starts the contest scheduler. Worker processes share no memory, so
+state is warmed per worker rather than preloaded in a parent process.
+
+On SIGTERM uvicorn stops accepting connections and gives in-flight requests
+(e.g. leaderboard computations) SERVER_GRACEFUL_SHUTDOWN_SECONDS to finish
+before the lifespan shutdown drains background jobs and closes connections.
+
+Run:
+    python serve.py
+    python serve.py --workers 4 --port 8080
+"""
+
+import argparse
+import math
+import os
+from pathlib import Path
+
+import uvicorn
+
+from config.settings import get_settings
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity masks and cgroup v2 quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.api_host)
+    # PORT is set by the hosting platform
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", settings.api_port)))
+    parser.add_argument("--workers", type=int, default=settings.web_concurrency or available_cpus())
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=settings.log_level.lower(),
+        access_log=False,
+        proxy_headers=True,
+        # uvloop callbacks cannot be timed by the blocking detector
+        loop="asyncio" if settings.blocking_detection else "auto",
+        timeout_keep_alive=settings.server_keep_alive_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_shutdown_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()